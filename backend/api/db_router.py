@@ -0,0 +1,119 @@
+"""
+Ruteo primaria / réplicas de lectura (`settings.DATABASE_ROUTERS`).
+
+• Escrituras                → siempre "default" (la primaria).
+• Lecturas en vistas con `@replica_reads`
+                            → una réplica de `DB_REPLICAS["ALIASES"]` al azar.
+• Cualquier otra lectura    → "default".
+
+Leer de la réplica es opcional por vista (feeds, catálogo, reportes
+pendientes): el resto del código sigue leyendo de la primaria sin cambios,
+incluida cualquier lectura dentro de un `transaction.atomic()` sobre ella.
+
+Read-your-writes: cuando se guarda o borra una reseña (api/signals.py, y a
+mano en la importación masiva) su autor queda "pegado" a la primaria
+durante `MAX_LAG_SECONDS`. La marca vive en la caché "default", compartida
+entre procesos.
+
+Cachés: lo que se lee de una réplica puede estar atrasado, así que
+`cache_ttl()` acota a `MAX_LAG_SECONDS` el TTL de las cachés llenadas en
+esas vistas (páginas de feed, reseñas serializadas, cuerpo del catálogo).
+Sin eso una página vieja podría quedar cacheada con la versión nueva.
+
+Las réplicas no se migran (`allow_migrate`): reciben el esquema y los datos
+por replicación. En local, con SQLite, `manage.py sync_replicas` copia la
+primaria a cada réplica.
+"""
+import random
+from contextvars import ContextVar
+from functools import wraps
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import DEFAULT_DB_ALIAS, connections
+
+_read_alias = ContextVar("elopinion_read_alias", default=None)
+
+
+def _conf(name):
+    defaults = {"ALIASES": [], "MAX_LAG_SECONDS": 5}
+    return getattr(settings, "DB_REPLICAS", {}).get(name, defaults[name])
+
+
+def replicas():
+    return list(_conf("ALIASES"))
+
+
+# ───────────────────────── read-your-writes ──────────────────────
+def _sticky_key(user_id):
+    return f"db:sticky:{user_id}"
+
+
+def stick_to_primary(user_id):
+    """Las próximas lecturas de `user_id` van a la primaria por un rato."""
+    if replicas():
+        caches["default"].set(_sticky_key(user_id), 1, _conf("MAX_LAG_SECONDS"))
+
+
+def is_sticky(user_id):
+    return caches["default"].get(_sticky_key(user_id)) is not None
+
+
+# ───────────────────────── vistas ────────────────────────────────
+def _choose(request):
+    aliases = replicas()
+    if not aliases:
+        return None
+    user = getattr(request, "user", None)
+    if user is not None and user.is_authenticated and is_sticky(user.id):
+        return None
+    return random.choice(aliases)
+
+
+def replica_reads(view):
+    """
+    Las lecturas de la vista van a una réplica (salvo usuario pegado a la
+    primaria). En vistas DRF va debajo de `@api_view` para ver al usuario
+    ya autenticado.
+    """
+    @wraps(view)
+    def _wrap(request, *args, **kwargs):
+        if _read_alias.get() is not None:           # vista anidada
+            return view(request, *args, **kwargs)
+        alias = _choose(request)
+        if alias is None:
+            return view(request, *args, **kwargs)
+        token = _read_alias.set(alias)
+        try:
+            return view(request, *args, **kwargs)
+        finally:
+            _read_alias.reset(token)
+
+    return _wrap
+
+
+def cache_ttl(ttl):
+    """TTL para llenar una caché: acotado al retraso máximo si se leyó de una réplica."""
+    if _read_alias.get() is None:
+        return ttl
+    lag = _conf("MAX_LAG_SECONDS")
+    return lag if ttl is None else min(ttl, lag)
+
+
+# ───────────────────────── router ────────────────────────────────
+class PrimaryReplicaRouter:
+    def db_for_read(self, model, **hints):
+        alias = _read_alias.get()
+        if alias is None or connections[DEFAULT_DB_ALIAS].in_atomic_block:
+            return DEFAULT_DB_ALIAS
+        return alias
+
+    def db_for_write(self, model, **hints):
+        # explícito: una instancia leída de la réplica se guarda en la primaria
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        return True                 # todas las bases tienen los mismos datos
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        return db not in replicas()
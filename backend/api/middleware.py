@@ -0,0 +1,67 @@
+"""
+Middleware de métricas por request (ver utils/metrics.py).
+
+Por cada request registra, etiquetado con la ruta del URLconf (no la URL
+concreta, para que `reviews/<int:pk>/status/` sea una sola serie):
+latencia, tamaño de la respuesta, cantidad de consultas SQL y tiempo en la
+BD. Las consultas se cuentan con `execute_wrapper` en cada conexión.
+
+En respuestas en streaming (exportaciones, PDF) se mide hasta que la vista
+devuelve la respuesta; el tamaño sólo se registra si hay Content-Length.
+"""
+import time
+from contextlib import ExitStack
+
+from django.db import connections
+
+from backend.api.utils import metrics
+
+
+class _QueryTimer:
+    __slots__ = ("count", "seconds")
+
+    def __init__(self):
+        self.count = 0
+        self.seconds = 0.0
+
+    def __call__(self, execute, sql, params, many, context):
+        t0 = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.count += 1
+            self.seconds += time.perf_counter() - t0
+
+
+class RequestMetricsMiddleware:
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.enabled = metrics.enabled()
+
+    def __call__(self, request):
+        if not self.enabled:
+            return self.get_response(request)
+
+        timer = _QueryTimer()
+        t0 = time.perf_counter()
+        with ExitStack() as stack:
+            for conn in connections.all():
+                stack.enter_context(conn.execute_wrapper(timer))
+            response = self.get_response(request)
+        elapsed = time.perf_counter() - t0
+
+        match = request.resolver_match
+        route = match.route if match else "unmatched"
+        labels = (("route", route), ("method", request.method))
+        metrics.observe("elopinion_http_request_duration_seconds", elapsed,
+                        (*labels, ("status", response.status_code)))
+        metrics.observe("elopinion_db_queries_per_request", timer.count, labels)
+        metrics.observe("elopinion_db_duration_seconds_per_request", timer.seconds, labels)
+        size = (
+            len(response.content) if not response.streaming
+            else int(response.get("Content-Length", -1))
+        )
+        if size >= 0:
+            metrics.observe("elopinion_http_response_size_bytes", size, labels)
+        metrics.maybe_flush()
+        return response
@@ -1,8 +1,18 @@
 """
 Serializadores: comentarios, reportes y reseñas públicas.
 """
+from django.core.exceptions import ValidationError as DjangoValidationError
 from rest_framework import serializers
 from backend.reviews.models import Comment, Report, Review
+from backend.reviews.services import moderation
+
+
+def _moderated(value):
+    try:
+        moderation.validate_text(value)
+    except DjangoValidationError as exc:
+        raise serializers.ValidationError(exc.messages)
+    return value
 
 
 # ─────────── Comentarios & Reportes ──────────
@@ -14,6 +24,9 @@ class CommentSerializer(serializers.ModelSerializer):
         fields = ["id", "review", "user", "text", "created_at"]
         read_only_fields = ["id", "user", "created_at"]
 
+    def validate_text(self, value):
+        return _moderated(value)
+
 
 class ReportSerializer(serializers.ModelSerializer):
     reporter = serializers.StringRelatedField(read_only=True)
@@ -24,6 +37,9 @@ class ReportSerializer(serializers.ModelSerializer):
                   "status", "created_at"]
         read_only_fields = ["id", "reporter", "status", "created_at"]
 
+    # `reason` no pasa por el léxico de moderación: un reporte suele citar
+    # justamente el texto ofensivo que denuncia, y lo lee sólo un admin
+
 
 # Lista para el panel de moderación  (incluye datos de la reseña)
 class ReportListSerializer(serializers.ModelSerializer):
@@ -44,11 +60,17 @@ class ReportListSerializer(serializers.ModelSerializer):
 
 # ─────────── Reseñas para el feed ───────────
 class ReviewPublicSerializer(serializers.ModelSerializer):
+    """
+    Embebe sólo los últimos comentarios (`latest_comments`, del más nuevo al
+    más viejo, ver services.feeds.feed_reviews) en orden cronológico, más
+    el total en `comment_count`. El resto: GET /api/reviews/<id>/comments/.
+    """
     user              = serializers.StringRelatedField()
     product_a         = serializers.StringRelatedField()
     product_b         = serializers.StringRelatedField()
     preferred_product = serializers.StringRelatedField()
-    comments          = CommentSerializer(many=True, read_only=True)
+    comments          = serializers.SerializerMethodField()
+    comment_count     = serializers.IntegerField(read_only=True)
 
     class Meta:
         model  = Review
@@ -56,7 +78,10 @@ class ReviewPublicSerializer(serializers.ModelSerializer):
             "id", "user",
             "product_a", "product_b", "preferred_product",
             "justification", "allow_comments",
-            "comments",
+            "comments", "comment_count",
             "created_at",
         ]
         read_only_fields = fields
+
+    def get_comments(self, obj):
+        return CommentSerializer(reversed(obj.latest_comments), many=True).data
@@ -0,0 +1,91 @@
+"""
+Serialización rápida de reseñas para los feeds.
+
+Produce exactamente el mismo JSON que `ReviewPublicSerializer` (mismas
+claves, mismo formato de fechas) pero a partir de tuplas de
+`.values_list()`: dos consultas en total, sin instanciar modelos ni pasar
+por los campos de DRF. Qué endpoints la usan se elige en
+`settings.FEED_SERIALIZERS` (ver `use_fast_serializer`).
+
+La equivalencia la cubre `backend/tests/test_serializers.py` (corre en CI
+con `manage.py test`); el rendimiento se mide con
+`manage.py bench_serializers`.
+"""
+from django.conf import settings
+from django.db.models import Count, F, Window
+from django.db.models.functions import RowNumber
+from django.utils import timezone
+
+from backend.reviews.models import Comment, Review
+
+REVIEW_COLUMNS = (
+    "id", "user__username",
+    "product_a__name", "product_b__name", "preferred_product__name",
+    "justification", "allow_comments", "created_at", "comment_count",
+)
+COMMENT_COLUMNS = ("id", "review_id", "user__username", "text", "created_at")
+
+
+def use_fast_serializer(url_name):
+    """True si el endpoint `url_name` está configurado como "fast"."""
+    return getattr(settings, "FEED_SERIALIZERS", {}).get(url_name) == "fast"
+
+
+def _iso(value):
+    # mismo formato que serializers.DateTimeField (ISO 8601, "Z" para UTC)
+    if settings.USE_TZ:
+        value = timezone.localtime(value)
+    value = value.isoformat()
+    if value.endswith("+00:00"):
+        value = value[:-6] + "Z"
+    return value
+
+
+def serialize_reviews_fast(ids, embedded_comments):
+    """
+    Devuelve [{...}, ...] para las reseñas `ids` (sin orden garantizado),
+    con los últimos `embedded_comments` comentarios de cada una.
+    """
+    rows = (
+        Review.objects.filter(id__in=ids)
+        .annotate(comment_count=Count("comments"))
+        .values_list(*REVIEW_COLUMNS)
+    )
+
+    comments = {}
+    latest = (
+        Comment.objects.filter(review_id__in=ids)
+        .annotate(rn=Window(
+            RowNumber(),
+            partition_by=F("review_id"),
+            order_by=(F("created_at").desc(), F("id").desc()),
+        ))
+        .filter(rn__lte=embedded_comments)
+        .order_by("review_id", "created_at", "id")
+        .values_list(*COMMENT_COLUMNS)
+    )
+    for cid, review_id, username, text, created in latest:
+        comments.setdefault(review_id, []).append({
+            "id": cid,
+            "review": review_id,
+            "user": username,
+            "text": text,
+            "created_at": _iso(created),
+        })
+
+    return [
+        {
+            "id": rid,
+            "user": username,
+            "product_a": product_a,
+            "product_b": product_b,
+            "preferred_product": preferred,
+            "justification": justification,
+            "allow_comments": allow_comments,
+            "comments": comments.get(rid, []),
+            "comment_count": comment_count,
+            "created_at": _iso(created),
+        }
+        for (rid, username, product_a, product_b, preferred,
+             justification, allow_comments, created, comment_count) in rows
+    ]
@@ -3,7 +3,8 @@ Serializadores HU-007 (informes).
 Se eliminaron campos de valoración 1-5; se usa Elo.
 """
 from rest_framework import serializers
-# TODO: Importar los modelos necesarios si se usan en el futuro
+
+from backend.reviews.models import Product, StatusChoices
 
 class ReseñaSerializer(serializers.Serializer):
     producto   = serializers.CharField(max_length=100)
@@ -14,10 +15,33 @@ class ReseñaSerializer(serializers.Serializer):
 
 class InformeRequestSerializer(serializers.Serializer):
     # reseñas    = ReviewSimpleSerializer(many=True)
-    formato    = serializers.ChoiceField(choices=["json", "pdf", "csv"],
+    formato    = serializers.ChoiceField(choices=["json", "pdf", "csv", "jsonl"],
                                          default="json")
     start_date = serializers.DateField(required=False)
     end_date   = serializers.DateField(required=False)
+    top_n      = serializers.IntegerField(required=False, default=5,
+                                          min_value=1, max_value=50)
+
+    def validate(self, attrs):
+        start, end = attrs.get("start_date"), attrs.get("end_date")
+        if start and end and start > end:
+            raise serializers.ValidationError("start_date debe ser anterior a end_date")
+        return attrs
+
+
+class ExportRequestSerializer(serializers.Serializer):
+    """Parámetros (query string) del volcado de reseñas."""
+    formato    = serializers.ChoiceField(choices=["csv", "jsonl"], default="csv")
+    start_date = serializers.DateField(required=False)
+    end_date   = serializers.DateField(required=False)
+    category   = serializers.ChoiceField(choices=Product.CATEGORIES, required=False)
+    status     = serializers.ChoiceField(choices=StatusChoices.choices, required=False)
+
+    def validate(self, attrs):
+        start, end = attrs.get("start_date"), attrs.get("end_date")
+        if start and end and start > end:
+            raise serializers.ValidationError("start_date debe ser anterior a end_date")
+        return attrs
 
 
 # (Opcional) Un serializador público muy ligero para feeds
@@ -0,0 +1,94 @@
+"""
+Catálogo de productos versionado.
+
+• catalog_version – versión que toma un valor nuevo cada vez que se
+                    agrega/modifica un producto (ver api/signals.py). Los
+                    cambios de Elo llegan con cada reseña aprobada, así
+                    que no la cambian en el acto: mark_elo_changed solo
+                    los anota y la versión los incorpora a lo sumo una vez
+                    cada ELO_PUBLISH_SECONDS (el catálogo puede mostrar un
+                    Elo con ese retraso, nunca perderlo).
+• catalog_body    – JSON ya serializado de una página del catálogo,
+                    cacheado por versión: mientras nada cambie, servirlo
+                    cuesta una lectura de caché en vez de recorrer la tabla.
+
+Se usa el alias de caché "default"; con varios procesos conviene que sea
+compartido (Redis/Memcached) para que todos vean la misma versión.
+"""
+import json
+import uuid
+
+from django.core.cache import caches
+
+from backend.api.db_router import cache_ttl
+from backend.reviews.models import Product
+
+VERSION_KEY = "catalog:version"
+ELO_KEY = "catalog:elo"              # cambia con cada actualización de Elo
+ELO_PUBLISHED_KEY = "catalog:elo:published"
+ELO_PUBLISH_SECONDS = 30
+BODY_TTL = 600
+
+
+def _cache():
+    return caches["default"]
+
+
+def _get_or_add(cache, key, default, timeout):
+    # el primero que llega fija el valor; los demás leen el ganador
+    if cache.add(key, default, timeout):
+        return default
+    return cache.get(key, default)
+
+
+def catalog_version():
+    cache = _cache()
+    found = cache.get_many([VERSION_KEY, ELO_PUBLISHED_KEY])
+    version = found.get(VERSION_KEY)
+    if version is None:
+        # valor inicial no reutilizable (ver feed_cache._versions)
+        version = _get_or_add(cache, VERSION_KEY, uuid.uuid4().hex, None)
+    elo = found.get(ELO_PUBLISHED_KEY)
+    if elo is None:
+        # la foto del Elo vence cada ELO_PUBLISH_SECONDS: al renovarla se
+        # incorpora el último cambio anotado (o "" si nunca hubo uno)
+        elo = _get_or_add(cache, ELO_PUBLISHED_KEY, cache.get(ELO_KEY, ""),
+                          ELO_PUBLISH_SECONDS)
+    return f"{version}.{elo}"
+
+
+def bump_catalog_version():
+    # un valor nuevo en vez de incr: ver el docstring de feed_cache
+    _cache().set(VERSION_KEY, uuid.uuid4().hex, None)
+
+
+def mark_elo_changed():
+    """Anota un cambio de Elo; catalog_version lo publica en ≤ ELO_PUBLISH_SECONDS."""
+    _cache().set(ELO_KEY, uuid.uuid4().hex, None)
+
+
+def catalog_body(version, category=None, after=0, limit=None):
+    """
+    Devuelve (body_bytes, last_id) de la página pedida: productos con
+    id > `after` (orden por id), filtrados por `category`, a lo sumo
+    `limit`. `last_id` es None si no hay página siguiente.
+    """
+    key = f"catalog:body:{version}:{category or ''}:{after}:{limit or ''}"
+    cached = _cache().get(key)
+    if cached is not None:
+        return cached
+
+    qs = Product.objects.filter(id__gt=after).order_by("id")
+    if category:
+        qs = qs.filter(category=category)
+    rows = qs.values("id", "name", "elo_score", "category")
+    if limit:
+        rows = list(rows[:limit + 1])
+        last_id = rows[limit - 1]["id"] if len(rows) > limit else None
+        rows = rows[:limit]
+    else:
+        rows, last_id = list(rows), None
+
+    result = (json.dumps(rows, ensure_ascii=False).encode(), last_id)
+    _cache().set(key, result, cache_ttl(BODY_TTL))
+    return result
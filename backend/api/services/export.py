@@ -0,0 +1,119 @@
+"""
+Exportación de reseñas en streaming (CSV y JSON Lines).
+
+Las filas salen de la BD con `.iterator(chunk_size=...)` y se codifican de
+a una: la respuesta empieza a enviarse apenas llega el primer bloque y la
+memoria no depende de cuántas reseñas haya (ni Django ni el serializador
+arman el documento completo).
+
+Los filtros de fecha son los mismos del informe JSON/PDF de HU-007
+(`hu007._window`: fechas inclusive sobre `created_at`).
+
+En CSV los textos del usuario que parecen fórmulas se escapan (`_safe_cell`);
+JSON Lines los deja tal cual.
+"""
+import csv
+import json
+
+from backend.api.services.hu007 import _in_window, _window
+from backend.reviews.models import Product, Review
+
+CHUNK_SIZE = 2000
+
+# (columna, campo en values_list)
+COLUMNS = (
+    ("id", "id"),
+    ("created_at", "created_at"),
+    ("category", "category"),
+    ("status", "status"),
+    ("user", "user__username"),
+    ("product_a_id", "product_a_id"),
+    ("product_a", "product_a__name"),
+    ("product_b_id", "product_b_id"),
+    ("product_b", "product_b__name"),
+    ("preferred_product_id", "preferred_product_id"),
+    ("justification", "justification"),
+)
+HEADER = [name for name, _ in COLUMNS]
+
+CONTENT_TYPES = {
+    "csv": "text/csv; charset=utf-8",
+    "jsonl": "application/x-ndjson",
+}
+
+
+def review_rows(start_date=None, end_date=None, category=None, status=None,
+                chunk_size=CHUNK_SIZE):
+    """
+    Tuplas en el orden de `COLUMNS`, por categoría y en orden cronológico
+    (recorre el índice (category, created_at), sin ordenar en memoria).
+    """
+    categories = [category] if category else [c for c, _ in Product.CATEGORIES]
+    qs = Review.objects.filter(
+        category__in=categories,
+        **_in_window("created_at", _window(start_date, end_date)),
+    )
+    if status:
+        qs = qs.filter(status=status)
+    return (
+        qs.order_by("category", "created_at", "id")
+        .values_list(*(field for _, field in COLUMNS))
+        .iterator(chunk_size=chunk_size)
+    )
+
+
+class _Echo:
+    """Pseudo-archivo para csv.writer: devuelve lo escrito en vez de guardarlo."""
+
+    def write(self, value):
+        return value
+
+
+# Una celda que empieza así la planilla la toma como fórmula
+# (=HYPERLINK(...), etc.): se antepone ' para que quede como texto.
+FORMULA_PREFIXES = ("=", "+", "-", "@", "\t", "\r")
+
+
+def _safe_cell(value):
+    if isinstance(value, str) and value.startswith(FORMULA_PREFIXES):
+        return "'" + value
+    return value
+
+
+def stream_csv(rows):
+    writer = csv.writer(_Echo())
+    yield writer.writerow(HEADER)
+    for row in rows:
+        yield writer.writerow([_safe_cell(value) for value in row])
+
+
+def stream_jsonl(rows):
+    for row in rows:
+        yield json.dumps(dict(zip(HEADER, row)), ensure_ascii=False) + "\n"
+
+
+def _buffered(lines, size):
+    """Agrupa líneas en bloques de ~`size` caracteres (una escritura al socket por bloque)."""
+    buf, length = [], 0
+    for line in lines:
+        buf.append(line)
+        length += len(line)
+        if length >= size:
+            yield "".join(buf)
+            buf, length = [], 0
+    if buf:
+        yield "".join(buf)
+
+
+def _iso_dates(rows):
+    created = HEADER.index("created_at")
+    for row in rows:
+        row = list(row)
+        row[created] = row[created].isoformat()
+        yield row
+
+
+def stream(fmt, rows, buffer_size=64 * 1024):
+    rows = _iso_dates(rows)
+    lines = stream_csv(rows) if fmt == "csv" else stream_jsonl(rows)
+    return _buffered(lines, buffer_size)
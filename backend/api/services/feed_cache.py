@@ -0,0 +1,210 @@
+"""
+Caché de feeds sobre el framework de caché de Django.
+
+Dos niveles, ambos en el alias `settings.FEED_CACHE["ALIAS"]` (puede ser
+local a cada proceso):
+
+• Páginas   – por usuario, feed, cursor y tamaño: sólo la lista de ids y
+              el cursor siguiente. La clave incluye contadores de versión
+              (por usuario y por categoría); al cambiar algo el contador
+              toma un valor nuevo y las páginas viejas quedan huérfanas
+              hasta que el backend las desaloje (LRU / TTL).
+• Reseñas   – el JSON serializado de cada reseña (con sus comentarios).
+              Un comentario nuevo se agrega a la entrada existente en vez
+              de invalidarla; un cambio o borrado de la reseña la elimina.
+
+Lo que invalida vive en la caché "default", compartida entre procesos: los
+contadores de versión y una marca por reseña cambiada (con TTL REVIEW_TTL).
+Cada entrada de reseña guarda la marca vigente al llenarla y se descarta si
+cambió. Así las moderaciones de `manage.py review_worker` llegan a los
+procesos web aunque "feeds" sea LocMem.
+
+Versiones y marcas son siempre un uuid nuevo, escrito con `set`: no hace
+falta un `incr` atómico entre procesos (el de FileBasedCache no lo es) y
+dos cambios simultáneos nunca dejan el mismo valor que ya vio un lector.
+Si la caché desaloja una versión o una marca, el valor que la reemplaza
+tampoco coincide con ninguno anterior: se pierden aciertos, nunca se
+sirve algo viejo.
+
+Las señales que mantienen todo esto al día están en `backend/api/signals.py`.
+Los contadores de aciertos/fallos son por proceso (ver `stats()`).
+"""
+import hashlib
+import threading
+import uuid
+from collections import Counter
+
+from django.conf import settings
+from django.core.cache import caches
+
+from backend.api.db_router import cache_ttl
+from backend.api.serializers.comments_reports import (
+    CommentSerializer,
+    ReviewPublicSerializer,
+)
+from backend.api.serializers.fast import serialize_reviews_fast
+from backend.api.services.feeds import EMBEDDED_COMMENTS, feed_reviews
+
+_stats = Counter()
+_stats_lock = threading.Lock()
+
+
+def _conf(name):
+    return settings.FEED_CACHE[name]
+
+
+def _cache():
+    return caches[_conf("ALIAS")]
+
+
+def _shared():
+    # versiones y marcas: las tienen que ver todos los procesos
+    return caches["default"]
+
+
+def _count(name, n=1):
+    if n:
+        with _stats_lock:
+            _stats[name] += n
+
+
+def stats():
+    """Aciertos/fallos de este proceso y tasa de acierto por nivel."""
+    with _stats_lock:
+        data = dict(_stats)
+    for level in ("page", "review"):
+        hits, misses = data.get(f"{level}_hits", 0), data.get(f"{level}_misses", 0)
+        data[f"{level}_hit_ratio"] = round(hits / (hits + misses), 4) if hits + misses else None
+    return data
+
+
+# ───────────────────────── versiones ──────────────────────────────
+def new_version():
+    """Valor de versión que nunca se repite (ver el docstring del módulo)."""
+    return uuid.uuid4().hex
+
+
+def _versions(scopes):
+    cache = _shared()
+    keys = [f"feed:ver:{s}" for s in scopes]
+    found = cache.get_many(keys)
+    for key in keys:
+        if key not in found:
+            # valor inicial no reutilizable: si la versión fue desalojada no
+            # revive páginas viejas que sigan en caché
+            found[key] = new_version()
+            cache.add(key, found[key], None)
+    return [found[k] for k in keys]
+
+
+def bump(scope):
+    """Invalida todas las páginas que dependen de `scope` (p.ej. "user:3")."""
+    _shared().set(f"feed:ver:{scope}", new_version(), None)
+
+
+# ───────────────────────── páginas ────────────────────────────────
+def page_key(kind, user_id, cursor, page_size, cats=()):
+    scopes = [f"user:{user_id}"] + [f"cat:{c}" for c in sorted(cats)]
+    raw = f"{kind}|{user_id}|{cursor or ''}|{page_size}|{_versions(scopes)}"
+    return "feed:page:" + hashlib.sha1(raw.encode()).hexdigest()
+
+
+def get_page(key):
+    page = _cache().get(key)
+    _count("page_hits" if page is not None else "page_misses")
+    return page
+
+
+def set_page(key, ids, next_cursor):
+    page = {"ids": ids, "next": next_cursor}
+    _cache().set(key, page, cache_ttl(_conf("PAGE_TTL")))
+    return page
+
+
+def get_favourites(user_id, compute):
+    """Categorías favoritas del usuario, cacheadas hasta su próxima reseña."""
+    key = f"feed:fav:{user_id}:{_versions([f'user:{user_id}'])[0]}"
+    cached = _cache().get(key)
+    if cached is not None:
+        return cached["cats"]
+    cats = compute()
+    _cache().set(key, {"cats": cats}, cache_ttl(_conf("PAGE_TTL")))
+    return cats
+
+
+# ───────────────────────── reseñas ────────────────────────────────
+def _review_key(review_id):
+    return f"feed:review:{review_id}"
+
+
+def _mark_key(review_id):
+    return f"feed:review:mark:{review_id}"
+
+
+def _mark(review_id):
+    """Deja constancia (para todos los procesos) de que la reseña cambió."""
+    mark = new_version()
+    _shared().set(_mark_key(review_id), mark, _conf("REVIEW_TTL"))
+    return mark
+
+
+def serialize_reviews(ids, fast=False):
+    """
+    Devuelve el JSON de las reseñas `ids` en ese orden; las que no están en
+    caché se leen de la BD y se guardan. `fast` elige el serializador por
+    proyección (mismo JSON, ver serializers/fast.py) en vez del de DRF.
+    """
+    cache = _cache()
+    cached = cache.get_many([_review_key(i) for i in ids])
+    # las marcas se leen antes que la BD: si la reseña cambia en el medio,
+    # la entrada queda con la marca vieja y la próxima lectura la descarta
+    marks = _shared().get_many([_mark_key(i) for i in ids])
+    data = {}
+    for i in ids:
+        entry = cached.get(_review_key(i))
+        if entry is not None and entry["mark"] == marks.get(_mark_key(i)):
+            data[i] = entry["row"]
+    missing = [i for i in ids if i not in data]
+    _count("review_hits", len(data))
+    _count("review_misses", len(missing))
+
+    if missing:
+        if fast:
+            rows = serialize_reviews_fast(missing, EMBEDDED_COMMENTS)
+        else:
+            rows = ReviewPublicSerializer(feed_reviews(missing), many=True).data
+        fresh = {row["id"]: row for row in rows}
+        cache.set_many(
+            {_review_key(i): {"mark": marks.get(_mark_key(i)), "row": row}
+             for i, row in fresh.items()},
+            cache_ttl(_conf("REVIEW_TTL")),
+        )
+        data.update(fresh)
+
+    # las borradas entre tanto simplemente no aparecen
+    return [data[i] for i in ids if i in data]
+
+
+def forget_review(review_id):
+    _mark(review_id)
+    _cache().delete(_review_key(review_id))
+
+
+def add_comment(comment):
+    """
+    Agrega el comentario a la reseña cacheada en este proceso (si estaba al
+    día); los demás procesos ven la marca nueva y la releen.
+    """
+    cache = _cache()
+    key = _review_key(comment.review_id)
+    entry = cache.get(key)
+    current = _shared().get(_mark_key(comment.review_id))
+    mark = _mark(comment.review_id)
+    if entry is None or entry["mark"] != current:
+        cache.delete(key)
+        return
+    row = entry["row"]
+    comments = list(row["comments"]) + [CommentSerializer(comment).data]
+    row["comments"] = comments[-EMBEDDED_COMMENTS:]
+    row["comment_count"] += 1
+    cache.set(key, {"mark": mark, "row": row}, _conf("REVIEW_TTL"))
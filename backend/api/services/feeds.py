@@ -0,0 +1,225 @@
+"""
+Servicios de los feeds de reseñas (HU-001 / HU-009) con paginación por cursor.
+
+• chronological_page  – página keyset sobre (created_at, id) descendente.
+• shuffled_page       – página aleatoria estable dentro de una "sesión"
+                        (semilla en el cursor), sin OFFSET ni cargar ids.
+• personalized_page   – recientes de las categorías favoritas y, al
+                        agotarse, el resto en orden aleatorio.
+• feed_reviews        – queryset para serializar reseñas del feed con
+                        sólo los últimos comentarios embebidos.
+• encode_cursor / decode_cursor – cursores opacos y firmados.
+
+Todas las páginas cuestan lo mismo sea la primera o la número mil: el
+cursor guarda la posición exacta donde seguir.
+"""
+import random
+
+from django.core import signing
+from django.db.models import Count, Prefetch, Q
+from django.utils.dateparse import parse_datetime
+
+from backend.reviews.models import Comment, Review, StatusChoices
+
+CURSOR_SALT = "backend.api.feeds.cursor"
+
+# cuántas sondas por id buscado en la primera ronda (cubre huecos y
+# filtrados); si no alcanza, cada ronda duplica el lote hasta MAX_PROBE
+OVERSAMPLE = 4
+MAX_PROBE = 900         # ids por `IN (...)`, debajo del límite de parámetros de SQLite
+
+# comentarios embebidos por reseña en los feeds
+EMBEDDED_COMMENTS = 3
+
+_MASK64 = (1 << 64) - 1
+
+
+class InvalidCursor(ValueError):
+    """El cursor recibido no es válido (alterado, vencido o de otro feed)."""
+
+
+def encode_cursor(state):
+    return signing.dumps(state, salt=CURSOR_SALT, compress=True)
+
+
+def decode_cursor(token, kinds):
+    """Decodifica `token` y verifica que sea de alguno de los feeds `kinds`."""
+    try:
+        state = signing.loads(token, salt=CURSOR_SALT)
+    except signing.BadSignature as exc:
+        raise InvalidCursor("Cursor inválido") from exc
+    if not isinstance(state, dict) or state.get("kind") not in kinds:
+        raise InvalidCursor("Cursor inválido")
+    return state
+
+
+def approved_reviews():
+    return Review.objects.filter(status=StatusChoices.APROBADA)
+
+
+def feed_reviews(ids):
+    """
+    Reseñas `ids` listas para `ReviewPublicSerializer`: relaciones en un
+    JOIN, `comment_count` agregado y sólo los últimos EMBEDDED_COMMENTS
+    comentarios de cada una (prefetch con slice → ROW_NUMBER() en la BD),
+    de modo que una reseña viral no arrastra miles de comentarios.
+    """
+    latest = (
+        Comment.objects.select_related("user")
+        .order_by("-created_at", "-id")[:EMBEDDED_COMMENTS]
+    )
+    return (
+        Review.objects.filter(id__in=ids)
+        .select_related("product_a", "product_b", "preferred_product", "user")
+        .annotate(comment_count=Count("comments"))
+        .prefetch_related(Prefetch("comments", queryset=latest, to_attr="latest_comments"))
+    )
+
+
+# ───────────────────────── cronológico ─────────────────────────────
+def chronological_page(queryset, page_size, after=None):
+    """
+    Devuelve (ids, after) con la página siguiente a `after`
+    (`{"t": iso, "id": n}` o None) en orden (-created_at, -id).
+    `after` es None cuando no hay más páginas. Sirve para cualquier
+    modelo con `created_at` (reseñas, comentarios).
+    """
+    qs = queryset.order_by("-created_at", "-id")
+    if after:
+        t = parse_datetime(after["t"])
+        qs = qs.filter(Q(created_at__lt=t) | Q(created_at=t, id__lt=after["id"]))
+
+    rows = list(qs.values_list("id", "created_at")[:page_size + 1])
+    has_more = len(rows) > page_size
+    rows = rows[:page_size]
+    nxt = {"t": rows[-1][1].isoformat(), "id": rows[-1][0]} if has_more else None
+    return [pk for pk, _ in rows], nxt
+
+
+# ───────────────────────── aleatorio ───────────────────────────────
+class _Permutation:
+    """
+    Permutación pseudoaleatoria de [0, size) definida por una semilla
+    (red de Feistel + cycle walking). Se evalúa posición por posición,
+    sin materializar nada.
+    """
+
+    ROUNDS = 4
+
+    def __init__(self, seed, size):
+        self.size = size
+        bits = max(2, (size - 1).bit_length())
+        bits += bits % 2
+        self.half = bits // 2
+        self.mask = (1 << self.half) - 1
+        rng = random.Random(seed)
+        self.keys = [rng.getrandbits(64) for _ in range(self.ROUNDS)]
+
+    def _round(self, r, key):
+        x = ((r ^ key) * 0x9E3779B97F4A7C15) & _MASK64
+        return (x ^ (x >> 29)) & self.mask
+
+    def _encrypt(self, x):
+        left, right = x >> self.half, x & self.mask
+        for key in self.keys:
+            left, right = right, left ^ self._round(right, key)
+        return (left << self.half) | right
+
+    def __call__(self, i):
+        x = self._encrypt(i)
+        while x >= self.size:
+            x = self._encrypt(x)
+        return x
+
+
+def shuffled_page(queryset, page_size, state=None, rng=random):
+    """
+    Devuelve (ids, state) con la siguiente página aleatoria de `queryset`.
+
+    `state` = {"seed", "pos", "lo", "hi"}: la semilla fija una permutación
+    del rango de ids [lo, hi] (congelado al iniciar la sesión) y `pos` es
+    cuántas posiciones ya se recorrieron. Cada ronda sondea un lote de ids
+    permutados con un solo `id IN (...)` sobre la PK; los que existen y
+    cumplen el filtro entran en la página en el orden de la permutación.
+    Se sigue sondeando (con lotes cada vez más grandes, para querysets
+    ralos como el "resto" del feed personalizado) hasta llenar la página o
+    agotar la permutación: una página corta sólo puede ser la última.
+    Sin repetidos entre páginas. `state` es None cuando no hay más.
+    """
+    if state is None:
+        ids = Review.objects.values_list("id", flat=True)
+        # dos consultas: SQLite sólo resuelve MIN y MAX por índice si van solas
+        lo = ids.order_by("id").first()
+        if lo is None:
+            return [], None
+        hi = ids.order_by("-id").first()
+        state = {"seed": rng.getrandbits(32), "pos": 0, "lo": lo, "hi": hi}
+
+    lo, size = state["lo"], state["hi"] - state["lo"] + 1
+    perm = _Permutation(state["seed"], size)
+    pos, chosen, probe = state["pos"], [], 0
+
+    while len(chosen) < page_size and pos < size:
+        need = page_size - len(chosen)
+        probe = min(MAX_PROBE, max(need * OVERSAMPLE, probe * 2))
+        batch = [(p, lo + perm(p)) for p in range(pos, min(size, pos + probe))]
+        found = set(queryset.filter(id__in=[i for _, i in batch]).values_list("id", flat=True))
+        for p, pk in batch:
+            pos = p + 1
+            if pk in found:
+                chosen.append(pk)
+                if len(chosen) == page_size:
+                    break
+
+    return chosen, (dict(state, pos=pos) if pos < size else None)
+
+
+# ───────────────────────── personalizado ───────────────────────────
+def favourite_categories(user):
+    """
+    Categoría(s) en las que el usuario publicó más reseñas, contadas en la BD.
+    Devuelve None si no tiene historial o si hay empate total (sin
+    preferencia real).
+    """
+    counts = dict(
+        Review.objects.filter(user=user)
+        .values_list("category")
+        .annotate(n=Count("id"))
+        .order_by()
+    )
+    if not counts:
+        return None
+
+    max_ct = max(counts.values())
+    top_cats = [c for c, n in counts.items() if n == max_ct]
+    if len(top_cats) == len(counts):
+        return None
+    return top_cats
+
+
+def personalized_page(page_size, state):
+    """
+    Devuelve (ids, state). Primero las reseñas más recientes de
+    `state["cats"]` (keyset); al agotarse, el resto de categorías en orden
+    aleatorio de sesión. Nunca se leen más de `page_size` reseñas.
+    """
+    cats = state["cats"]
+    approved = approved_reviews()
+    ids = []
+
+    if state["phase"] == "top":
+        ids, after = chronological_page(
+            approved.filter(category__in=cats), page_size, state["after"]
+        )
+        if after:
+            return ids, dict(state, after=after)
+        state = dict(state, phase="rest", after=None)
+        if len(ids) == page_size:
+            return ids, state  # la próxima página empieza con el resto
+
+    rest_ids, rest = shuffled_page(
+        approved.exclude(category__in=cats),
+        page_size - len(ids),
+        state["rest"],
+    )
+    return ids + rest_ids, (dict(state, rest=rest) if rest else None)
@@ -2,50 +2,142 @@
 Servicios para HU-007 · Generación de informes.
 
 • Ya no usa “valoración 1-5”.
-• Top N productos se basa en su puntaje Elo actual.
-• Evolución Elo = promedio mensual del Elo de todos los productos.
+• Top N productos se basa en su puntaje Elo actual (global y por categoría).
+• Evolución Elo = promedio mensual del Elo según el ledger `EloEvent`.
+• Reseñas publicadas por mes, categoría y estado.
+
+Toda la agregación ocurre en la BD (TruncMonth + Sum/Count agrupados por
+mes y categoría): Python sólo recibe una fila por (mes, categoría), así que
+la memoria no depende de cuántas reseñas o eventos haya en el rango.
 """
-from collections import defaultdict
-from datetime import datetime
-from django.db.models import Avg
-from backend.reviews.models import Product, Review
+from datetime import datetime, time, timedelta
 
+from django.db.models import Count, F, Sum, Window
+from django.db.models.functions import RowNumber, TruncMonth
+from django.utils import timezone
 
-def _promedio_mensual_elo():
-    """
-    Devuelve {'2025-05': 1480, '2025-06': 1502, ...}
-    Promedia el Elo de todos los productos al final de cada mes (último día disponible).
-    """
-    por_mes = defaultdict(list)
+from backend.reviews.models import EloEvent, Product, Review, StatusChoices
+
+
+def _window(start_date=None, end_date=None):
+    """Fechas (inclusive) → filtros [desde, hasta) sobre un DateTimeField."""
+    bounds = {}
+    if start_date:
+        bounds["gte"] = timezone.make_aware(datetime.combine(start_date, time.min))
+    if end_date:
+        bounds["lt"] = timezone.make_aware(datetime.combine(end_date + timedelta(days=1), time.min))
+    return bounds
 
-    # se toman las fechas de última actualización de cada review
-    qs = Review.objects.filter(status="Aprobada").values("updated_at", "product_a__elo_score", "product_b__elo_score")
-    for row in qs:
-        month_key = row["updated_at"].strftime("%Y-%m")
-        por_mes[month_key].append(row["product_a__elo_score"])
-        por_mes[month_key].append(row["product_b__elo_score"])
 
-    return {m: round(sum(vals) / len(vals), 2) for m, vals in sorted(por_mes.items())}
+def _in_window(field, bounds):
+    return {f"{field}__{op}": value for op, value in bounds.items()}
 
 
-def calcular_metricas(_, start_date=None, end_date=None, top_n=5):
+def _evolucion_elo(bounds):
     """
-    Genera:
-        • top_products  – los N productos con mayor Elo.
-        • elo_evolution – dict mes→Elo promedio (todas las categorías).
-    Los parámetros start_date y end_date se dejan para futura ampliación.
+    ({'2025-05': 1480.0, ...}, {categoría: {'2025-05': 1492.5, ...}})
+    Promedio del Elo resultante de cada comparación aplicada en el mes.
+    Se agrupa por (mes, categoría) con SUM y COUNT para poder derivar el
+    promedio global exacto de las mismas filas.
     """
-    top_qs = (
+    rows = (
+        EloEvent.objects
+        .filter(**_in_window("created_at", bounds))
+        .annotate(mes=TruncMonth("created_at"), categoria=F("product__category"))
+        .values("mes", "categoria")
+        .annotate(total=Sum("rating_after"), n=Count("id"))
+        .order_by()     # pocas filas agregadas: se ordenan en Python
+    )
+    global_sums, per_category = {}, {}
+    for row in sorted(rows, key=lambda r: r["mes"]):
+        mes = row["mes"].strftime("%Y-%m")
+        per_category.setdefault(row["categoria"], {})[mes] = round(row["total"] / row["n"], 2)
+        total, n = global_sums.get(mes, (0, 0))
+        global_sums[mes] = (total + row["total"], n + row["n"])
+    evolution = {mes: round(total / n, 2) for mes, (total, n) in global_sums.items()}
+    return evolution, per_category
+
+
+def _reseñas_por_mes(bounds):
+    """{categoría: {'2025-05': {'total': n, 'Aprobada': n, ...}}}"""
+    rows = (
+        Review.objects
+        .filter(category__in=[c for c, _ in Product.CATEGORIES],   # usa (category, created_at)
+                **_in_window("created_at", bounds))
+        .annotate(mes=TruncMonth("created_at"))
+        .values("category", "mes", "status")
+        .annotate(n=Count("id"))
+        .order_by()
+    )
+    result = {}
+    for row in sorted(rows, key=lambda r: r["mes"]):
+        bucket = result.setdefault(row["category"], {}).setdefault(
+            row["mes"].strftime("%Y-%m"), {"total": 0}
+        )
+        bucket[row["status"]] = row["n"]
+        bucket["total"] += row["n"]
+    return result
+
+
+def _top_por_categoria(top_n):
+    """{categoría: [{'producto', 'elo'}, ...]} con una sola consulta (ROW_NUMBER)."""
+    rows = (
         Product.objects
-        .order_by("-elo_score")
-        .values("name", "elo_score")[:top_n]
+        .annotate(puesto=Window(
+            RowNumber(), partition_by=F("category"), order_by=(F("elo_score").desc(), F("id").asc()),
+        ))
+        .filter(puesto__lte=top_n)
+        .order_by("category", "puesto")
+        .values("category", "name", "elo_score")
     )
+    result = {}
+    for row in rows:
+        result.setdefault(row["category"], []).append(
+            {"producto": row["name"], "elo": row["elo_score"]}
+        )
+    return result
+
+
+def calcular_metricas(start_date=None, end_date=None, top_n=5):
+    """
+    Genera, para el rango [start_date, end_date] (fechas inclusive; sin
+    límites si se omiten):
+        • top_products   – los N productos con mayor Elo actual.
+        • elo_evolution  – dict mes→Elo promedio (todas las categorías).
+        • reviews_total  – reseñas publicadas en el rango, por estado.
+        • by_category    – por categoría: top_products, elo_evolution y
+                           reviews_per_month (mes → conteo por estado).
+    """
+    bounds = _window(start_date, end_date)
+
     top_products = [
-        {"producto": p["name"], "elo": p["elo_score"]} for p in top_qs
+        {"producto": p["name"], "elo": p["elo_score"]}
+        for p in Product.objects.order_by("-elo_score", "id").values("name", "elo_score")[:top_n]
     ]
+    evolution, evolution_by_cat = _evolucion_elo(bounds)
+    reviews_by_cat = _reseñas_por_mes(bounds)
+    top_by_cat = _top_por_categoria(top_n)
+
+    reviews_total = {"total": 0, **{s: 0 for s in StatusChoices.values}}
+    for months in reviews_by_cat.values():
+        for counts in months.values():
+            for key, n in counts.items():
+                reviews_total[key] += n
 
-    metrics = {
+    return {
+        "range": {
+            "start_date": start_date.isoformat() if start_date else None,
+            "end_date": end_date.isoformat() if end_date else None,
+        },
         "top_products": top_products,
-        "elo_evolution": _promedio_mensual_elo(),
+        "elo_evolution": evolution,
+        "reviews_total": reviews_total,
+        "by_category": {
+            cat: {
+                "top_products": top_by_cat.get(cat, []),
+                "elo_evolution": evolution_by_cat.get(cat, {}),
+                "reviews_per_month": reviews_by_cat.get(cat, {}),
+            }
+            for cat, _ in Product.CATEGORIES
+        },
     }
-    return metrics
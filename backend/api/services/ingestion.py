@@ -0,0 +1,242 @@
+"""
+Importación masiva de comparaciones (JSON Lines o CSV).
+
+Cada fila: user, product_a_id, product_b_id, preferred_id y opcionalmente
+justification, allow_comments y created_at (ISO 8601). Mismas reglas que
+`submit_review`, pero validadas por lote de `chunk_size` filas:
+
+• una consulta para los productos y otra para los usuarios del lote;
+• duplicados por pertenencia a un conjunto de claves (usuario, pair_low,
+  pair_high): una consulta contra la BD más las repetidas dentro del
+  propio archivo (la restricción única cubre lo que se cuele en paralelo);
+• moderación con el léxico compilado, fila por fila en memoria;
+• bulk_create de las reseñas y Elo de las aprobadas en orden cronológico
+  (`apply_matches`), todo en una transacción por lote.
+
+Un lote que falla al escribir se revierte entero y se informa; los demás
+siguen. Las reseñas importadas no pasan por la cola de `review_worker`.
+"""
+import csv
+import json
+from itertools import islice
+
+from django.contrib.auth.models import User
+from django.db import DatabaseError, transaction
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+from backend.api import db_router
+from backend.api.services import feed_cache
+from backend.reviews.models import Product, Review, StatusChoices
+from backend.reviews.services import moderation
+from backend.reviews.services.review_services import apply_matches
+from backend.reviews.signals import review_moderated
+
+CHUNK_SIZE = 1000
+MAX_REPORTED_ERRORS = 100
+TRUE_VALUES = {"1", "true", "t", "yes", "y", "si", "sí"}
+
+
+class RowError(ValueError):
+    pass
+
+
+# ───────────────────────── lectura ────────────────────────────────
+def read_jsonl(lines):
+    """(nº de línea, dict | RowError) por cada línea no vacía."""
+    for lineno, line in enumerate(lines, 1):
+        if not line.strip():
+            continue
+        try:
+            row = json.loads(line)
+        except ValueError:
+            yield lineno, RowError("JSON inválido")
+            continue
+        yield lineno, row if isinstance(row, dict) else RowError("se esperaba un objeto")
+
+
+def read_csv(lines):
+    reader = csv.DictReader(lines)
+    for row in reader:
+        yield reader.line_num, row
+
+
+def read_rows(lines, fmt):
+    if fmt == "jsonl":
+        return read_jsonl(lines)
+    if fmt == "csv":
+        return read_csv(lines)
+    raise ValueError(f"Formato desconocido: {fmt}")
+
+
+# ───────────────────────── validación ─────────────────────────────
+def _int(row, field):
+    try:
+        return int(row[field])
+    except KeyError:
+        raise RowError(f"falta {field}")
+    except (TypeError, ValueError):
+        raise RowError(f"{field} inválido")
+
+
+def _bool(value, default=True):
+    if value is None or value == "":
+        return default
+    if isinstance(value, bool):
+        return value
+    return str(value).strip().lower() in TRUE_VALUES
+
+
+def _parse(row):
+    """Campos normalizados de una fila (sin tocar la BD)."""
+    username = str(row.get("user") or "").strip()
+    if not username:
+        raise RowError("falta user")
+    a, b, pref = _int(row, "product_a_id"), _int(row, "product_b_id"), _int(row, "preferred_id")
+    if a == b:
+        raise RowError("Productos idénticos")
+    if pref not in (a, b):
+        raise RowError("preferred_id inválido")
+
+    created_at = None
+    if row.get("created_at"):
+        created_at = parse_datetime(str(row["created_at"]))
+        if created_at is None:
+            raise RowError("created_at inválido")
+        if timezone.is_naive(created_at):
+            created_at = timezone.make_aware(created_at)
+
+    return {
+        "user": username, "a": a, "b": b, "pref": pref,
+        "justification": str(row.get("justification") or "").strip(),
+        "allow_comments": _bool(row.get("allow_comments")),
+        "created_at": created_at,
+    }
+
+
+def _existing_pairs(user_ids, product_ids):
+    return set(
+        Review.objects.filter(
+            user_id__in=user_ids, pair_low__in=product_ids, pair_high__in=product_ids,
+        ).values_list("user_id", "pair_low", "pair_high")
+    )
+
+
+# ───────────────────────── importación ────────────────────────────
+def _ingest_chunk(chunk, summary, create_users):
+    parsed = []
+    for lineno, row in chunk:
+        try:
+            if isinstance(row, RowError):
+                raise row
+            parsed.append((lineno, _parse(row)))
+        except RowError as exc:
+            _error(summary, lineno, exc)
+    if not parsed:
+        return
+
+    products = Product.objects.in_bulk({p[k] for _, p in parsed for k in ("a", "b")})
+    usernames = {p["user"] for _, p in parsed}
+    users = {u.username: u.id for u in User.objects.filter(username__in=usernames).only("id", "username")}
+    if create_users and len(users) < len(usernames):
+        new = [User(username=name) for name in usernames - users.keys()]
+        for user in new:
+            user.set_unusable_password()
+        User.objects.bulk_create(new, ignore_conflicts=True)
+        users.update(User.objects.filter(username__in=usernames).values_list("username", "id"))
+
+    seen = _existing_pairs(set(users.values()), set(products))
+    engine = moderation.engine()
+    valid = []
+    for index, (lineno, p) in enumerate(parsed):
+        try:
+            prod_a, prod_b = products.get(p["a"]), products.get(p["b"])
+            if prod_a is None or prod_b is None:
+                raise RowError("Producto inexistente")
+            if prod_a.category != prod_b.category:
+                raise RowError("Categorías distintas")
+            user_id = users.get(p["user"])
+            if user_id is None:
+                raise RowError(f"Usuario inexistente: {p['user']}")
+        except RowError as exc:
+            _error(summary, lineno, exc)
+            continue
+
+        key = (user_id, *Review.canonical_pair(p["a"], p["b"]))
+        if key in seen:
+            summary["duplicates"] += 1
+            continue
+        seen.add(key)
+
+        approved = not engine.contains(p["justification"])
+        valid.append((p["created_at"] or timezone.now(), index, user_id, p, approved, prod_a.category))
+
+    valid.sort(key=lambda v: (v[0], v[1]))       # cronológico, estable
+    reviews = [
+        Review(
+            product_a_id=p["a"], product_b_id=p["b"], preferred_product_id=p["pref"],
+            user_id=user_id, justification=p["justification"],
+            pair_low=min(p["a"], p["b"]), pair_high=max(p["a"], p["b"]),
+            category=category, allow_comments=p["allow_comments"],
+            status=StatusChoices.APROBADA if approved else StatusChoices.RECHAZADA,
+        )
+        for _, _, user_id, p, approved, category in valid
+    ]
+    try:
+        with transaction.atomic():
+            Review.objects.bulk_create(reviews)
+            # auto_now_add pisa created_at en el INSERT; se restaura el del archivo
+            for review, v in zip(reviews, valid):
+                review.created_at = v[0]
+            Review.objects.bulk_update(reviews, ["created_at"], batch_size=500)
+            # el Elo se aplica ahora, sobre los puntajes de hoy: sus EloEvent
+            # llevan la hora de la importación (ver apply_matches)
+            apply_matches([
+                (r.product_a_id, r.product_b_id, r.preferred_product_id, r.id)
+                for r in reviews if r.status == StatusChoices.APROBADA
+            ])
+    except DatabaseError as exc:
+        _error(summary, parsed[0][0], RowError(f"lote revertido ({len(reviews)} filas): {exc}"))
+        return
+
+    approved = sum(r.status == StatusChoices.APROBADA for r in reviews)
+    summary["created"] += len(reviews)
+    summary["approved"] += approved
+    summary["rejected"] += len(reviews) - approved
+    for status, count in ((StatusChoices.APROBADA, approved),
+                          (StatusChoices.RECHAZADA, len(reviews) - approved)):
+        if count:
+            review_moderated.send(sender=Review, status=status, count=count)
+
+    # bulk_create no dispara señales (ver api/signals.py)
+    for user_id in {r.user_id for r in reviews}:
+        feed_cache.bump(f"user:{user_id}")
+        db_router.stick_to_primary(user_id)
+    for category in {v[5] for v in valid}:
+        feed_cache.bump(f"cat:{category}")
+
+
+def _error(summary, lineno, exc):
+    summary["invalid"] += 1
+    if len(summary["errors"]) < MAX_REPORTED_ERRORS:
+        summary["errors"].append({"line": lineno, "error": str(exc)})
+
+
+def ingest(rows, chunk_size=CHUNK_SIZE, create_users=False, on_chunk=None):
+    """
+    Importa `rows` (iterable de (nº de línea, dict), ver read_rows) y
+    devuelve un resumen con contadores y hasta MAX_REPORTED_ERRORS errores.
+    `on_chunk(summary)` se llama tras cada lote (progreso).
+    """
+    summary = {"received": 0, "created": 0, "approved": 0, "rejected": 0,
+               "duplicates": 0, "invalid": 0, "errors": []}
+    rows = iter(rows)
+    while True:
+        chunk = list(islice(rows, chunk_size))
+        if not chunk:
+            break
+        summary["received"] += len(chunk)
+        _ingest_chunk(chunk, summary, create_users)
+        if on_chunk:
+            on_chunk(summary)
+    return summary
@@ -0,0 +1,156 @@
+"""
+Ranking Elo por categoría con consultas de rango en O(log n).
+
+Cada proceso mantiene, por categoría, una lista ordenada de claves
+`(-elo, id)` (bisect) más un dict id → (nombre, elo):
+
+• top(category, n)            – los N primeros.
+• rank(category, product_id)  – puesto del producto (empates comparten puesto).
+• around(category, id, r)     – los r productos por encima y por debajo.
+
+Sincronización (`_sync`, antes de cada consulta):
+• Incremental: los eventos del ledger `EloEvent` con id mayor al último
+  visto dicen qué productos cambiaron (también los cambiados por otros
+  procesos); se releen sólo esos productos.
+• `elo_changed` (p.ej. recompute_elo, que no escribe eventos) marca
+  productos a releer; altas/bajas/ediciones de productos fuerzan una
+  reconstrucción, igual que pasados REBUILD_SECONDS.
+"""
+import threading
+import time
+from bisect import bisect_left, insort
+
+from backend.reviews.models import EloEvent, Product
+
+REBUILD_SECONDS = 300
+MAX_INCREMENTAL = 5000
+
+
+class _CategoryIndex:
+    def __init__(self):
+        self.keys = []      # [(-elo, id)] ordenado
+        self.items = {}     # id → (name, elo)
+
+    def put(self, pid, name, elo):
+        old = self.items.get(pid)
+        if old is not None:
+            i = bisect_left(self.keys, (-old[1], pid))
+            del self.keys[i]
+        insort(self.keys, (-elo, pid))
+        self.items[pid] = (name, elo)
+
+    def remove(self, pid):
+        old = self.items.pop(pid, None)
+        if old is not None:
+            del self.keys[bisect_left(self.keys, (-old[1], pid))]
+
+    def row(self, pos):
+        neg_elo, pid = self.keys[pos]
+        return {
+            # puesto "de competición": empatados comparten el mejor puesto
+            "rank": bisect_left(self.keys, (neg_elo,)) + 1,
+            "id": pid,
+            "name": self.items[pid][0],
+            "elo": -neg_elo,
+        }
+
+
+_lock = threading.Lock()
+_indexes = {}
+_state = {"last_event": 0, "built_at": 0.0, "stale": True, "pending": set()}
+
+
+def invalidate():
+    """Fuerza reconstrucción completa en la próxima consulta."""
+    with _lock:
+        _state["stale"] = True
+
+
+def refresh_products(product_ids):
+    """Marca productos cuyo Elo cambió para releerlos en la próxima consulta."""
+    with _lock:
+        _state["pending"].update(product_ids)
+
+
+def _rebuild():
+    last_event = EloEvent.objects.order_by("-id").values_list("id", flat=True).first() or 0
+    indexes = {c: _CategoryIndex() for c, _ in Product.CATEGORIES}
+    rows = Product.objects.values_list("id", "name", "category", "elo_score")
+    for pid, name, cat, elo in rows.iterator(chunk_size=5000):
+        idx = indexes.setdefault(cat, _CategoryIndex())
+        idx.items[pid] = (name, elo)
+        idx.keys.append((-elo, pid))
+    for idx in indexes.values():
+        idx.keys.sort()
+
+    _indexes.clear()
+    _indexes.update(indexes)
+    _state.update(last_event=last_event, built_at=time.monotonic(), stale=False)
+    _state["pending"].clear()
+
+
+def _sync():
+    if _state["stale"] or time.monotonic() - _state["built_at"] > REBUILD_SECONDS:
+        _rebuild()
+        return
+
+    events = list(
+        EloEvent.objects.filter(id__gt=_state["last_event"])
+        .order_by("id").values_list("id", "product_id")[:MAX_INCREMENTAL + 1]
+    )
+    if len(events) > MAX_INCREMENTAL:
+        _rebuild()
+        return
+
+    changed = _state["pending"] | {pid for _, pid in events}
+    if events:
+        _state["last_event"] = events[-1][0]
+    _state["pending"] = set()
+    if not changed:
+        return
+
+    fresh = list(
+        Product.objects.filter(id__in=changed)
+        .values_list("id", "name", "category", "elo_score")
+    )
+    for pid, name, cat, elo in fresh:
+        for other, idx in _indexes.items():
+            if other != cat:
+                idx.remove(pid)
+        _indexes.setdefault(cat, _CategoryIndex()).put(pid, name, elo)
+    for pid in changed - {row[0] for row in fresh}:
+        for idx in _indexes.values():
+            idx.remove(pid)
+
+
+def _index(category):
+    _sync()
+    return _indexes.get(category) or _CategoryIndex()
+
+
+def top(category, n=10):
+    with _lock:
+        idx = _index(category)
+        return len(idx.keys), [idx.row(i) for i in range(min(n, len(idx.keys)))]
+
+
+def rank(category, product_id):
+    """Fila del producto (con su puesto) o None si no está en la categoría."""
+    with _lock:
+        idx = _index(category)
+        item = idx.items.get(product_id)
+        if item is None:
+            return None
+        return idx.row(bisect_left(idx.keys, (-item[1], product_id)))
+
+
+def around(category, product_id, radius=5):
+    """Los `radius` productos por encima y por debajo de `product_id` (incluido)."""
+    with _lock:
+        idx = _index(category)
+        item = idx.items.get(product_id)
+        if item is None:
+            return None
+        pos = bisect_left(idx.keys, (-item[1], product_id))
+        lo, hi = max(0, pos - radius), min(len(idx.keys), pos + radius + 1)
+        return [idx.row(i) for i in range(lo, hi)]
@@ -0,0 +1,113 @@
+"""
+Caché de informes generados (PDF), direccionada por contenido.
+
+La clave es el SHA-256 de (formato, RENDER_VERSION, parámetros, métricas):
+si los datos del informe no cambiaron, el archivo ya generado se sirve tal
+cual, sin volver a dibujar gráficos ni armar el documento; si cambiaron,
+la clave es otra y nunca se sirve un informe viejo.
+
+Los archivos viven en `settings.REPORT_CACHE["DIR"]` (uno por clave). Tras
+cada escritura se desalojan los menos usados recientemente (mtime, que se
+renueva en cada acierto) hasta quedar bajo `MAX_BYTES`.
+
+`manage.py precompute_reports` llena la caché fuera del request.
+"""
+import hashlib
+import json
+import os
+import tempfile
+import threading
+from pathlib import Path
+
+from django.conf import settings
+
+# subir al cambiar el diseño del PDF: invalida todo lo generado antes
+RENDER_VERSION = 1
+
+_evict_lock = threading.Lock()
+
+
+def _conf(name):
+    defaults = {
+        "DIR": Path(tempfile.gettempdir()) / "elopinion-reports",
+        "MAX_BYTES": 200 * 1024 * 1024,
+    }
+    return getattr(settings, "REPORT_CACHE", {}).get(name, defaults[name])
+
+
+def _dir():
+    path = Path(_conf("DIR"))
+    path.mkdir(parents=True, exist_ok=True)
+    return path
+
+
+def report_key(fmt, params, metrics):
+    raw = json.dumps(
+        {"fmt": fmt, "v": RENDER_VERSION, "params": params, "metrics": metrics},
+        sort_keys=True, default=str, ensure_ascii=False,
+    )
+    return hashlib.sha256(raw.encode()).hexdigest()
+
+
+def get_or_render(fmt, params, metrics, render):
+    """
+    Devuelve (archivo, clave, acierto): `archivo` ya está abierto en modo
+    binario y al principio; el llamador lo cierra (FileResponse lo hace
+    solo). `render(metrics)` debe devolver un archivo en memoria (BytesIO) y
+    sólo se llama si el informe no está.
+
+    Se devuelve el archivo abierto y no la ruta porque `evict` (de este u
+    otro proceso) puede borrarlo en cualquier momento: un archivo abierto
+    sigue siendo legible aunque se borre, una ruta no.
+    """
+    key = report_key(fmt, params, metrics)
+    path = _dir() / f"{key}.{fmt}"
+    try:
+        fh = open(path, "rb")
+    except FileNotFoundError:
+        pass                        # nunca generado o recién desalojado
+    else:
+        try:
+            os.utime(path)          # acierto: renueva su lugar en el LRU
+        except FileNotFoundError:
+            pass
+        return fh, key, True
+
+    data = render(metrics).getvalue()
+    # escritura atómica: nadie lee un archivo a medio escribir; se devuelve
+    # el mismo descriptor, que no depende de que el archivo siga en disco
+    fd, tmp = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+    fh = os.fdopen(fd, "w+b")
+    try:
+        fh.write(data)
+        fh.flush()
+        os.replace(tmp, path)
+    except BaseException:
+        fh.close()
+        raise
+    fh.seek(0)
+    evict()
+    return fh, key, False
+
+
+def evict(max_bytes=None):
+    """Borra los informes menos usados hasta quedar bajo `max_bytes`."""
+    max_bytes = _conf("MAX_BYTES") if max_bytes is None else max_bytes
+    with _evict_lock:
+        files = []
+        for entry in os.scandir(_dir()):
+            if entry.is_file() and not entry.name.endswith(".tmp"):
+                st = entry.stat()
+                files.append((st.st_mtime, st.st_size, entry.path))
+        total = sum(size for _, size, _ in files)
+        removed = 0
+        for _, size, path in sorted(files):
+            if total <= max_bytes:
+                break
+            try:
+                os.remove(path)
+            except OSError:         # ya borrado, o abierto en Windows
+                continue
+            total -= size
+            removed += 1
+        return removed, total
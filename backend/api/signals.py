@@ -0,0 +1,83 @@
+"""
+Receptores que mantienen al día la caché de feeds (services.feed_cache)
+y la versión del catálogo (services.catalog).
+
+• Review guardada (alta o moderación) → se descarta su JSON cacheado, se
+  invalidan las páginas del autor y de la categoría y el autor lee de la
+  primaria por un rato (api/db_router.py).
+• Review eliminada                    → ídem.
+• Comment creado                      → se agrega a la reseña cacheada.
+• Product guardado/eliminado          → sube la versión del catálogo y
+                                        actualiza el ranking por categoría.
+• Elo cambiado (`elo_changed`)        → actualiza el ranking y anota el
+                                        cambio para el catálogo, que lo
+                                        publica a lo sumo cada
+                                        ELO_PUBLISH_SECONDS.
+• ProhibitedTerm guardado/eliminado   → recompila el léxico de moderación
+                                        (en todos los procesos).
+• Elo cambiado / reseñas moderadas    → contadores de /api/metrics/.
+
+Ojo: bulk_create / QuerySet.update no disparan señales; quien los use
+debe invalidar a mano con `feed_cache.bump(...)`.
+"""
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from backend.api import db_router
+from backend.api.services import feed_cache, leaderboard
+from backend.api.services.catalog import bump_catalog_version, mark_elo_changed
+from backend.api.utils import metrics
+from backend.reviews.models import Comment, ProhibitedTerm, Product, Review
+from backend.reviews.services import moderation
+from backend.reviews.signals import elo_changed, review_moderated
+
+
+def _invalidate(review):
+    feed_cache.forget_review(review.id)
+    feed_cache.bump(f"user:{review.user_id}")
+    feed_cache.bump(f"cat:{review.category}")
+    db_router.stick_to_primary(review.user_id)
+
+
+@receiver(post_save, sender=Review)
+def review_saved(sender, instance, **kwargs):
+    _invalidate(instance)
+
+
+@receiver(post_delete, sender=Review)
+def review_deleted(sender, instance, **kwargs):
+    _invalidate(instance)
+
+
+@receiver(post_save, sender=Comment)
+def comment_saved(sender, instance, created, **kwargs):
+    if created:
+        feed_cache.add_comment(instance)
+    else:
+        feed_cache.forget_review(instance.review_id)
+
+
+@receiver(post_save, sender=Product)
+@receiver(post_delete, sender=Product)
+def product_changed(sender, **kwargs):
+    bump_catalog_version()
+    leaderboard.invalidate()
+
+
+@receiver(elo_changed)
+def elo_scores_changed(sender, product_ids, matches=0, **kwargs):
+    mark_elo_changed()
+    leaderboard.refresh_products(product_ids)
+    if matches:
+        metrics.inc("elopinion_elo_updates_total", value=matches)
+
+
+@receiver(review_moderated)
+def review_was_moderated(sender, status, count=1, **kwargs):
+    metrics.inc("elopinion_moderation_total", (("outcome", status),), count)
+
+
+@receiver(post_save, sender=ProhibitedTerm)
+@receiver(post_delete, sender=ProhibitedTerm)
+def lexicon_changed(sender, **kwargs):
+    moderation.reload()
@@ -3,23 +3,30 @@ URL-patterns para las HU en backend.api.views_hu
 """
 from django.urls import path
 from ..views_hu.views             import (
-    submit_review, random_feed, personalized_feed, list_products,
-    my_reviews_feed, delete_my_review, GenerarInformeView, whoami
+    submit_review, review_status, bulk_import_reviews, random_feed, personalized_feed, list_products,
+    my_reviews_feed, delete_my_review, GenerarInformeView, whoami,
+    feed_cache_stats, export_reviews,
 )
+from ..views_hu.leaderboard       import category_leaderboard
+from ..views_hu.metrics           import prometheus_metrics
 from ..views_hu.comments_reports  import (
-    create_comment, create_report,
+    create_comment, list_comments, create_report,
     moderate_report, list_reports
 )
 
 urlpatterns = [
     # HU-003
     path("submit-review/", submit_review, name="submit_review"),
+    path("reviews/<int:pk>/status/", review_status, name="review_status"),
+    path("reviews/bulk/",       bulk_import_reviews, name="review_bulk_import"),
     path("feed/",               random_feed,        name="feed"),
     path("feed/personalized/",  personalized_feed,  name="personalized_feed"),  # HU-009
     path("products/",           list_products,      name="list_products"),
+    path("leaderboard/<str:category>/", category_leaderboard, name="leaderboard"),
 
     # HU-004
     path("comments/", create_comment, name="comment-create"),
+    path("reviews/<int:pk>/comments/", list_comments, name="comment-list"),
 
     # HU-002
     path("reports/",          create_report,   name="report-create"),
@@ -28,9 +35,12 @@ urlpatterns = [
 
     # HU-007
     path("hu007/report/", GenerarInformeView.as_view(), name="hu007-report"),
+    path("reviews/export/", export_reviews, name="review_export"),
 
     # utilitarios
     path("whoami/",            whoami,              name="whoami"),
     path("my-reviews/",        my_reviews_feed,     name="my_reviews"),
     path("my-reviews/<int:pk>/", delete_my_review,  name="my_review_delete"),
+    path("feed-cache/stats/",  feed_cache_stats,    name="feed_cache_stats"),
+    path("metrics/",           prometheus_metrics,  name="metrics"),
 ]
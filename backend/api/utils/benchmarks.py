@@ -0,0 +1,82 @@
+"""
+Helpers para los comandos de benchmark (`manage.py bench_*`).
+
+• scratch_database – BD desechable, igual que la que crea `manage.py test`.
+• time_call        – mide una función y devuelve mediana / p95 en ms.
+• seed_reviews     – agrega reseñas mínimas con bulk_create hasta llegar a N.
+"""
+import statistics
+import time
+from contextlib import contextmanager
+from itertools import combinations, islice
+
+from django.contrib.auth.models import User
+from django.db import connection
+from django.db.models import Max
+
+from backend.reviews.models import Product, Review, StatusChoices
+
+
+@contextmanager
+def scratch_database(verbosity=0):
+    """Crea una BD de prueba vacía para el benchmark y la destruye al salir."""
+    old_name = connection.settings_dict["NAME"]
+    connection.creation.create_test_db(
+        verbosity=verbosity, autoclobber=True, serialize=False
+    )
+    try:
+        yield
+    finally:
+        connection.creation.destroy_test_db(old_name, verbosity=verbosity)
+
+
+def time_call(fn, repeat=20):
+    """Ejecuta `fn` `repeat` veces; devuelve (mediana_ms, p95_ms)."""
+    samples = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - t0) * 1000)
+    samples.sort()
+    p95 = samples[min(len(samples) - 1, int(len(samples) * 0.95))]
+    return statistics.median(samples), p95
+
+
+def seed_reviews(total, category="pelicula", n_products=60, batch_size=5000):
+    """
+    Completa la tabla de reseñas hasta el id `total` (todas aprobadas,
+    misma categoría, una por usuario y pareja). Pensado para medir cómo
+    escalan las consultas, no para datos realistas.
+    """
+    existing = Review.objects.aggregate(n=Max("id"))["n"] or 0
+    if existing >= total:
+        return existing
+
+    products = list(Product.objects.filter(category=category).order_by("id"))
+    if len(products) < n_products:
+        products += Product.objects.bulk_create(
+            Product(name=f"bench-{category}-{i}", category=category)
+            for i in range(len(products), n_products)
+        )
+    pairs = list(combinations([p.id for p in products], 2))
+
+    def rows():
+        n = existing
+        while True:
+            user, _ = User.objects.get_or_create(username=f"bench-{n // len(pairs)}")
+            for a, b in pairs[n % len(pairs):]:
+                yield Review(
+                    product_a_id=a, product_b_id=b, preferred_product_id=a,
+                    pair_low=a, pair_high=b,        # combinations: a < b
+                    category=category,
+                    user_id=user.id, status=StatusChoices.APROBADA,
+                )
+                n += 1
+
+    it = rows()
+    remaining = total - existing
+    while remaining > 0:
+        batch = list(islice(it, min(batch_size, remaining)))
+        Review.objects.bulk_create(batch)
+        remaining -= len(batch)
+    return total
@@ -0,0 +1,101 @@
+"""
+Gráficos vectoriales para los informes PDF (reportlab.graphics).
+
+Devuelven un `Drawing`, que es un flowable de platypus: se inserta en el
+documento tal cual y queda como trazos y texto dentro del PDF, sin pasar
+por un PNG. Frente a matplotlib a 150 dpi, el informe se genera varias
+veces más rápido y pesa una fracción (ver `manage.py bench_report_charts`).
+
+Mismas entradas que los gráficos de matplotlib en utils/pdf.py.
+"""
+from reportlab.graphics.charts.barcharts import VerticalBarChart
+from reportlab.graphics.charts.linecharts import HorizontalLineChart
+from reportlab.graphics.shapes import Drawing, String
+from reportlab.graphics.widgets.markers import makeMarker
+from reportlab.lib import colors
+from reportlab.lib.units import inch
+
+COLOR = colors.HexColor("#4f6af5")
+WIDTH, HEIGHT = 6 * inch, 3 * inch
+
+
+def _canvas(title):
+    drawing = Drawing(WIDTH, HEIGHT)
+    drawing.add(String(WIDTH / 2, HEIGHT - 14, title, textAnchor="middle",
+                       fontName="Helvetica-Bold", fontSize=11))
+    return drawing
+
+
+def _empty(drawing):
+    drawing.add(String(WIDTH / 2, HEIGHT / 2, "Sin datos en el rango",
+                       textAnchor="middle", fontSize=9, fillColor=colors.grey))
+    return drawing
+
+
+def _value_axis(axis, values):
+    """Escala con margen, para que las diferencias de Elo se vean."""
+    lo, hi = min(values), max(values)
+    pad = max((hi - lo) * 0.1, 10)
+    axis.valueMin = max(lo - pad, 0)
+    axis.valueMax = hi + pad
+    axis.labels.fontSize = 7
+    axis.gridStrokeColor = colors.lightgrey
+    axis.gridStrokeDashArray = (2, 2)
+    axis.visibleGrid = True
+
+
+def _marker():
+    marker = makeMarker("FilledCircle")
+    marker.size = 4
+    marker.fillColor = COLOR
+    return marker
+
+
+def bar_chart(top_products):
+    """
+    top_products = [{"producto": "...", "elo": 1520}, ...]
+    """
+    drawing = _canvas("Top productos por Elo")
+    if not top_products:
+        return _empty(drawing)
+
+    chart = VerticalBarChart()
+    chart.x, chart.y = 45, 45
+    chart.width, chart.height = WIDTH - 60, HEIGHT - 75
+    chart.data = [[p["elo"] for p in top_products]]
+    chart.bars[0].fillColor = COLOR
+    chart.bars[0].strokeColor = None
+    chart.categoryAxis.categoryNames = [p["producto"][:18] for p in top_products]
+    chart.categoryAxis.labels.angle = 15
+    chart.categoryAxis.labels.boxAnchor = "ne"
+    chart.categoryAxis.labels.fontSize = 7
+    _value_axis(chart.valueAxis, chart.data[0])
+    drawing.add(chart)
+    drawing.add(String(10, chart.y + chart.height / 2, "Puntaje Elo", fontSize=8))
+    return drawing
+
+
+def line_chart(evo_dict):
+    """
+    evo_dict = {'2025-05': 1480, '2025-06': 1502, ...}
+    """
+    drawing = _canvas("Evolución Elo promedio")
+    meses = sorted(evo_dict)
+    if not meses:
+        return _empty(drawing)
+
+    chart = HorizontalLineChart()
+    chart.x, chart.y = 45, 35
+    chart.width, chart.height = WIDTH - 60, HEIGHT - 65
+    chart.data = [[evo_dict[m] for m in meses]]
+    chart.lines[0].strokeColor = COLOR
+    chart.lines[0].strokeWidth = 2
+    chart.lines[0].symbol = _marker()
+    chart.joinedLines = 1
+    # con muchos meses, una etiqueta cada tantos
+    step = max(len(meses) // 12, 1)
+    chart.categoryAxis.categoryNames = [m if i % step == 0 else "" for i, m in enumerate(meses)]
+    chart.categoryAxis.labels.fontSize = 7
+    _value_axis(chart.valueAxis, chart.data[0])
+    drawing.add(chart)
+    return drawing
@@ -1,29 +1,339 @@
-from collections import defaultdict
-from datetime import datetime
+"""
+Métricas internas en el formato de texto de Prometheus (`GET /api/metrics/`).
 
-def calcular_metricas(reseñas):
-    productos = defaultdict(list)
-    elos = defaultdict(lambda: 1000)
-    historia_elo = defaultdict(list)
+Registro
+────────────────────────────────────────────────────────────────────────────
+Cada hilo suma en sus propios dicts (`threading.local`), así que el camino
+caliente (`inc` / `observe`) no toma locks: un par de operaciones de dict y
+un `bisect`. El lock sólo se usa la primera vez que un hilo registra su
+almacén. Cuando el hilo (o greenlet) termina, su `threading.local` se
+libera y un `weakref.finalize` encola el almacén; `snapshot()` lo suma a
+uno "retirado" del proceso y lo suelta. Así `runserver` (un hilo por
+request) o gevent no acumulan un almacén por hilo para siempre.
 
-    for r in reseñas:
-        producto = r['producto']
-        productos[producto].append(r['valoracion'])
+Varios procesos
+────────────────────────────────────────────────────────────────────────────
+Con gunicorn cada worker (y `manage.py review_worker`) tiene su propio
+registro. Cada proceso vuelca su acumulado a `METRICS["DIR"]/<pid>-<uuid>.json`
+como mucho cada `FLUSH_SECONDS` (`maybe_flush`, llamado al final de cada
+request o lote) y el endpoint suma todos los archivos más el estado en vivo
+del proceso que atiende. El uuid se genera por proceso (también en los hijos
+de un fork), así un pid reutilizado nunca pisa los totales de otro.
 
-        cambio = 30 if r['resultado'] == "ganó" else -30
-        elos[producto] += cambio
+Son todos contadores/histogramas acumulados: lo de un proceso terminado no
+se descarta sino que `collect` lo suma a `aggregate.json` y borra su archivo
+(bajo un `flock` del directorio), de modo que los totales no retroceden y el
+directorio no crece con cada reinicio de workers. Un proceso se da por
+muerto cuando su pid ya no existe, por eso `DIR` tiene que ser local a la
+máquina (y al espacio de pids del contenedor). Vaciar el directorio equivale
+a un reinicio de contadores, que Prometheus ya sabe manejar.
+"""
+import json
+import os
+import tempfile
+import threading
+import time
+import uuid
+import weakref
+from bisect import bisect_left
+from contextlib import contextmanager, nullcontext
+from pathlib import Path
 
-        historia_elo[producto].append({
-            "fecha": r["fecha"],
-            "elo": elos[producto]
-        })
+from django.conf import settings
 
-    top_productos = sorted([
-        {"producto": p, "promedio": sum(v) / len(v)}
-        for p, v in productos.items()
-    ], key=lambda x: -x["promedio"])[:3]
+try:
+    import fcntl
+except ImportError:               # Windows: sin compactación (sólo desarrollo)
+    fcntl = None
 
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+SIZE_BUCKETS = (100, 1_000, 10_000, 100_000, 1_000_000, 10_000_000)
+QUERY_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100, 200)
+
+# nombre → (tipo, ayuda, buckets)
+FAMILIES = {
+    "elopinion_http_request_duration_seconds": (
+        "histogram", "Latencia de las respuestas por ruta.", LATENCY_BUCKETS),
+    "elopinion_http_response_size_bytes": (
+        "histogram", "Tamaño de las respuestas por ruta (si se conoce).", SIZE_BUCKETS),
+    "elopinion_db_queries_per_request": (
+        "histogram", "Consultas SQL por request.", QUERY_BUCKETS),
+    "elopinion_db_duration_seconds_per_request": (
+        "histogram", "Tiempo en la BD por request.", LATENCY_BUCKETS),
+    "elopinion_moderation_total": (
+        "counter", "Reseñas moderadas, por resultado.", None),
+    "elopinion_elo_updates_total": (
+        "counter", "Comparaciones aplicadas al Elo.", None),
+}
+
+_local = threading.local()
+_stores = {}                      # id → (counters, histograms) de cada hilo vivo
+_retired = ({}, {})               # lo sumado por los hilos que ya terminaron
+_dead = []                        # almacenes de hilos terminados, sin plegar aún
+_stores_lock = threading.Lock()
+_last_flush = time.monotonic()
+_identity = (None, None)          # (pid, nombre del archivo de este proceso)
+
+AGGREGATE = "aggregate.json"
+
+
+def _conf(name):
+    defaults = {
+        "ENABLED": True,
+        "DIR": Path(tempfile.gettempdir()) / "elopinion-metrics",
+        "FLUSH_SECONDS": 5,
+        "TOKEN": None,
+    }
+    return getattr(settings, "METRICS", {}).get(name, defaults[name])
+
+
+def enabled():
+    return _conf("ENABLED")
+
+
+def auth_token():
+    return _conf("TOKEN")
+
+
+def _reset_after_fork():
+    # el hijo (p.ej. gunicorn --preload) arranca en cero: lo heredado es del padre
+    global _local, _stores, _retired, _dead, _stores_lock
+    _local = threading.local()
+    _stores = {}
+    _retired = ({}, {})
+    _dead = []
+    _stores_lock = threading.Lock()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_after_fork)
+
+
+class _Owner:
+    """Vive sólo en el `threading.local` del hilo: se libera cuando el hilo termina."""
+    __slots__ = ("__weakref__",)
+
+
+def _store():
+    try:
+        return _local.store
+    except AttributeError:
+        store = ({}, {})
+        owner = _local.owner = _Owner()
+        # sin lock: el finalizador puede correr en cualquier hilo, incluso
+        # dentro de snapshot(); list.append es atómico bajo el GIL
+        weakref.finalize(owner, _dead.append, store)
+        with _stores_lock:
+            _stores[id(store)] = store
+        _local.store = store
+        return store
+
+
+# ───────────────────────── camino caliente ───────────────────────
+def inc(name, labels=(), value=1):
+    """Suma `value` al contador `name`; `labels` = ((clave, valor), ...)."""
+    counters = _store()[0]
+    key = (name, labels)
+    counters[key] = counters.get(key, 0) + value
+
+
+def observe(name, value, labels=()):
+    """Registra `value` en el histograma `name`."""
+    histograms = _store()[1]
+    key = (name, labels)
+    buckets = FAMILIES[name][2]
+    row = histograms.get(key)
+    if row is None:
+        # un contador por bucket (+Inf al final) y la suma
+        row = histograms[key] = [0] * (len(buckets) + 2)
+    row[bisect_left(buckets, value)] += 1
+    row[-1] += value
+
+
+# ───────────────────────── agregación ────────────────────────────
+def snapshot():
+    """Acumulado del proceso: {"counters": {...}, "histograms": {...}}."""
+    counters, histograms = {}, {}
+    with _stores_lock:
+        while _dead:
+            store = _dead.pop()
+            if _stores.pop(id(store), None) is not None:
+                _merge(_retired, store)
+        stores = [_retired, *_stores.values()]
+        for thread_counters, thread_histograms in stores:
+            # .copy() es atómico bajo el GIL: el hilo dueño puede seguir sumando
+            for key, value in thread_counters.copy().items():
+                counters[key] = counters.get(key, 0) + value
+            for key, row in thread_histograms.copy().items():
+                _add_row(histograms, key, list(row))
+    return {"counters": counters, "histograms": histograms}
+
+
+def _merge(into, store):
+    for key, value in store[0].items():
+        into[0][key] = into[0].get(key, 0) + value
+    for key, row in store[1].items():
+        _add_row(into[1], key, list(row))
+
+
+def _add_row(histograms, key, row):
+    total = histograms.get(key)
+    if total is None:
+        histograms[key] = row
+    else:
+        for i, value in enumerate(row):
+            total[i] += value
+
+
+def _encode(snap):
     return {
-        "top_productos": top_productos,
-        "evolucion_elo": historia_elo
+        kind: [[name, [list(l) for l in labels], value] for (name, labels), value in items.items()]
+        for kind, items in snap.items()
     }
+
+
+def _decode_into(data, snap):
+    for name, labels, value in data.get("counters", []):
+        key = (name, tuple(map(tuple, labels)))
+        snap["counters"][key] = snap["counters"].get(key, 0) + value
+    for name, labels, row in data.get("histograms", []):
+        _add_row(snap["histograms"], (name, tuple(map(tuple, labels))), row)
+
+
+def _own_name():
+    global _identity
+    pid = os.getpid()
+    if _identity[0] != pid:       # primer uso o hijo de un fork
+        _identity = (pid, f"{pid}-{uuid.uuid4().hex}.json")
+    return _identity[1]
+
+
+def _read(path):
+    try:
+        return json.loads(path.read_text())
+    except (OSError, ValueError):
+        return None               # archivo a medio borrar o corrupto
+
+
+def _write(path, data):
+    fd, tmp = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+    with os.fdopen(fd, "w") as fh:
+        json.dump(data, fh)
+    os.replace(tmp, path)
+
+
+def flush():
+    """Vuelca el acumulado de este proceso a su archivo (escritura atómica)."""
+    global _last_flush
+    _last_flush = time.monotonic()
+    directory = Path(_conf("DIR"))
+    directory.mkdir(parents=True, exist_ok=True)
+    _write(directory / _own_name(), _encode(snapshot()))
+
+
+def maybe_flush():
+    if time.monotonic() - _last_flush >= _conf("FLUSH_SECONDS"):
+        flush()
+
+
+def _alive(pid):
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        pass                      # existe, pero es de otro usuario
+    return True
+
+
+@contextmanager
+def _locked(directory):
+    with open(directory / ".lock", "a") as fh:
+        fcntl.flock(fh, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(fh, fcntl.LOCK_UN)
+
+
+def _compact(directory, own):
+    """Suma al agregado los archivos de procesos muertos y los borra."""
+    path = directory / AGGREGATE
+    data = _read(path) or {}
+    # los de la pasada anterior ya están sumados: si quedó alguno (caída entre
+    # escribir el agregado y borrar), se borra sin volver a sumarlo
+    leftovers = data.get("absorbed", [])
+    for name in leftovers:
+        (directory / name).unlink(missing_ok=True)
+
+    dead = []
+    for proc in directory.glob("*-*.json"):
+        pid = proc.name.split("-", 1)[0]
+        if proc.name != own and pid.isdigit() and not _alive(int(pid)):
+            dead.append(proc)
+    if not dead and not leftovers:
+        return
+
+    snap = {"counters": {}, "histograms": {}}
+    _decode_into(data, snap)
+    for proc in dead:
+        _decode_into(_read(proc) or {}, snap)
+    _write(path, {**_encode(snap), "absorbed": [proc.name for proc in dead]})
+    for proc in dead:
+        proc.unlink(missing_ok=True)
+
+
+def collect():
+    """Suma de todos los procesos (este, en vivo; el resto, desde sus archivos)."""
+    snap = snapshot()
+    own = _own_name()
+    directory = Path(_conf("DIR"))
+    if not directory.is_dir():
+        return snap
+    with _locked(directory) if fcntl else nullcontext():
+        if fcntl:
+            _compact(directory, own)
+        for path in directory.glob("*.json"):
+            if path.name != own:
+                _decode_into(_read(path) or {}, snap)
+    return snap
+
+
+# ───────────────────────── exposición ────────────────────────────
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _labels(labels, extra=()):
+    pairs = [*labels, *extra]
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{k}="{_escape(v)}"' for k, v in pairs) + "}"
+
+
+def _number(value):
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+def render(snap=None):
+    """Texto en formato de exposición de Prometheus (versión 0.0.4)."""
+    snap = snap or collect()
+    lines = []
+    for name, (kind, help_text, buckets) in FAMILIES.items():
+        lines.append(f"# HELP {name} {help_text}")
+        lines.append(f"# TYPE {name} {kind}")
+        if kind == "counter":
+            for (metric, labels), value in sorted(snap["counters"].items()):
+                if metric == name:
+                    lines.append(f"{name}{_labels(labels)} {_number(value)}")
+            continue
+        for (metric, labels), row in sorted(snap["histograms"].items()):
+            if metric != name:
+                continue
+            cumulative = 0
+            for bound, count in zip((*buckets, "+Inf"), row[:-1]):
+                cumulative += count
+                lines.append(f"{name}_bucket{_labels(labels, (('le', bound),))} {cumulative}")
+            lines.append(f"{name}_sum{_labels(labels)} {_number(row[-1])}")
+            lines.append(f"{name}_count{_labels(labels)} {cumulative}")
+    return "\n".join(lines) + "\n"
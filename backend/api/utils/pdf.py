@@ -1,17 +1,45 @@
 """
 Utilidades para PDF sin ratings 1-5.
 Gráficos basados en Elo.
+
+Los gráficos se dibujan por defecto como vectores de reportlab
+(utils/charts.py). matplotlib queda como alternativa opcional
+(`REPORT_CHART_BACKEND = "matplotlib"`): rasteriza a PNG de 150 dpi, es más
+lento y engorda el PDF; si no está instalado se usa el backend vectorial.
+
+reportlab (y matplotlib, si se usa) pesan cientos de ms y decenas de MB al
+importarse: este módulo sólo se importa al generar un PDF (import diferido
+en la vista). No importarlo a nivel de módulo desde nada que cargue el
+URLconf; lo vigila `manage.py check_import_budget`.
 """
 import io
-import matplotlib
-matplotlib.use("Agg")
-import matplotlib.pyplot as plt
+import logging
+
+from django.conf import settings
 from reportlab.platypus import SimpleDocTemplate, Spacer, Image, Paragraph, Table
 from reportlab.lib.styles import getSampleStyleSheet
 from reportlab.lib.units import inch
-from reportlab.pdfgen import canvas
-from reportlab.lib.pagesizes import A4
-from reportlab.lib.utils import ImageReader
+
+from backend.api.utils import charts
+
+logger = logging.getLogger(__name__)
+
+CHART_BACKENDS = ("reportlab", "matplotlib")
+
+
+def chart_backend():
+    """Backend configurado (forma parte de la clave de la caché de informes)."""
+    backend = getattr(settings, "REPORT_CHART_BACKEND", "reportlab")
+    if backend not in CHART_BACKENDS:
+        raise ValueError(f"REPORT_CHART_BACKEND desconocido: {backend!r}")
+    return backend
+
+
+def _pyplot():
+    import matplotlib
+    matplotlib.use("Agg")
+    import matplotlib.pyplot as plt
+    return plt
 
 
 # ------------------------------------------------------------------ #
@@ -22,6 +50,7 @@ def _render_bar_chart(top_products):
     nombres = [p["producto"] for p in top_products]
     elos    = [p["elo"]      for p in top_products]
 
+    plt = _pyplot()
     fig, ax = plt.subplots(figsize=(6, 3))
     ax.bar(nombres, elos, color="#4f6af5")
     ax.set_ylabel("Puntaje Elo")
@@ -43,6 +72,7 @@ def plot_evolution(evo_dict):
     meses   = sorted(evo_dict.keys())
     valores = [evo_dict[m] for m in meses]
 
+    plt = _pyplot()
     fig, ax = plt.subplots(figsize=(6, 3))
     ax.plot(meses, valores, marker="o", linewidth=2, color="#4f6af5")
     ax.set_title("Evolución Elo promedio")
@@ -58,11 +88,26 @@ def plot_evolution(evo_dict):
     return buf
 
 
+def _charts(metrics, backend):
+    """(gráfico top N, gráfico de evolución) como flowables."""
+    if backend == "matplotlib":
+        try:
+            return (
+                Image(_render_bar_chart(metrics["top_products"]), width=6 * inch, height=3 * inch),
+                Image(plot_evolution(metrics["elo_evolution"]), width=6 * inch, height=3 * inch),
+            )
+        except ImportError:
+            logger.warning("matplotlib no disponible; se usan gráficos vectoriales")
+    return charts.bar_chart(metrics["top_products"]), charts.line_chart(metrics["elo_evolution"])
+
+
 # ------------------------------------------------------------------ #
-def build_pdf(metrics):
+def build_pdf(metrics, backend=None):
     """
-    Construye PDF con reportlab (una sola página).
+    Construye PDF con reportlab (una sola página). `backend` de gráficos:
+    por defecto el de `REPORT_CHART_BACKEND`.
     """
+    bar, evolution = _charts(metrics, backend or chart_backend())
     buffer = io.BytesIO()
     doc    = SimpleDocTemplate(buffer, rightMargin=36, leftMargin=36)
     styles = getSampleStyleSheet()
@@ -72,8 +117,7 @@ def build_pdf(metrics):
     flow.append(Spacer(1, 12))
 
     # Gráfico Top N
-    chart = _render_bar_chart(metrics["top_products"])
-    flow.append(Image(chart, width=6 * inch, height=3 * inch))
+    flow.append(bar)
     flow.append(Spacer(1, 12))
 
     # Tabla Top N
@@ -84,9 +128,8 @@ def build_pdf(metrics):
     flow.append(Spacer(1, 24))
 
     # Evolución Elo
-    evo_img = ImageReader(plot_evolution(metrics["elo_evolution"]))
     flow.append(Paragraph("Evolución Elo promedio", styles["Heading2"]))
-    flow.append(Image(evo_img, width=6 * inch, height=3 * inch))
+    flow.append(evolution)
 
     doc.build(flow)
     buffer.seek(0)
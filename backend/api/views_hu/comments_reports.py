@@ -2,6 +2,7 @@
 Vistas HU-004 (comentarios) y HU-002 (reportes).
 
 POST   /api/comments/          – crear comentario
+GET    /api/reviews/<id>/comments/ – comentarios de una reseña (por cursor)
 POST   /api/reports/           – crear reporte
 GET    /api/reports/           – listar reportes PENDIENTES (solo admin)
 PATCH  /api/reports/<id>/      – admin aprueba / rechaza
@@ -17,6 +18,7 @@ from rest_framework              import status
 from django.views.decorators.http import require_http_methods
 
 from backend.api.authentication  import CsrfExemptSessionAuthentication
+from backend.api.db_router       import replica_reads
 from backend.api.permissions.admin import IsEloAdmin
 from backend.api.serializers.comments_reports import (
     CommentSerializer,
@@ -24,7 +26,16 @@ from backend.api.serializers.comments_reports import (
     ReportListSerializer,
 )
 
-from backend.reviews.models import Review, Comment, Report
+from backend.api.services.feeds import (
+    InvalidCursor,
+    chronological_page,
+    decode_cursor,
+    encode_cursor,
+)
+from backend.reviews.models import Review, Comment, Report, StatusChoices
+
+COMMENTS_PAGE_SIZE = 20
+MAX_COMMENTS_PAGE_SIZE = 100
 
 
 # ────────────────────────── Comentarios ──────────────────────────
@@ -52,6 +63,56 @@ def create_comment(request):
     return Response(ser.errors, status=status.HTTP_400_BAD_REQUEST)
 
 
+def _can_read(request, review):
+    # pendientes/rechazadas: solo su autor o un admin (como en los feeds)
+    if review.status == StatusChoices.APROBADA:
+        return True
+    if review.user_id == request.user.id:
+        return True
+    return IsEloAdmin().has_permission(request, None)
+
+
+@api_view(["GET"])
+def list_comments(request, pk):
+    """
+    Comentarios de la reseña `pk`, del más nuevo al más viejo, paginados por
+    cursor keyset (created_at, id): { "results": [...], "next_cursor": "..." }.
+    Una reseña no aprobada responde 404 salvo para su autor o un admin.
+    """
+    review = get_object_or_404(Review, pk=pk)
+    if not _can_read(request, review):
+        return Response({"detail": "No encontrado."},
+                        status=status.HTTP_404_NOT_FOUND)
+
+    try:
+        size = int(request.query_params.get("page_size", COMMENTS_PAGE_SIZE))
+    except ValueError:
+        size = COMMENTS_PAGE_SIZE
+    size = max(1, min(size, MAX_COMMENTS_PAGE_SIZE))
+
+    after = None
+    token = request.query_params.get("cursor")
+    if token:
+        try:
+            state = decode_cursor(token, ("comments",))
+        except InvalidCursor:
+            state = None
+        if state is None or state["review"] != review.id:
+            return Response({"detail": "Cursor inválido"},
+                            status=status.HTTP_400_BAD_REQUEST)
+        after = state["after"]
+
+    ids, after = chronological_page(review.comments.all(), size, after)
+    by_id = Comment.objects.select_related("user").in_bulk(ids)
+    data = CommentSerializer([by_id[i] for i in ids if i in by_id], many=True).data
+
+    next_cursor = (
+        encode_cursor({"kind": "comments", "review": review.id, "after": after})
+        if after else None
+    )
+    return Response({"results": data, "next_cursor": next_cursor})
+
+
 # ─────────────────────────── Reportes ────────────────────────────
 @csrf_exempt
 @api_view(["POST"])
@@ -79,6 +140,7 @@ def create_report(request):
 
 @api_view(["GET"])
 @permission_classes([IsAuthenticated, IsEloAdmin])   # solo admins
+@replica_reads
 def list_reports(request):
     """
     Devuelve únicamente los reportes con status = Pendiente
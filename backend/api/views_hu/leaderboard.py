@@ -0,0 +1,50 @@
+"""
+Ranking Elo por categoría.
+
+GET /api/leaderboard/<category>/                    – top N (?limit=, def. 10)
+GET /api/leaderboard/<category>/?product=<id>       – puesto del producto y
+                                                      sus vecinos (?radius=, def. 5)
+"""
+from django.http import JsonResponse
+from django.views.decorators.http import require_GET
+
+from backend.api.services import leaderboard
+from backend.reviews.models import Product
+
+MAX_LIMIT = 100
+MAX_RADIUS = 50
+
+
+def _int_param(request, name, default, maximum):
+    try:
+        value = int(request.GET.get(name, default))
+    except ValueError:
+        return None
+    return max(0, min(value, maximum))
+
+
+@require_GET
+def category_leaderboard(request, category):
+    if category not in dict(Product.CATEGORIES):
+        return JsonResponse({"detail": "Categoría inválida"}, status=404)
+
+    product = request.GET.get("product")
+    if product is None:
+        limit = _int_param(request, "limit", 10, MAX_LIMIT)
+        if limit is None:
+            return JsonResponse({"detail": "limit inválido"}, status=400)
+        total, rows = leaderboard.top(category, limit)
+        return JsonResponse({"category": category, "total": total, "results": rows})
+
+    radius = _int_param(request, "radius", 5, MAX_RADIUS)
+    if radius is None or not product.isdigit():
+        return JsonResponse({"detail": "Parámetros inválidos"}, status=400)
+
+    row = leaderboard.rank(category, int(product))
+    if row is None:
+        return JsonResponse({"detail": "Producto no encontrado en la categoría"}, status=404)
+    return JsonResponse({
+        "category": category,
+        "product": row,
+        "around": leaderboard.around(category, int(product), radius),
+    })
@@ -0,0 +1,25 @@
+"""
+GET /api/metrics/ – métricas en formato de texto de Prometheus.
+
+Suma todos los procesos (ver utils/metrics.py). Si `METRICS["TOKEN"]`
+está definido se exige `Authorization: Bearer <token>`; si no, conviene
+restringir la ruta en el proxy.
+"""
+import hmac
+
+from django.http import HttpResponse
+from django.views.decorators.http import require_GET
+
+from backend.api.utils import metrics
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+@require_GET
+def prometheus_metrics(request):
+    token = metrics.auth_token()
+    if token and not hmac.compare_digest(
+        request.headers.get("Authorization", ""), f"Bearer {token}"
+    ):
+        return HttpResponse(status=401)
+    return HttpResponse(metrics.render(), content_type=CONTENT_TYPE)
@@ -4,40 +4,72 @@ Vistas centrales de la API (HU-001 … HU-009)
 Funciones principales
 ────────────────────────────────────────────────────────────────────────────
 • submit_review      – crea una reseña comparativa               (HU-003)
-• list_products      – catálogo completo
+• review_status      – estado de moderación de una reseña propia
+• bulk_import_reviews – importación masiva JSON Lines / CSV (admin)
+• list_products      – catálogo versionado (ETag, filtro, paginación)
 • random_feed        – feed público totalmente aleatorio         (HU-001)
 • personalized_feed  – feed ordenado por categoría preferida     (HU-009)
 • my_reviews_feed    – reseñas del usuario autenticado
 • delete_my_review   – elimina una reseña propia                 (HU-008)
 • whoami             – utilidad sesión
+• feed_cache_stats   – aciertos/fallos de la caché de feeds (admin)
 • GenerarInformeView – generación de informes                    (HU-007)
+• export_reviews     – volcado CSV / JSON Lines en streaming (admin)
+
+Los feeds responden {"results": [...], "next_cursor": "..."}; la página
+siguiente se pide con ?cursor=<next_cursor> (y opcionalmente ?page_size=).
+
+Los feeds y el catálogo leen de una réplica si hay (`@replica_reads`, ver
+api/db_router.py).
 """
+import codecs
+import csv
+import hashlib
 import json
 import logging
-import random
-from collections import Counter
-from random import sample
 from functools import wraps
 
-from django.http import JsonResponse, FileResponse
+from django.http import HttpResponse, JsonResponse, FileResponse, StreamingHttpResponse
 from django.shortcuts import get_object_or_404
 from django.views.decorators.csrf import csrf_exempt
 from django.views.decorators.http import (
+    condition,
     require_GET,
     require_POST,
     require_http_methods,
 )
-from django.db.models import Q
+from django.utils.cache import patch_cache_control
+from django.core.exceptions import NON_FIELD_ERRORS, ValidationError
+from django.db import IntegrityError, transaction
 
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework import status
-
-from backend.reviews.models import Product, Review
-from backend.api.serializers.comments_reports import ReviewPublicSerializer
-from backend.api.serializers.hu007 import InformeRequestSerializer
+from rest_framework.decorators import (
+    api_view, authentication_classes, permission_classes
+)
+from rest_framework.permissions import IsAuthenticated
+
+from backend.reviews.models import Product, Review, ReviewJob
+from backend.reviews.services import review_jobs
+from backend.api.authentication import CsrfExemptSessionAuthentication
+from backend.api.db_router import replica_reads
+from backend.api.permissions.admin import IsEloAdmin
+from backend.api.serializers.hu007 import ExportRequestSerializer, InformeRequestSerializer
+from backend.api.serializers.fast import use_fast_serializer
 from backend.api.services.hu007 import calcular_metricas
-from backend.api.utils.pdf import build_pdf
+from backend.api.services import export, feed_cache, ingestion, report_cache
+from backend.api.services.catalog import catalog_body, catalog_version
+from backend.api.services.feeds import (
+    InvalidCursor,
+    approved_reviews,
+    chronological_page,
+    decode_cursor,
+    encode_cursor,
+    favourite_categories,
+    personalized_page,
+    shuffled_page,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -52,6 +84,18 @@ def api_login_required(view):
     return _wrap
 
 
+def _is_duplicate_pair(exc):
+    """True si el ValidationError de full_clean es la restricción de pareja única."""
+    errors = exc.error_dict.get(NON_FIELD_ERRORS, []) if hasattr(exc, "error_dict") else exc.error_list
+    return any(e.code == "duplicate_pair" for e in errors)
+
+
+def _pair_exists(user, a_id, b_id):
+    """True si `user` ya publicó la pareja (a, b) en cualquier orden."""
+    low, high = Review.canonical_pair(a_id, b_id)
+    return Review.objects.filter(user=user, pair_low=low, pair_high=high).exists()
+
+
 # ─────────────────────── HU-003: publicar reseña ──────────────────
 @require_POST
 @csrf_exempt
@@ -61,6 +105,10 @@ def submit_review(request):
     Crea la comparación entre dos productos.
     • Persiste el flag allow_comments del formulario.
     • Impide que el mismo usuario compare dos veces la misma pareja.
+    • La moderación y el Elo se encolan (202, estado Pendiente) y los
+      procesa `manage.py review_worker`; el estado se consulta en
+      GET /api/reviews/<id>/status/. Con REVIEW_PIPELINE["ASYNC"] = False
+      se procesan en el request (201).
     """
     try:
         data = json.loads(request.body or "{}")
@@ -91,34 +139,44 @@ def submit_review(request):
                 {"status": "error", "message": "Categorías distintas"}, status=400
             )
 
-        # ---- Bloqueo de duplicados (misma pareja, en cualquier orden) ----
-        dupe_exists = Review.objects.filter(user=request.user).filter(
-            Q(product_a_id=a_id, product_b_id=b_id)
-            | Q(product_a_id=b_id, product_b_id=a_id)
-        ).exists()
-        if dupe_exists:
+        # Creación. Duplicados (misma pareja, en cualquier orden): los
+        # detecta la restricción única (user, pair_low, pair_high), con una
+        # búsqueda por índice en full_clean o, si dos envíos compiten, con
+        # IntegrityError en el INSERT.
+        preferred = prod_a if pref == a_id else prod_b
+        try:
+            with transaction.atomic():
+                review = Review.objects.create(
+                    product_a=prod_a,
+                    product_b=prod_b,
+                    preferred_product=preferred,
+                    user=request.user,
+                    justification=justification,
+                    allow_comments=allow_comments,      # ← ahora se guarda
+                )
+                review_jobs.enqueue(review)
+        except (ValidationError, IntegrityError) as exc:
+            if isinstance(exc, ValidationError) and not _is_duplicate_pair(exc):
+                raise
+            # otra IntegrityError (FK, NOT NULL, la de enqueue) no es un duplicado
+            if isinstance(exc, IntegrityError) and not _pair_exists(request.user, prod_a.id, prod_b.id):
+                raise
             return JsonResponse(
                 {"status": "error", "message": "Ya publicaste esta comparación"},
                 status=400,
             )
 
-        # Creación
-        preferred = prod_a if pref == a_id else prod_b
-        review = Review.objects.create(
-            product_a=prod_a,
-            product_b=prod_b,
-            preferred_product=preferred,
-            user=request.user,
-            justification=justification,
-            allow_comments=allow_comments,      # ← ahora se guarda
-        )
-        review.moderate_review()
-        review.save(update_fields=["status"])
+        body = {
+            "status": "ok",
+            "review_id": review.id,
+            "moderation_status": review.status,
+            "status_url": f"/api/reviews/{review.id}/status/",
+        }
+        if review_jobs.is_async():
+            return JsonResponse(body, status=202)
 
-        return JsonResponse(
-            {"status": "ok", "review_id": review.id, "moderation_status": review.status},
-            status=201,
-        )
+        body["moderation_status"] = review_jobs.process_now(review)
+        return JsonResponse(body, status=201)
 
     except json.JSONDecodeError:
         return JsonResponse({"status": "error", "message": "JSON inválido"}, status=400)
@@ -127,94 +185,234 @@ def submit_review(request):
         return JsonResponse({"status": "error", "message": str(e)}, status=500)
 
 
+@require_GET
+@api_login_required
+def review_status(request, pk):
+    """Estado de moderación de una reseña propia y de su trabajo en la cola."""
+    review = get_object_or_404(Review, pk=pk, user=request.user)
+    job = ReviewJob.objects.filter(review=review).values("status", "attempts").first()
+    return JsonResponse({
+        "review_id": review.id,
+        "moderation_status": review.status,
+        "job": job,
+    })
+
+
+# ─────────────────── importación masiva (admin) ──────────────────
+IMPORT_FORMATS = {
+    "text/csv": "csv",
+    "application/x-ndjson": "jsonl",
+    "application/jsonl": "jsonl",
+}
+
+
+@csrf_exempt
+@api_view(["POST"])
+@permission_classes([IsAuthenticated, IsEloAdmin])   # solo admins
+@authentication_classes([CsrfExemptSessionAuthentication])
+def bulk_import_reviews(request):
+    """
+    Cuerpo: JSON Lines (application/x-ndjson) o CSV (text/csv), una
+    comparación por fila (ver services/ingestion.py). ?create_users=1 da de
+    alta los usuarios que no existan. Responde el resumen de la importación.
+    """
+    content_type = request.content_type.split(";")[0].strip()
+    fmt = IMPORT_FORMATS.get(content_type)
+    if fmt is None:
+        return Response(
+            {"detail": f"Content-Type no soportado; usar {', '.join(IMPORT_FORMATS)}"},
+            status=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE,
+        )
+    if request.stream is None:
+        return Response({"detail": "Cuerpo vacío"}, status=status.HTTP_400_BAD_REQUEST)
+
+    # se lee en streaming: el archivo nunca está entero en memoria
+    lines = codecs.iterdecode(request.stream, "utf-8-sig")
+    try:
+        summary = ingestion.ingest(
+            ingestion.read_rows(lines, fmt),
+            create_users=request.query_params.get("create_users") in ("1", "true"),
+        )
+    except (UnicodeDecodeError, csv.Error) as exc:
+        return Response({"detail": f"Archivo ilegible: {exc}"},
+                        status=status.HTTP_400_BAD_REQUEST)
+    return Response(summary)
+
+
 # ───────────────────── catálogo de productos ─────────────────────
+CATALOG_MAX_LIMIT = 500
+
+
+def _catalog_etag(request):
+    # la versión se lee una sola vez por request (ETag y cuerpo coinciden)
+    request.catalog_version = catalog_version()
+    raw = f"{request.catalog_version}|{request.GET.urlencode()}"
+    return hashlib.md5(raw.encode()).hexdigest()
+
+
 @require_GET
+@condition(etag_func=_catalog_etag)
+@replica_reads
 def list_products(request):
-    qs = Product.objects.all().values("id", "name", "elo_score", "category")
-    return JsonResponse(list(qs), safe=False)
+    """
+    Catálogo de productos (lista JSON), ordenado por id.
+    • ?category=<cat>          – filtra por categoría.
+    • ?limit=<n>&after=<id>    – paginación keyset; la página siguiente va
+                                 en el header `Link: <...>; rel="next"`.
+    Responde con ETag (versión del catálogo + parámetros): un
+    If-None-Match vigente devuelve 304 sin tocar la BD, y el cuerpo ya
+    serializado se sirve desde caché mientras la versión no cambie.
+    """
+    category = request.GET.get("category") or None
+    if category and category not in dict(Product.CATEGORIES):
+        return JsonResponse({"detail": "Categoría inválida"}, status=400)
+    try:
+        after = max(0, int(request.GET.get("after", 0)))
+        limit = int(request.GET.get("limit", 0))
+    except ValueError:
+        return JsonResponse({"detail": "Parámetros de paginación inválidos"}, status=400)
+    limit = min(limit, CATALOG_MAX_LIMIT) if limit > 0 else None
+
+    body, last_id = catalog_body(request.catalog_version, category, after, limit)
+    response = HttpResponse(body, content_type="application/json")
+    if last_id is not None:
+        query = request.GET.copy()
+        query["after"] = last_id
+        response["Link"] = f'<{request.path}?{query.urlencode()}>; rel="next"'
+    # el navegador revalida siempre con If-None-Match (respuesta 304 barata)
+    patch_cache_control(response, no_cache=True)
+    return response
+
+
+# ───────────────────── paginación de feeds ───────────────────────
+DEFAULT_PAGE_SIZE = 50
+RANDOM_PAGE_SIZE  = 10
+MAX_PAGE_SIZE     = 100
+
+
+def _page_size(request, default):
+    try:
+        size = int(request.GET.get("page_size", default))
+    except ValueError:
+        size = default
+    return max(1, min(size, MAX_PAGE_SIZE))
+
+
+def _cursor_state(request, *kinds):
+    """Estado del cursor `?cursor=` (None si es la primera página)."""
+    token = request.GET.get("cursor")
+    return decode_cursor(token, kinds) if token else None
+
+
+def _next_cursor(kind, state):
+    return encode_cursor(dict(state, kind=kind)) if state else None
+
+
+def _feed_response(request, ids, next_cursor):
+    """
+    Reseñas `ids` (en ese orden, vía caché) + cursor de la página siguiente.
+    El serializador (DRF o proyección) se elige por endpoint en
+    settings.FEED_SERIALIZERS.
+    """
+    fast = use_fast_serializer(request.resolver_match.url_name)
+    return JsonResponse({
+        "results": feed_cache.serialize_reviews(ids, fast=fast),
+        "next_cursor": next_cursor,
+    })
+
+
+def _cached_feed_response(request, key, compute):
+    """Sirve la página `key` desde la caché o la calcula con `compute()`."""
+    page = feed_cache.get_page(key)
+    if page is None:
+        ids, next_cursor = compute()
+        page = feed_cache.set_page(key, ids, next_cursor)
+    return _feed_response(request, page["ids"], page["next"])
+
+
+def _invalid_cursor():
+    return JsonResponse({"detail": "Cursor inválido"}, status=400)
 
 
 # ─────────────── HU-001: feed público totalmente aleatorio ───────
 @require_GET
+@replica_reads
 def random_feed(request):
     """
-    Devuelve hasta 10 reseñas completamente aleatorias,
-    incluido el orden de aparición.
+    Devuelve reseñas aprobadas en orden completamente aleatorio, 10 por
+    página. El cursor fija la semilla de la sesión: las páginas siguientes
+    no repiten reseñas y cuestan lo mismo que la primera.
     """
-    ids = list(Review.objects.values_list("id", flat=True))
-    subset = sample(ids, min(len(ids), 10))
+    try:
+        state = _cursor_state(request, "random")
+    except InvalidCursor:
+        return _invalid_cursor()
 
-    qs = (
-        Review.objects.filter(id__in=subset)
-        .select_related("product_a", "product_b", "preferred_product", "user")
-        .prefetch_related("comments__user")
+    ids, nxt = shuffled_page(
+        approved_reviews(), _page_size(request, RANDOM_PAGE_SIZE), state
     )
-
-    reviews = list(qs)
-    random.shuffle(reviews)  # orden aleatorio en cada refresh
-
-    data = ReviewPublicSerializer(reviews, many=True).data
-    return JsonResponse(data, safe=False)
+    return _feed_response(request, ids, _next_cursor("random", nxt))
 
 
 # ──────────────── HU-009: feed personalizado simple ──────────────
 @require_GET
 @api_login_required
+@replica_reads
 def personalized_feed(request):
     """
     Ordena el feed colocando primero las reseñas de la(s) categoría(s)
     en la(s) que el usuario ha publicado más reseñas propias.
     - Si el usuario no tiene historial → random_feed.
     - Si existe empate total entre todas las categorías → random_feed.
+    Sólo se leen las reseñas de la página pedida; las páginas quedan en
+    caché hasta que cambien las reseñas del usuario o de sus categorías.
     """
-    user_reviews = Review.objects.filter(user=request.user)
-    if not user_reviews.exists():
-        return random_feed(request)
-
-    counts = Counter(user_reviews.values_list("product_a__category", flat=True))
-    max_ct = max(counts.values())
-    top_cats = [c for c, n in counts.items() if n == max_ct]
-
-    # Empate total: sin preferencia real
-    if len(top_cats) == len(counts):
+    try:
+        state = _cursor_state(request, "personal", "random")
+    except InvalidCursor:
+        return _invalid_cursor()
+
+    user = request.user
+    if state is None:
+        top_cats = feed_cache.get_favourites(user.id, lambda: favourite_categories(user))
+        if top_cats is None:
+            return random_feed(request)
+        state = {"cats": top_cats, "phase": "top", "after": None, "rest": None}
+    elif state["kind"] == "random":
+        # la sesión empezó como feed aleatorio (sin preferencia)
         return random_feed(request)
 
-    random.shuffle(top_cats)  # desempate entre favoritas
+    size = _page_size(request, DEFAULT_PAGE_SIZE)
 
-    qs_top = (
-        Review.objects.filter(product_a__category__in=top_cats)
-        .select_related("product_a", "product_b", "preferred_product", "user")
-        .prefetch_related("comments__user")
-        .order_by("-created_at")
-    )
+    def compute():
+        ids, nxt = personalized_page(size, state)
+        return ids, _next_cursor("personal", nxt)
 
-    qs_rest = (
-        Review.objects.exclude(product_a__category__in=top_cats)
-        .select_related("product_a", "product_b", "preferred_product", "user")
-        .prefetch_related("comments__user")
+    key = feed_cache.page_key(
+        "personal", user.id, request.GET.get("cursor"), size, state["cats"]
     )
-
-    # Mezclamos el resto para que no sea cronológico estricto
-    rest_list = list(qs_rest)
-    random.shuffle(rest_list)
-
-    reviews = list(qs_top[:50]) + rest_list
-    data = ReviewPublicSerializer(reviews[:50], many=True).data
-    return JsonResponse(data, safe=False)
+    return _cached_feed_response(request, key, compute)
 
 
 # ───────────────── feed “mis reseñas” ─────────────────────────────
 @require_GET
 @api_login_required
 def my_reviews_feed(request):
-    qs = (
-        Review.objects.filter(user=request.user)
-        .select_related("product_a", "product_b", "preferred_product", "user")
-        .prefetch_related("comments__user")
-        .order_by("-created_at")[:50]
-    )
-    data = ReviewPublicSerializer(qs, many=True).data
-    return JsonResponse(data, safe=False)
+    try:
+        state = _cursor_state(request, "mine")
+    except InvalidCursor:
+        return _invalid_cursor()
+
+    size = _page_size(request, DEFAULT_PAGE_SIZE)
+
+    def compute():
+        ids, after = chronological_page(
+            Review.objects.filter(user=request.user), size, state and state["after"]
+        )
+        return ids, _next_cursor("mine", after and {"after": after})
+
+    key = feed_cache.page_key("mine", request.user.id, request.GET.get("cursor"), size)
+    return _cached_feed_response(request, key, compute)
 
 
 # ─────────────── eliminar reseña propia (HU-008) ──────────────────
@@ -243,34 +441,87 @@ def whoami(request):
     return JsonResponse({"detail": "no auth"}, status=401)
 
 
+# ─────────────────── estadísticas de caché de feeds ──────────────
+@api_view(["GET"])
+@permission_classes([IsAuthenticated, IsEloAdmin])   # solo admins
+def feed_cache_stats(request):
+    """Aciertos / fallos de la caché de feeds en este proceso."""
+    return Response(feed_cache.stats())
+
+
 # ───────────────────────── HU-007: informes ──────────────────────
 class GenerarInformeView(APIView):
     permission_classes = []  # producción: [IsAdminUser]
+    # csv / jsonl vuelcan reseñas (usuarios, textos, pendientes): sólo admins,
+    # igual que export_reviews. json / pdf son agregados.
+    export_permission_classes = [IsAuthenticated, IsEloAdmin]
 
     def post(self, request):
         ser = InformeRequestSerializer(data=request.data)
         ser.is_valid(raise_exception=True)
         data = ser.validated_data
 
+        if data["formato"] in export.CONTENT_TYPES:
+            for permission in (cls() for cls in self.export_permission_classes):
+                if not permission.has_permission(request, self):
+                    self.permission_denied(request, message=getattr(permission, "message", None))
+            # las reseñas del rango, fila por fila (no las métricas)
+            return _export_response(
+                data["formato"],
+                export.review_rows(data.get("start_date"), data.get("end_date")),
+                "informe_resenas",
+            )
+
         metrics = calcular_metricas(
-            reseñas=data["reseñas"],
             start_date=data.get("start_date"),
             end_date=data.get("end_date"),
+            top_n=data["top_n"],
         )
 
         if data["formato"] == "pdf":
-            pdf = build_pdf(metrics)
-            return FileResponse(
+            # matplotlib + reportlab se cargan recién acá (ver utils/pdf.py)
+            from backend.api.utils.pdf import build_pdf, chart_backend
+            # mismas métricas y parámetros → mismo archivo, sin re-renderizar
+            pdf, key, _ = report_cache.get_or_render(
+                "pdf", {"top_n": data["top_n"], "charts": chart_backend()}, metrics, build_pdf,
+            )
+            etag = f'"{key}"'
+            if etag in request.headers.get("If-None-Match", ""):
+                pdf.close()
+                return HttpResponse(status=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
+            response = FileResponse(
                 pdf,
                 as_attachment=True,
                 filename="informe_tendencias.pdf",
                 content_type="application/pdf",
             )
-
-        if data["formato"] == "csv":
-            return Response(
-                {"detail": "CSV no implementado"},
-                status=status.HTTP_501_NOT_IMPLEMENTED,
-            )
+            response["ETag"] = etag
+            return response
 
         return Response(metrics, status=status.HTTP_200_OK)
+
+
+# ─────────────────── exportación de reseñas (streaming) ──────────
+def _export_response(fmt, rows, filename):
+    response = StreamingHttpResponse(
+        export.stream(fmt, rows), content_type=export.CONTENT_TYPES[fmt],
+    )
+    response["Content-Disposition"] = f'attachment; filename="{filename}.{fmt}"'
+    return response
+
+
+@api_view(["GET"])
+@permission_classes([IsAuthenticated, IsEloAdmin])   # solo admins
+def export_reviews(request):
+    """
+    Volcado completo de reseñas en CSV o JSON Lines, en streaming.
+    ?formato=csv|jsonl&start_date=&end_date=&category=&status=
+    """
+    ser = ExportRequestSerializer(data=request.query_params)
+    ser.is_valid(raise_exception=True)
+    data = ser.validated_data
+    rows = export.review_rows(
+        data.get("start_date"), data.get("end_date"),
+        category=data.get("category"), status=data.get("status"),
+    )
+    return _export_response(data["formato"], rows, "resenas")
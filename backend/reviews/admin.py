@@ -1,5 +1,5 @@
 from django.contrib import admin
-from .models import Product, Review, Comment, Report, UserProfile
+from .models import Product, Review, Comment, Report, UserProfile, EloEvent, ProhibitedTerm, ReviewJob
 
 
 @admin.register(Product)
@@ -13,7 +13,7 @@ class ProductAdmin(admin.ModelAdmin):
 class ReviewAdmin(admin.ModelAdmin):
     list_display  = ("id", "user", "product_a", "product_b",
                      "preferred_product", "status", "allow_comments")
-    list_filter   = ("status", "allow_comments", "product_a__category")
+    list_filter   = ("status", "allow_comments", "category")
     search_fields = ("user__username", "product_a__name", "product_b__name")
 
 
@@ -34,3 +34,25 @@ class ReportAdmin(admin.ModelAdmin):
 class ProfileAdmin(admin.ModelAdmin):
     list_display = ("user", "is_admin")
     list_editable = ("is_admin",)
+
+
+@admin.register(EloEvent)
+class EloEventAdmin(admin.ModelAdmin):
+    list_display  = ("id", "product", "review_id", "rating_before",
+                     "rating_after", "created_at")
+    list_filter   = ("product__category",)
+    search_fields = ("product__name",)
+
+
+@admin.register(ProhibitedTerm)
+class ProhibitedTermAdmin(admin.ModelAdmin):
+    list_display  = ("term", "active", "created_at")
+    list_editable = ("active",)
+    search_fields = ("term",)
+
+
+@admin.register(ReviewJob)
+class ReviewJobAdmin(admin.ModelAdmin):
+    list_display  = ("review", "status", "attempts", "available_at", "locked_by", "updated_at")
+    list_filter   = ("status",)
+    search_fields = ("review__id", "last_error")
@@ -0,0 +1,96 @@
+"""
+Completa `Review.pair_low` / `pair_high` en filas existentes.
+
+    python manage.py backfill_pair_keys                   # informa y completa
+    python manage.py backfill_pair_keys --drop-duplicates # borra duplicados
+
+Hace las veces de migración de datos (el proyecto no versiona migraciones):
+un único UPDATE con LEAST/GREATEST. Antes busca usuarios con la misma
+pareja reseñada dos veces (en cualquier orden), que violarían la
+restricción `review_unique_user_pair`; por defecto aborta y los lista, con
+--drop-duplicates conserva la más antigua de cada grupo y borra el resto.
+Tras borrar reseñas aprobadas conviene correr `manage.py recompute_elo`.
+
+Orden de despliegue sobre una BD con reseñas
+────────────────────────────────────────────────────────────────────────────
+Los campos no pueden llegar en un solo paso: sin default, `makemigrations`
+pide uno fijo (p.ej. 0) y la restricción única fallaría para todo usuario
+con dos o más reseñas antes de que este comando pueda correr.
+
+  1. En models.py, temporalmente: `pair_low` / `pair_high` con `null=True`
+     y sin `review_unique_user_pair` en `Meta.constraints`;
+     `makemigrations reviews && migrate`. Desde acá save() completa las
+     reseñas nuevas.
+  2. `manage.py backfill_pair_keys --drop-duplicates`: completa las
+     existentes (las que están en NULL incluidas) y borra duplicados.
+  3. Restaurar models.py (campos no nulos + restricción), correr de nuevo
+     este comando (duplicados creados mientras no había restricción) y
+     `makemigrations reviews` eligiendo "Ignore for now" cuando pregunte
+     por los NULL (ya no quedan); `migrate`.
+
+En una BD nueva basta con `migrate`.
+"""
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.db.models import Count, F, Min, Q
+from django.db.models.functions import Greatest, Least
+
+from backend.reviews.models import Review
+
+
+class Command(BaseCommand):
+    help = "Completa la pareja canónica (pair_low, pair_high) de las reseñas."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--drop-duplicates", action="store_true",
+                            help="borra las reseñas duplicadas (conserva la más antigua)")
+
+    def handle(self, *args, **opts):
+        canonical = Review.objects.annotate(
+            low=Least("product_a_id", "product_b_id"),
+            high=Greatest("product_a_id", "product_b_id"),
+        )
+        groups = list(
+            canonical.values("user_id", "low", "high")
+            .annotate(n=Count("id"), keep=Min("id"))
+            .filter(n__gt=1)
+            .order_by()
+        )
+
+        with transaction.atomic():
+            if groups:
+                self.stdout.write(f"{len(groups)} parejas duplicadas:")
+                for g in groups[:20]:
+                    self.stdout.write(
+                        f"  usuario {g['user_id']}: {g['low']} vs {g['high']} ×{g['n']}"
+                    )
+                if not opts["drop_duplicates"]:
+                    raise CommandError("Hay duplicados; revisar o usar --drop-duplicates.")
+                dropped = 0
+                for g in groups:
+                    dropped += (
+                        canonical.filter(user_id=g["user_id"], low=g["low"], high=g["high"])
+                        .exclude(id=g["keep"]).delete()[1].get("reviews.Review", 0)
+                    )
+                self.stdout.write(f"{dropped} reseñas duplicadas eliminadas.")
+
+            # NULL explícito: `NOT (pair_low = ...)` es NULL (no verdadero)
+            # en las filas que todavía no tienen pareja (paso 1)
+            stale = (
+                Q(pair_low__isnull=True) | Q(pair_high__isnull=True)
+                | ~Q(pair_low=Least(F("product_a_id"), F("product_b_id")),
+                     pair_high=Greatest(F("product_a_id"), F("product_b_id")))
+            )
+            updated = Review.objects.filter(stale).update(
+                pair_low=Least("product_a_id", "product_b_id"),
+                pair_high=Greatest("product_a_id", "product_b_id"),
+            )
+            missing = Review.objects.filter(
+                Q(pair_low__isnull=True) | Q(pair_high__isnull=True)
+            ).count()
+            if missing:
+                raise CommandError(f"{missing} reseñas siguen sin pareja canónica.")
+        self.stdout.write(self.style.SUCCESS(
+            f"{updated} reseñas actualizadas; ya se puede aplicar la restricción "
+            "(paso 3, ver la ayuda del comando)."
+        ))
@@ -0,0 +1,27 @@
+"""
+Completa `Review.category` (copia de product_a.category) en filas existentes.
+
+    python manage.py backfill_review_category
+
+Hace las veces de migración de datos (el proyecto no versiona migraciones):
+un UPDATE por categoría, sólo sobre las filas desactualizadas.
+"""
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from backend.reviews.models import Product, Review
+
+
+class Command(BaseCommand):
+    help = "Sincroniza la categoría desnormalizada de las reseñas."
+
+    def handle(self, *args, **opts):
+        updated = 0
+        with transaction.atomic():
+            for category, _ in Product.CATEGORIES:
+                updated += (
+                    Review.objects.filter(product_a__category=category)
+                    .exclude(category=category)
+                    .update(category=category)
+                )
+        self.stdout.write(self.style.SUCCESS(f"{updated} reseñas actualizadas."))
@@ -0,0 +1,373 @@
+"""
+Benchmark de todas las rutas de la API con presupuesto de consultas.
+
+    python manage.py bench_endpoints                              # 1k, 10k, 100k reseñas
+    python manage.py bench_endpoints --sizes 1000,20000 --repeat 10
+    python manage.py bench_endpoints --output bench.json --compare anterior.json
+    python manage.py bench_endpoints --only feed,products
+
+Sobre una BD desechable, siembra reseñas hasta cada tamaño y llama a cada
+ruta de `api/urls_hu/urls.py` con el cliente de pruebas de Django (todo el
+stack: middleware, autenticación, serialización). Por ruta y tamaño
+registra latencia (p50/p95), consultas SQL y pico de memoria (tracemalloc,
+en una llamada aparte). Las cachés se vacían antes de cada llamada: se mide
+el peor caso, no un acierto.
+
+Falla (código de salida ≠ 0) si una ruta:
+  • responde con un estado inesperado;
+  • hace más consultas que su presupuesto (`queries`) — un N+1 aparece
+    como un conteo que crece con la página o con la tabla;
+  • escala peor que su complejidad declarada: las rutas "1" no pueden
+    ser más de `--max-growth` veces más lentas en el tamaño mayor que en el
+    menor; las "n", no más que eso multiplicado por el cociente de tamaños;
+  • existe en el URLconf pero no está declarada en `ROUTES`.
+
+`--output` guarda los resultados en JSON y `--compare` muestra la
+variación de p50 contra una corrida anterior.
+"""
+import json
+import statistics
+import subprocess
+import tempfile
+import time
+import tracemalloc
+from contextlib import ExitStack
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from itertools import combinations
+from pathlib import Path
+from typing import Callable
+
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.cache import caches
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+from django.test import Client
+from django.test.utils import CaptureQueriesContext, override_settings
+
+from backend.api.urls_hu import urls as api_urls
+from backend.api.utils.benchmarks import scratch_database, seed_reviews
+from backend.reviews.models import (
+    Product, Report, ReportStatus, Review, StatusChoices, UserProfile,
+)
+
+SEED_CATEGORY = "pelicula"
+WRITE_CATEGORY = "serie"        # reseñas nuevas del benchmark (parejas libres)
+
+# cachés en memoria: el benchmark no toca las del servidor de desarrollo
+BENCH_SETTINGS = {
+    "CACHES": {
+        "default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+                    "LOCATION": "bench-default"},
+        "feeds": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+                  "LOCATION": "bench-feeds"},
+    },
+}
+
+
+@dataclass
+class Route:
+    """
+    Una ruta a medir. `request(fx)` devuelve (cliente, método, url, kwargs)
+    y se llama fuera del tiempo medido (ahí se preparan los datos que la
+    llamada consume, p.ej. el reporte a moderar).
+    """
+    pattern: str                # tal como figura en urls_hu
+    request: Callable
+    status: int = 200
+    queries: int = 10           # presupuesto por llamada
+    complexity: str = "1"       # "1" | "n"
+    repeat: int = None          # por defecto --repeat
+    label: str = field(default=None)
+
+    @property
+    def name(self):
+        return self.label or self.pattern
+
+
+class Fixture:
+    """Datos y clientes compartidos por todas las rutas de una corrida."""
+
+    def __init__(self):
+        self.reader = User.objects.get(username="bench-0")
+        self.writer, _ = User.objects.get_or_create(username="bench-writer")
+        self.admin, _ = User.objects.get_or_create(
+            username="bench-admin", defaults={"is_staff": True})
+        UserProfile.objects.update_or_create(user=self.admin, defaults={"is_admin": True})
+        self.clients = {}
+        for role in ("reader", "writer", "admin"):
+            client = Client()
+            client.force_login(getattr(self, role))
+            self.clients[role] = client
+        self.clients["anon"] = Client()
+
+        products = list(Product.objects.filter(category=WRITE_CATEGORY).order_by("id"))
+        if len(products) < 100:
+            products += Product.objects.bulk_create(
+                Product(name=f"bench-{WRITE_CATEGORY}-{i}", category=WRITE_CATEGORY)
+                for i in range(len(products), 100)
+            )
+        self._pairs = combinations([p.id for p in products], 2)
+        self.review = self.new_review()
+        self.bulk_body = "".join(
+            json.dumps({"user": "bench-0", "product_a_id": a, "product_b_id": b, "preferred_id": a})
+            + "\n"
+            for a, b in self.seed_pairs(50)
+        )
+
+    def seed_pairs(self, n):
+        ids = list(Product.objects.filter(category=SEED_CATEGORY)
+                   .order_by("id").values_list("id", flat=True))
+        return list(combinations(ids, 2))[:n]
+
+    def next_pair(self):
+        return next(self._pairs)
+
+    def new_review(self):
+        a, b = self.next_pair()
+        return Review.objects.create(
+            user=self.writer, product_a_id=a, product_b_id=b, preferred_product_id=a,
+            status=StatusChoices.APROBADA,
+        )
+
+    def seed_reports(self, size):
+        """Reportes pendientes hasta uno cada 100 reseñas."""
+        missing = size // 100 - Report.objects.filter(status=ReportStatus.PENDIENTE).count()
+        ids = Review.objects.order_by("-id").values_list("id", flat=True)[:max(missing, 0)]
+        Report.objects.bulk_create(
+            Report(review_id=pk, reporter=self.admin, reason="bench") for pk in ids
+        )
+
+    def new_report(self):
+        return Report.objects.create(review=self.review, reporter=self.admin, reason="bench")
+
+
+def _submit(fx):
+    a, b = fx.next_pair()
+    body = {"product_a_id": a, "product_b_id": b, "preferred_id": a, "justification": "bench"}
+    return fx.clients["writer"], "post", "/api/submit-review/", {
+        "data": json.dumps(body), "content_type": "application/json"}
+
+
+ROUTES = [
+    # sesión, usuario, productos, full_clean (FKs + restricción única), alta y trabajo
+    Route("submit-review/", _submit, status=202, queries=20),
+    Route("reviews/<int:pk>/status/",
+          lambda fx: (fx.clients["writer"], "get", f"/api/reviews/{fx.review.id}/status/", {}),
+          queries=6),
+    Route("reviews/bulk/",
+          lambda fx: (fx.clients["admin"], "post", "/api/reviews/bulk/",
+                      {"data": fx.bulk_body, "content_type": "application/x-ndjson"}),
+          queries=15),
+    Route("feed/", lambda fx: (fx.clients["anon"], "get", "/api/feed/", {}), queries=8),
+    Route("feed/personalized/",
+          lambda fx: (fx.clients["reader"], "get", "/api/feed/personalized/", {}), queries=10),
+    Route("products/", lambda fx: (fx.clients["anon"], "get", "/api/products/?limit=100", {}),
+          queries=3),
+    Route("leaderboard/<str:category>/",
+          lambda fx: (fx.clients["anon"], "get", f"/api/leaderboard/{SEED_CATEGORY}/", {}),
+          queries=3),
+    Route("comments/",
+          lambda fx: (fx.clients["reader"], "post", "/api/comments/",
+                      {"data": json.dumps({"review": fx.review.id, "text": "bench"}),
+                       "content_type": "application/json"}),
+          status=201, queries=10),
+    Route("reviews/<int:pk>/comments/",
+          lambda fx: (fx.clients["anon"], "get", f"/api/reviews/{fx.review.id}/comments/", {}),
+          queries=5),
+    Route("reports/",
+          lambda fx: (fx.clients["reader"], "post", "/api/reports/",
+                      {"data": json.dumps({"review": fx.review.id, "reason": "bench"}),
+                       "content_type": "application/json"}),
+          status=201, queries=10),
+    # sin paginar: devuelve todos los pendientes (se siembra 1 cada 100 reseñas)
+    Route("reports/pending/",
+          lambda fx: (fx.clients["admin"], "get", "/api/reports/pending/", {}),
+          queries=5, complexity="n"),
+    Route("reports/<int:pk>/",
+          lambda fx: (fx.clients["admin"], "patch", f"/api/reports/{fx.new_report().id}/",
+                      {"data": json.dumps({"status": "Rechazada"}),
+                       "content_type": "application/json"}),
+          queries=8),
+    Route("hu007/report/",
+          lambda fx: (fx.clients["anon"], "post", "/api/hu007/report/",
+                      {"data": json.dumps({"formato": "json"}), "content_type": "application/json"}),
+          queries=8, complexity="n", repeat=5),
+    Route("reviews/export/",
+          lambda fx: (fx.clients["admin"], "get",
+                      f"/api/reviews/export/?formato=csv&category={SEED_CATEGORY}", {}),
+          queries=5, complexity="n", repeat=3),
+    Route("whoami/", lambda fx: (fx.clients["reader"], "get", "/api/whoami/", {}), queries=3),
+    Route("my-reviews/", lambda fx: (fx.clients["reader"], "get", "/api/my-reviews/", {}),
+          queries=8),
+    Route("my-reviews/<int:pk>/",
+          lambda fx: (fx.clients["writer"], "delete", f"/api/my-reviews/{fx.new_review().id}/", {}),
+          status=204, queries=12),
+    Route("feed-cache/stats/",
+          lambda fx: (fx.clients["admin"], "get", "/api/feed-cache/stats/", {}), queries=4),
+    Route("metrics/", lambda fx: (fx.clients["anon"], "get", "/api/metrics/", {}), queries=0),
+]
+
+
+def _undeclared():
+    declared = {r.pattern for r in ROUTES}
+    return [str(p.pattern) for p in api_urls.urlpatterns if str(p.pattern) not in declared]
+
+
+def _call(fx, route):
+    """Una llamada: (segundos, consultas, respuesta). Las cachés se vacían antes."""
+    client, method, url, kwargs = route.request(fx)
+    for cache in caches.all():
+        cache.clear()
+    # todas las bases: con réplicas (api/db_router.py) parte de las lecturas
+    # no pasa por "default" y también cuenta para el presupuesto
+    with ExitStack() as stack:
+        captured = [stack.enter_context(CaptureQueriesContext(conn)) for conn in connections.all()]
+        t0 = time.perf_counter()
+        response = getattr(client, method)(url, **kwargs)
+        if response.streaming:
+            for _ in response.streaming_content:
+                pass
+        elapsed = time.perf_counter() - t0
+    return elapsed, sum(len(ctx.captured_queries) for ctx in captured), response
+
+
+def _measure(fx, route, repeat):
+    _call(fx, route)                                    # calentamiento
+    samples, queries, status = [], 0, None
+    for _ in range(repeat):
+        elapsed, n, response = _call(fx, route)
+        samples.append(elapsed * 1000)
+        queries = max(queries, n)
+        status = response.status_code
+    tracemalloc.start()
+    _call(fx, route)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    samples.sort()
+    return {
+        "p50_ms": round(statistics.median(samples), 3),
+        "p95_ms": round(samples[min(len(samples) - 1, int(len(samples) * 0.95))], 3),
+        "queries": queries,
+        "peak_kib": round(peak / 1024, 1),
+        "status": status,
+    }
+
+
+def _git_revision():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+class Command(BaseCommand):
+    help = "Mide latencia, consultas y memoria de cada ruta de la API a varios tamaños."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--sizes", default="1000,10000,100000",
+                            help="cantidades de reseñas, separadas por coma")
+        parser.add_argument("--repeat", type=int, default=20)
+        parser.add_argument("--only", default=None,
+                            help="sólo las rutas cuyo patrón contenga alguno de estos textos")
+        parser.add_argument("--max-growth", type=float, default=3.0,
+                            help="crecimiento de p50 tolerado para rutas de complejidad '1'")
+        parser.add_argument("--output", default=None, help="archivo JSON de resultados")
+        parser.add_argument("--compare", default=None, help="JSON de una corrida anterior")
+
+    def handle(self, *args, **opts):
+        failures = [f"{p}: ruta sin declarar en ROUTES" for p in _undeclared()]
+        sizes = sorted(int(s) for s in opts["sizes"].split(","))
+        routes = ROUTES
+        if opts["only"]:
+            wanted = opts["only"].split(",")
+            routes = [r for r in ROUTES if any(w in r.pattern for w in wanted)]
+
+        results = {r.name: {} for r in routes}
+        # métricas a un directorio descartable: se mide el middleware, pero el
+        # tráfico del benchmark no se suma a /api/metrics/ del servidor real
+        metrics_dir = tempfile.TemporaryDirectory(prefix="elopinion-bench-metrics-")
+        bench_settings = dict(
+            BENCH_SETTINGS,
+            ALLOWED_HOSTS=[*settings.ALLOWED_HOSTS, "testserver"],
+            METRICS={**getattr(settings, "METRICS", {}), "DIR": metrics_dir.name},
+        )
+        with metrics_dir, override_settings(**bench_settings), scratch_database():
+            fx = None
+            for size in sizes:
+                seed_reviews(size, category=SEED_CATEGORY)
+                fx = fx or Fixture()
+                fx.seed_reports(size)
+                self.stdout.write(f"\n{size} reseñas")
+                self.stdout.write(f"  {'ruta':<30} {'p50 ms':>9} {'p95 ms':>9} "
+                                  f"{'consultas':>9} {'pico KiB':>9}")
+                for route in routes:
+                    row = _measure(fx, route, route.repeat or opts["repeat"])
+                    results[route.name][size] = row
+                    problems = []
+                    if row["status"] != route.status:
+                        problems.append(f"estado {row['status']} (esperado {route.status})")
+                    if row["queries"] > route.queries:
+                        problems.append(f"{row['queries']} consultas (presupuesto {route.queries})")
+                    failures += [f"{route.name} @ {size}: {p}" for p in problems]
+                    mark = self.style.ERROR("✗") if problems else " "
+                    self.stdout.write(
+                        f"{mark} {route.name:<30} {row['p50_ms']:>9.2f} {row['p95_ms']:>9.2f} "
+                        f"{row['queries']:>9} {row['peak_kib']:>9.1f}"
+                    )
+
+        if len(sizes) > 1:
+            failures += self._check_growth(routes, results, sizes, opts["max_growth"])
+
+        report = {
+            "created_at": datetime.now(timezone.utc).isoformat(),
+            "revision": _git_revision(),
+            "sizes": sizes,
+            "repeat": opts["repeat"],
+            "results": {
+                name: {str(size): row for size, row in rows.items()}
+                for name, rows in results.items()
+            },
+        }
+        if opts["output"]:
+            Path(opts["output"]).write_text(json.dumps(report, indent=2))
+            self.stdout.write(f"\nResultados en {opts['output']}")
+        if opts["compare"]:
+            self._compare(json.loads(Path(opts["compare"]).read_text()), report)
+
+        if failures:
+            for failure in failures:
+                self.stderr.write(f"  {failure}")
+            raise CommandError(f"{len(failures)} problemas de rendimiento.")
+        self.stdout.write(self.style.SUCCESS("Todas las rutas dentro de presupuesto."))
+
+    def _check_growth(self, routes, results, sizes, max_growth):
+        """Compara p50 del tamaño mayor contra el menor (piso de 1 ms contra el ruido)."""
+        small, large = sizes[0], sizes[-1]
+        failures = []
+        for route in routes:
+            allowed = max_growth * (large / small if route.complexity == "n" else 1)
+            before = max(results[route.name][small]["p50_ms"], 1.0)
+            after = results[route.name][large]["p50_ms"]
+            if after / before > allowed:
+                failures.append(
+                    f"{route.name}: p50 ×{after / before:.1f} de {small} a {large} reseñas "
+                    f"(complejidad '{route.complexity}', tolerado ×{allowed:g})"
+                )
+        return failures
+
+    def _compare(self, previous, current):
+        self.stdout.write(f"\nContra {previous.get('revision') or 'corrida anterior'} (p50):")
+        for name, rows in current["results"].items():
+            for size, row in rows.items():
+                old = previous.get("results", {}).get(name, {}).get(size)
+                if not old:
+                    continue
+                change = (row["p50_ms"] - old["p50_ms"]) / max(old["p50_ms"], 1e-9) * 100
+                queries = row["queries"] - old["queries"]
+                self.stdout.write(
+                    f"  {name:<30} {size:>8}  {old['p50_ms']:>8.2f} → {row['p50_ms']:>8.2f} ms "
+                    f"({change:+.0f} %)" + (f"  consultas {queries:+d}" if queries else "")
+                )
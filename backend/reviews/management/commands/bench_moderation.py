@@ -0,0 +1,80 @@
+"""
+Rendimiento del motor de moderación sobre justificaciones largas.
+
+    python manage.py bench_moderation --texts 500 --words 2000 --terms 300
+
+Genera textos sintéticos (una fracción `--dirty` con un término prohibido,
+escrito con tildes y mayúsculas) y compara el escaneo anterior
+(`any(pal in texto ...)` por palabra) con `ModerationEngine`, usando
+DEFAULT_TERMS más `--terms` términos sintéticos. No toca la BD.
+"""
+import random
+import string
+import time
+
+from django.core.management.base import BaseCommand
+
+from backend.reviews.services.moderation import DEFAULT_TERMS, ModerationEngine
+
+ACCENTED = str.maketrans("aeiou", "áéíóú")
+
+
+class Command(BaseCommand):
+    help = "Compara el escaneo por palabra con el léxico compilado de moderación."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--texts", type=int, default=500)
+        parser.add_argument("--words", type=int, default=2000,
+                            help="palabras por texto")
+        parser.add_argument("--terms", type=int, default=300,
+                            help="términos sintéticos además de los por defecto")
+        parser.add_argument("--dirty", type=float, default=0.1,
+                            help="fracción de textos con un término prohibido")
+        parser.add_argument("--repeat", type=int, default=3)
+        parser.add_argument("--seed", type=int, default=0)
+
+    def handle(self, *args, **opts):
+        rng = random.Random(opts["seed"])
+
+        def word(lo=3, hi=10):
+            return "".join(rng.choices(string.ascii_lowercase, k=rng.randint(lo, hi)))
+
+        extra = {word(6, 12) for _ in range(opts["terms"])}
+        legacy_words = {t.rstrip("*") for t in DEFAULT_TERMS} | extra
+        vocab = [word() for _ in range(5000)]
+
+        texts = []
+        for _ in range(opts["texts"]):
+            words = rng.choices(vocab, k=opts["words"])
+            if rng.random() < opts["dirty"]:
+                bad = rng.choice(sorted(legacy_words))
+                words[rng.randrange(len(words))] = bad.translate(ACCENTED).upper()
+            texts.append(" ".join(words))
+        size_mb = sum(len(t) for t in texts) / 1e6
+
+        t0 = time.perf_counter()
+        engine = ModerationEngine(list(DEFAULT_TERMS) + sorted(extra))
+        compile_ms = (time.perf_counter() - t0) * 1000
+        self.stdout.write(
+            f"{len(texts)} textos, {size_mb:.1f} MB, {len(engine.terms)} términos "
+            f"(compilación: {compile_ms:.1f} ms)"
+        )
+
+        def legacy():
+            return sum(any(pal in t.lower() for pal in legacy_words) for t in texts)
+
+        def compiled():
+            return sum(engine.contains(t) for t in texts)
+
+        for name, fn in (("por palabra", legacy), ("compilado", compiled)):
+            best, flagged = min(self._run(fn) for _ in range(opts["repeat"]))
+            self.stdout.write(
+                f"{name:>12}: {len(texts) / best:>9.0f} textos/s "
+                f"{size_mb / best:>7.1f} MB/s  marcados={flagged}"
+            )
+
+    @staticmethod
+    def _run(fn):
+        t0 = time.perf_counter()
+        flagged = fn()
+        return time.perf_counter() - t0, flagged
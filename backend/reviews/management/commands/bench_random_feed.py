@@ -0,0 +1,59 @@
+"""
+Benchmark del feed aleatorio a distintos tamaños de tabla.
+
+    python manage.py bench_random_feed --sizes 1000,100000,1000000
+
+Corre sobre una BD desechable. Para cada tamaño mide la primera página y
+una página "profunda" (90 % de la sesión recorrida) de `shuffled_page`, y
+el método anterior, que cargaba todos los ids en memoria
+(`--skip-legacy` lo omite).
+"""
+import random
+
+from django.core.management.base import BaseCommand
+
+from backend.api.services.feeds import approved_reviews, shuffled_page
+from backend.api.utils.benchmarks import scratch_database, seed_reviews, time_call
+from backend.reviews.models import Review
+
+
+class Command(BaseCommand):
+    help = "Mide la latencia del feed aleatorio según el tamaño de la tabla."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--sizes", default="1000,10000,100000,1000000",
+                            help="tamaños de tabla separados por coma")
+        parser.add_argument("--repeat", type=int, default=50)
+        parser.add_argument("--skip-legacy", action="store_true")
+
+    def handle(self, *args, **opts):
+        sizes = sorted(int(s) for s in opts["sizes"].split(","))
+
+        def legacy():
+            ids = list(Review.objects.values_list("id", flat=True))
+            return random.sample(ids, min(len(ids), 10))
+
+        def first_page():
+            return shuffled_page(approved_reviews(), 10)
+
+        with scratch_database():
+            self.stdout.write(
+                f"{'reseñas':>10}  {'1ª página p50/p95 (ms)':>24}  "
+                f"{'profunda p50/p95 (ms)':>24}  {'legacy p50/p95 (ms)':>22}"
+            )
+            for size in sizes:
+                seed_reviews(size)
+                # un poco de huecos, como en producción tras borrados
+                Review.objects.filter(id__in=random.sample(range(1, size + 1), size // 20)).delete()
+
+                _, state = first_page()
+                deep = dict(state, pos=int(size * 0.9))
+
+                first = time_call(first_page, opts["repeat"])
+                later = time_call(lambda: shuffled_page(approved_reviews(), 10, deep), opts["repeat"])
+                row = (f"{size:>10}  {first[0]:>11.2f} / {first[1]:<10.2f}  "
+                       f"{later[0]:>11.2f} / {later[1]:<10.2f}")
+                if not opts["skip_legacy"]:
+                    old = time_call(legacy, max(3, opts["repeat"] // 10))
+                    row += f"  {old[0]:>10.2f} / {old[1]:<9.2f}"
+                self.stdout.write(row)
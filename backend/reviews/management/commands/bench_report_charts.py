@@ -0,0 +1,63 @@
+"""
+Compara los backends de gráficos del informe PDF (reportlab vs matplotlib).
+
+    python manage.py bench_report_charts
+    python manage.py bench_report_charts --months 36 --top-n 20 --repeat 10
+    python manage.py bench_report_charts --out /tmp   # guarda un PDF por backend
+
+Arma métricas sintéticas con la forma de `hu007.calcular_metricas` (no
+toca la BD) y mide `build_pdf` con cada backend: mediana de tiempo y
+tamaño del PDF resultante. La primera pasada de cada backend (imports,
+fuentes) no se cuenta.
+"""
+import random
+import statistics
+import time
+from pathlib import Path
+
+from django.core.management.base import BaseCommand
+
+
+def _metrics(top_n, months, rng):
+    evolution, elo = {}, 1500.0
+    for i in range(months):
+        elo += rng.uniform(-15, 15)
+        evolution[f"{2020 + i // 12}-{i % 12 + 1:02d}"] = round(elo, 2)
+    top = sorted((rng.uniform(1450, 1800) for _ in range(top_n)), reverse=True)
+    return {
+        "top_products": [{"producto": f"Producto {i}", "elo": round(e)} for i, e in enumerate(top)],
+        "elo_evolution": evolution,
+    }
+
+
+class Command(BaseCommand):
+    help = "Mide tiempo y tamaño del PDF de HU-007 con cada backend de gráficos."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--top-n", type=int, default=5)
+        parser.add_argument("--months", type=int, default=12)
+        parser.add_argument("--repeat", type=int, default=5)
+        parser.add_argument("--out", default=None, help="directorio donde guardar los PDF")
+        parser.add_argument("--seed", type=int, default=0)
+
+    def handle(self, *args, **opts):
+        from backend.api.utils.pdf import CHART_BACKENDS, build_pdf
+
+        metrics = _metrics(opts["top_n"], opts["months"], random.Random(opts["seed"]))
+        results = {}
+        for backend in CHART_BACKENDS:
+            build_pdf(metrics, backend)                 # calentamiento
+            times = []
+            for _ in range(opts["repeat"]):
+                t0 = time.perf_counter()
+                pdf = build_pdf(metrics, backend).getvalue()
+                times.append((time.perf_counter() - t0) * 1000)
+            results[backend] = (statistics.median(times), len(pdf))
+            if opts["out"]:
+                Path(opts["out"], f"informe_{backend}.pdf").write_bytes(pdf)
+            self.stdout.write(f"  {backend:<10} {results[backend][0]:8.1f} ms  {len(pdf) / 1024:8.1f} KiB")
+
+        (vec_ms, vec_size), (png_ms, png_size) = results["reportlab"], results["matplotlib"]
+        self.stdout.write(self.style.SUCCESS(
+            f"vectorial: {png_ms / vec_ms:.1f}× más rápido, {png_size / vec_size:.1f}× más chico"
+        ))
@@ -0,0 +1,67 @@
+"""
+Equivalencia y rendimiento de los serializadores del feed.
+
+    python manage.py bench_serializers --rows 2000
+
+Sobre una BD desechable con reseñas y comentarios, serializa las mismas
+reseñas con `ReviewPublicSerializer` (DRF) y con `serialize_reviews_fast`
+(proyección). Falla si el JSON difiere en algo; si no, informa
+reseñas/segundo de cada uno. La equivalencia en CI la garantiza
+`backend/tests/test_serializers.py`; esto la repite a escala.
+"""
+import json
+import random
+import time
+
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+
+from backend.api.serializers.comments_reports import ReviewPublicSerializer
+from backend.api.serializers.fast import serialize_reviews_fast
+from backend.api.services.feeds import EMBEDDED_COMMENTS, feed_reviews
+from backend.api.utils.benchmarks import scratch_database, seed_reviews
+from backend.reviews.models import Comment, Review
+
+
+class Command(BaseCommand):
+    help = "Compara el serializador DRF del feed con el de proyección (JSON y velocidad)."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--rows", type=int, default=2000)
+        parser.add_argument("--comments", type=int, default=5,
+                            help="comentarios promedio por reseña")
+        parser.add_argument("--repeat", type=int, default=5)
+
+    def handle(self, *args, **opts):
+        with scratch_database():
+            seed_reviews(opts["rows"])
+            ids = list(Review.objects.values_list("id", flat=True))
+            users = list(User.objects.values_list("id", flat=True))
+            rng = random.Random(0)
+            Comment.objects.bulk_create(
+                Comment(review_id=rng.choice(ids), user_id=rng.choice(users), text=f"comentario {i}")
+                for i in range(opts["rows"] * opts["comments"])
+            )
+
+            def drf():
+                return list(ReviewPublicSerializer(feed_reviews(ids), many=True).data)
+
+            def fast():
+                return serialize_reviews_fast(ids, EMBEDDED_COMMENTS)
+
+            def canonical(rows):
+                return json.dumps(sorted(rows, key=lambda r: r["id"]), sort_keys=True, default=str)
+
+            if canonical(drf()) != canonical(fast()):
+                raise CommandError("El serializador rápido no produce el mismo JSON que el de DRF.")
+            self.stdout.write(self.style.SUCCESS("JSON idéntico en ambos serializadores."))
+
+            for name, fn in (("DRF", drf), ("proyección", fast)):
+                best = min(self._elapsed(fn) for _ in range(opts["repeat"]))
+                self.stdout.write(f"{name:>11}: {len(ids) / best:>10.0f} reseñas/s ({best * 1000:.1f} ms)")
+
+    @staticmethod
+    def _elapsed(fn):
+        t0 = time.perf_counter()
+        fn()
+        return time.perf_counter() - t0
@@ -0,0 +1,107 @@
+"""
+Presupuesto de arranque en frío de la API.
+
+    python manage.py check_import_budget
+    python manage.py check_import_budget --budget-ms 600 --runs 5
+
+En un intérprete nuevo (`python -X importtime`) hace lo mismo que un
+worker al arrancar: django.setup() y carga del URLconf. Falla si tarda más
+de `--budget-ms` (mejor de `--runs` corridas) o si quedó importado algún
+módulo prohibido (por defecto matplotlib, reportlab y numpy, que sólo se
+usan en informes PDF y en recompute_elo). Al fallar lista los imports más
+caros.
+
+La medición (`measure_startup`) la reutiliza `backend/tests/test_import_budget.py`
+para que CI falle si un import pesado se cuela al arranque.
+"""
+import json
+import os
+import subprocess
+import sys
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+FORBIDDEN = ("matplotlib", "reportlab", "numpy")
+BUDGET_MS = 500
+
+CHILD = """
+import json, os, resource, sys, time
+t0 = time.perf_counter()
+import django
+django.setup()
+from django.urls import get_resolver
+get_resolver().url_patterns
+elapsed = (time.perf_counter() - t0) * 1000
+print(json.dumps({
+    "ms": elapsed,
+    "rss_mb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+    "loaded": sorted(m for m in json.loads(sys.argv[1]) if m in sys.modules),
+}))
+"""
+
+
+def slowest_imports(importtime_log, top):
+    """(µs acumulados, módulo) de los imports de primer nivel más caros."""
+    rows = []
+    for line in importtime_log.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        # la sangría indica anidamiento: sólo primer nivel, para no contar dos veces
+        if not name.startswith("  "):
+            rows.append((int(cumulative), name.strip()))
+    return sorted(rows, reverse=True)[:top]
+
+
+def measure_startup(forbid=FORBIDDEN, runs=3):
+    """
+    Arranca `runs` intérpretes nuevos y devuelve (mejor, log de importtime):
+    `mejor` = {"ms", "rss_mb", "loaded"}, con `loaded` los módulos de
+    `forbid` que quedaron importados. Lanza RuntimeError si el hijo falla.
+    """
+    env = dict(os.environ, DJANGO_SETTINGS_MODULE=settings.SETTINGS_MODULE)
+    best, log = None, ""
+    for _ in range(runs):
+        proc = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", CHILD, json.dumps(list(forbid))],
+            capture_output=True, text=True, env=env, cwd=settings.BASE_DIR,
+        )
+        if proc.returncode:
+            raise RuntimeError(proc.stderr[-2000:])
+        result = json.loads(proc.stdout.strip().splitlines()[-1])
+        if best is None or result["ms"] < best["ms"]:
+            best, log = result, proc.stderr
+    return best, log
+
+
+class Command(BaseCommand):
+    help = "Mide el arranque en frío de la API y vigila imports pesados."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--budget-ms", type=float, default=BUDGET_MS)
+        parser.add_argument("--runs", type=int, default=3)
+        parser.add_argument("--forbid", nargs="*", default=list(FORBIDDEN))
+        parser.add_argument("--top", type=int, default=10)
+
+    def handle(self, *args, **opts):
+        try:
+            best, log = measure_startup(opts["forbid"], opts["runs"])
+        except RuntimeError as exc:
+            raise CommandError(str(exc))
+
+        self.stdout.write(
+            f"Arranque: {best['ms']:.0f} ms (presupuesto {opts['budget_ms']:.0f} ms), "
+            f"RSS máx. {best['rss_mb']:.0f} MB"
+        )
+        errors = []
+        if best["loaded"]:
+            errors.append(f"módulos prohibidos importados al arrancar: {', '.join(best['loaded'])}")
+        if best["ms"] > opts["budget_ms"]:
+            errors.append("se excedió el presupuesto de arranque")
+        if errors:
+            self.stdout.write("Imports más caros (acumulado):")
+            for us, name in slowest_imports(log, opts["top"]):
+                self.stdout.write(f"  {us / 1000:>8.1f} ms  {name}")
+            raise CommandError("; ".join(errors))
+        self.stdout.write(self.style.SUCCESS("Dentro del presupuesto."))
@@ -0,0 +1,141 @@
+"""
+Verifica con EXPLAIN que las consultas calientes usan índices.
+
+    python manage.py check_query_plans            # falla si alguna no usa índice
+    python manage.py check_query_plans --verbose  # imprime cada plan
+
+Sobre una BD desechable con datos sembrados, ejecuta los mismos helpers
+que usan las vistas (feeds, "mis reseñas", reportes pendientes, etc.),
+captura el SQL que generan y pide el plan de cada consulta. Falla si el
+plan recorre entera una tabla de reseñas/reportes o si necesita ordenar
+en un B-tree temporal lo que debería salir ordenado del índice.
+
+`seed_plan_data` y `query_plans` son también la base del test
+`backend/tests/test_query_plans.py`, que corre en CI con `manage.py test`.
+"""
+import random
+from datetime import timedelta
+
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from backend.api.services.feeds import (
+    approved_reviews,
+    chronological_page,
+    favourite_categories,
+)
+from backend.api.services import export, hu007
+from backend.api.utils.benchmarks import scratch_database, seed_reviews
+from backend.reviews.models import Report, ReportStatus, Review, StatusChoices
+
+TABLES = ("reviews_review", "reviews_report")
+
+
+def _hot_queries(user, category):
+    """(nombre, función) de las consultas a revisar."""
+    _, after = chronological_page(approved_reviews().filter(category__in=[category]), 20)
+    now = timezone.now()
+    return [
+        ("feed por categoría", lambda: chronological_page(
+            approved_reviews().filter(category__in=[category]), 50)),
+        ("feed por categoría (página siguiente)", lambda: chronological_page(
+            approved_reviews().filter(category__in=[category]), 50, after)),
+        ("mis reseñas", lambda: chronological_page(Review.objects.filter(user=user), 50)),
+        ("feed aleatorio (sondeo por PK)", lambda: list(
+            approved_reviews().filter(id__in=range(1, 400, 7)).values_list("id", flat=True))),
+        ("categorías favoritas", lambda: favourite_categories(user)),
+        ("reportes pendientes", lambda: list(
+            Report.objects.filter(status=ReportStatus.PENDIENTE)
+            .order_by("-created_at").values_list("id", flat=True)[:50])),
+        ("recompute_elo por categoría", lambda: list(
+            Review.objects.filter(status=StatusChoices.APROBADA, category=category)
+            .order_by("created_at", "id")
+            .values_list("product_a_id", "product_b_id", "preferred_product_id")[:50])),
+        ("reseñas moderadas en un rango", lambda: Review.objects.filter(
+            status=StatusChoices.APROBADA,
+            updated_at__gte=now - timedelta(days=30), updated_at__lt=now).count()),
+        ("informe HU-007: reseñas por mes", lambda: hu007._reseñas_por_mes(
+            hu007._window(now.date() - timedelta(days=365), now.date()))),
+        ("informe HU-007: evolución Elo", lambda: hu007._evolucion_elo(
+            hu007._window(now.date() - timedelta(days=365), now.date()))),
+        ("exportación de reseñas", lambda: next(export.review_rows(
+            now.date() - timedelta(days=365), now.date()), None)),
+        ("exportación de reseñas por categoría", lambda: next(export.review_rows(
+            category=category), None)),
+    ]
+
+
+def _problems(plan):
+    """Problemas encontrados en un plan (texto de EXPLAIN)."""
+    found = []
+    for line in plan.splitlines():
+        if connection.vendor == "sqlite":
+            for table in TABLES:
+                if f"SCAN {table}" in line and "USING" not in line:
+                    found.append(f"recorre {table} completa")
+            if "TEMP B-TREE FOR ORDER BY" in line:
+                found.append("ordena en un B-tree temporal")
+            # sólo `status = ?`: recorre todas las aprobadas (p.ej. un sondeo
+            # `id IN (...)` que no usa la PK)
+            if "SEARCH reviews_review" in line and line.endswith("(status=?)"):
+                found.append("busca reseñas sólo por status")
+        elif "Seq Scan on" in line and any(t in line for t in TABLES):
+            found.append(line.strip())
+    return found
+
+
+def seed_plan_data(rows):
+    """Reseñas de dos categorías (una el doble de grande) y 2000 reportes."""
+    seed_reviews(rows, category="pelicula")
+    seed_reviews(rows * 2, category="serie")
+    reviews = list(Review.objects.values_list("id", flat=True)[:500])
+    users = list(User.objects.order_by("id")[:20])
+    rng = random.Random(0)
+    Report.objects.bulk_create(
+        Report(review_id=rng.choice(reviews), reporter=rng.choice(users),
+               status=rng.choice(ReportStatus.values))
+        for _ in range(2000)
+    )
+
+
+def _explain(sql):
+    prefix = "EXPLAIN QUERY PLAN " if connection.vendor == "sqlite" else "EXPLAIN "
+    with connection.cursor() as cursor:
+        cursor.execute(prefix + sql)
+        return "\n".join(" ".join(map(str, row)) for row in cursor.fetchall())
+
+
+def query_plans(user, category):
+    """Genera (nombre, sql, plan, problemas) por cada consulta caliente."""
+    for name, fn in _hot_queries(user, category):
+        with CaptureQueriesContext(connection) as ctx:
+            fn()
+        for query in ctx.captured_queries:
+            plan = _explain(query["sql"])
+            yield name, query["sql"], plan, _problems(plan)
+
+
+class Command(BaseCommand):
+    help = "Comprueba con EXPLAIN que las consultas de feeds y reportes usan índices."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--rows", type=int, default=20000)
+        parser.add_argument("--verbose", action="store_true")
+
+    def handle(self, *args, **opts):
+        failures = 0
+        with scratch_database():
+            seed_plan_data(opts["rows"])
+            user = User.objects.order_by("id").first()
+            for name, sql, plan, problems in query_plans(user, "pelicula"):
+                failures += bool(problems)
+                mark = self.style.ERROR("✗") if problems else self.style.SUCCESS("✓")
+                self.stdout.write(f"{mark} {name}" + (f": {'; '.join(problems)}" if problems else ""))
+                if opts["verbose"] or problems:
+                    self.stdout.write(f"    {sql}\n    " + plan.replace("\n", "\n    "))
+
+        if failures:
+            raise CommandError(f"{failures} consultas sin índice adecuado.")
@@ -0,0 +1,69 @@
+"""
+Importa comparaciones de socios desde JSON Lines o CSV.
+
+    python manage.py import_comparisons datos.jsonl
+    python manage.py import_comparisons datos.csv --chunk-size 2000 --create-users
+    cat datos.jsonl | python manage.py import_comparisons - --format jsonl
+
+Columnas / claves: user, product_a_id, product_b_id, preferred_id y
+opcionalmente justification, allow_comments, created_at. Validación,
+deduplicación, moderación y Elo por lotes (ver api/services/ingestion.py).
+"""
+import json
+import sys
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from backend.api.services import ingestion
+
+
+class Command(BaseCommand):
+    help = "Importa comparaciones (JSON Lines o CSV) por lotes."
+
+    def add_arguments(self, parser):
+        parser.add_argument("path", help="archivo a importar ('-' = stdin)")
+        parser.add_argument("--format", choices=("jsonl", "csv"), default=None,
+                            help="por defecto según la extensión del archivo")
+        parser.add_argument("--chunk-size", type=int, default=ingestion.CHUNK_SIZE)
+        parser.add_argument("--create-users", action="store_true",
+                            help="da de alta los usuarios que no existan")
+
+    def handle(self, *args, **opts):
+        path, fmt = opts["path"], opts["format"]
+        if fmt is None:
+            if path.endswith(".csv"):
+                fmt = "csv"
+            elif path.endswith((".jsonl", ".ndjson")):
+                fmt = "jsonl"
+            else:
+                raise CommandError("No se puede deducir el formato; usar --format.")
+
+        t0 = time.perf_counter()
+
+        def progress(summary):
+            self.stderr.write(
+                f"  {summary['received']} filas leídas, {summary['created']} creadas "
+                f"({time.perf_counter() - t0:.1f}s)"
+            )
+
+        stream = sys.stdin if path == "-" else open(path, encoding="utf-8-sig", newline="")
+        try:
+            summary = ingestion.ingest(
+                ingestion.read_rows(stream, fmt),
+                chunk_size=opts["chunk_size"],
+                create_users=opts["create_users"],
+                on_chunk=progress,
+            )
+        finally:
+            if stream is not sys.stdin:
+                stream.close()
+
+        elapsed = time.perf_counter() - t0
+        for err in summary["errors"]:
+            self.stderr.write(f"  línea {err['line']}: {err['error']}")
+        self.stdout.write(json.dumps({k: v for k, v in summary.items() if k != "errors"}))
+        self.stdout.write(self.style.SUCCESS(
+            f"{summary['created']} reseñas importadas en {elapsed:.2f}s "
+            f"({summary['received'] / elapsed if elapsed else 0:.0f} filas/s)."
+        ))
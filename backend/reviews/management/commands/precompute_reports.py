@@ -0,0 +1,63 @@
+"""
+Genera por adelantado los informes PDF estándar de HU-007.
+
+    python manage.py precompute_reports               # últimos 12 meses + histórico
+    python manage.py precompute_reports --months 3 --top-n 10
+
+Pensado para cron (p. ej. cada hora): calcula las métricas de cada mes
+calendario, del mes en curso y del histórico completo, y deja el PDF en la
+caché de informes (api/services/report_cache.py). Un pedido posterior con
+el mismo rango y top_n encuentra el archivo hecho; si los datos no cambiaron
+desde la última corrida, el informe ni siquiera se vuelve a renderizar.
+"""
+import time
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from backend.api.services import report_cache
+from backend.api.services.hu007 import calcular_metricas
+
+
+def _months(count, today):
+    """[(primer día, último día)] del mes en curso y los `count` anteriores."""
+    first = today.replace(day=1)
+    ranges = []
+    for _ in range(count + 1):
+        last = (first.replace(day=28) + timedelta(days=4)).replace(day=1) - timedelta(days=1)
+        ranges.append((first, last))
+        first = (first - timedelta(days=1)).replace(day=1)
+    return ranges
+
+
+class Command(BaseCommand):
+    help = "Precalcula los informes PDF mensuales de HU-007 en la caché de informes."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--months", type=int, default=12,
+                            help="meses completos hacia atrás (además del actual)")
+        parser.add_argument("--top-n", type=int, default=5)
+
+    def handle(self, *args, **opts):
+        from backend.api.utils.pdf import build_pdf, chart_backend
+
+        top_n = opts["top_n"]
+        ranges = _months(opts["months"], timezone.localdate()) + [(None, None)]
+        rendered = 0
+        t0 = time.perf_counter()
+        for start, end in ranges:
+            metrics = calcular_metricas(start_date=start, end_date=end, top_n=top_n)
+            pdf, key, hit = report_cache.get_or_render(
+                "pdf", {"top_n": top_n, "charts": chart_backend()}, metrics, build_pdf,
+            )
+            pdf.close()
+            rendered += not hit
+            label = f"{start} … {end}" if start else "histórico"
+            self.stdout.write(f"  {label}: {'en caché' if hit else 'generado'} ({key[:12]})")
+
+        removed, total = report_cache.evict()
+        self.stdout.write(self.style.SUCCESS(
+            f"{rendered}/{len(ranges)} informes generados en {time.perf_counter() - t0:.1f}s; "
+            f"caché: {total / 1024:.0f} KiB, {removed} desalojados."
+        ))
@@ -0,0 +1,195 @@
+"""
+Recalcula el Elo de todos los productos desde cero.
+
+    python manage.py recompute_elo                 # escribe resultados
+    python manage.py recompute_elo --dry-run       # sólo muestra el diff
+    python manage.py recompute_elo --k 24          # con otro K-factor
+
+Útil tras cambiar `Settings.K_FACTOR`, un borrado masivo o revertir una
+moderación. Recorre las reseñas aprobadas en orden cronológico, categoría
+por categoría (nunca hay comparaciones entre categorías, ver `Review.clean`),
+y reproduce cada categoría en su propio proceso worker. Al final escribe los
+puntajes con `bulk_update` y guarda una foto en `EloSnapshot`, que pasa a
+ser la referencia de `elo_history.rating_at`.
+
+Comparaciones en vivo: antes de leer se anota el último `EloEvent`. Al
+escribir, con las filas de productos bloqueadas (`select_for_update`, las
+mismas que toma `apply_match`), se vuelven a aplicar sobre el resultado las
+comparaciones con eventos posteriores cuya reseña no entró en la
+reproducción; así no se pisan. En SQLite `select_for_update` no bloquea:
+la primera escritura toma el lock de la base y se vuelve a mirar el ledger
+una vez más antes de confirmar.
+"""
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from itertools import chain
+
+import numpy as np
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import Max
+
+from backend.reviews.models import EloEvent, Product, Review, Settings, StatusChoices
+from backend.reviews.services.elo_history import take_snapshot
+from backend.reviews.services.elo_replay import replay
+from backend.reviews.services.review_services import elo_delta
+from backend.reviews.signals import elo_changed
+
+
+class Command(BaseCommand):
+    help = "Recalcula el Elo de todos los productos reproduciendo las reseñas aprobadas."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--k", type=int, default=None,
+                            help="K-factor a usar (por defecto Settings.K_FACTOR)")
+        parser.add_argument("--dry-run", action="store_true",
+                            help="no escribe nada; muestra las diferencias")
+        parser.add_argument("--workers", type=int, default=None,
+                            help="procesos worker (0 = todo en este proceso)")
+        parser.add_argument("--show", type=int, default=20,
+                            help="cantidad de diferencias a listar en --dry-run")
+        parser.add_argument("--chunk-size", type=int, default=10000)
+
+    def handle(self, *args, **opts):
+        k = opts["k"] if opts["k"] is not None else Settings.K_FACTOR
+        initial = Product._meta.get_field("elo_score").default
+        categories = [c for c, _ in Product.CATEGORIES]
+        workers = opts["workers"]
+        if workers is None:
+            workers = min(len(categories), os.cpu_count() or 1)
+
+        t0 = time.perf_counter()
+        new_scores, n_matches, replayed = {}, 0, []
+        # lo que se aplique en vivo después de esto se re-aplica al escribir
+        high_water = EloEvent.objects.aggregate(m=Max("id"))["m"] or 0
+
+        if workers:
+            ctx = multiprocessing.get_context("spawn")
+            with ProcessPoolExecutor(max_workers=workers, mp_context=ctx) as pool:
+                pending = []
+                for cat in categories:
+                    pids, a_idx, b_idx, a_wins, review_ids = self._load(cat, opts["chunk_size"])
+                    n_matches += len(a_idx)
+                    replayed.append(review_ids)
+                    fut = pool.submit(replay, len(pids), a_idx, b_idx, a_wins, k, initial)
+                    pending.append((pids, fut))
+                for pids, fut in pending:
+                    new_scores.update(zip(pids.tolist(), fut.result().tolist()))
+        else:
+            for cat in categories:
+                pids, a_idx, b_idx, a_wins, review_ids = self._load(cat, opts["chunk_size"])
+                n_matches += len(a_idx)
+                replayed.append(review_ids)
+                ratings = replay(len(pids), a_idx, b_idx, a_wins, k, initial)
+                new_scores.update(zip(pids.tolist(), ratings.tolist()))
+
+        elapsed = time.perf_counter() - t0
+        self.stdout.write(
+            f"{n_matches} comparaciones reproducidas en {elapsed:.2f}s (K={k})."
+        )
+
+        current = dict(Product.objects.values_list("id", "elo_score"))
+        changed = {
+            pid: (current[pid], score)
+            for pid, score in new_scores.items()
+            if pid in current and current[pid] != score
+        }
+        self.stdout.write(f"{len(changed)} de {len(current)} productos cambian.")
+
+        if opts["dry_run"]:
+            self._print_diff(changed, opts["show"])
+            return
+
+        replayed = np.sort(np.concatenate(replayed)) if replayed else np.empty(0, np.int64)
+        with transaction.atomic():
+            written = dict(
+                Product.objects.select_for_update().order_by("id").values_list("id", "elo_score")
+            )
+            scores, late_total, first = dict(new_scores), 0, True
+            while True:
+                late, high_water = self._late_matches(high_water, replayed)
+                late_total += len(late)
+                for a, b, winner in late:
+                    delta = elo_delta(scores.setdefault(a, initial), scores.setdefault(b, initial),
+                                      winner == a, k)
+                    scores[a] += delta
+                    scores[b] -= delta
+                if not (first or late):
+                    break
+                first = False
+                dirty = {pid: s for pid, s in scores.items() if pid in written and written[pid] != s}
+                Product.objects.bulk_update(
+                    [Product(id=pid, elo_score=score) for pid, score in dirty.items()],
+                    ["elo_score"],
+                    batch_size=500,
+                )
+                written.update(dirty)
+                changed.update({pid: (current.get(pid), s) for pid, s in dirty.items()})
+            take_snapshot()
+            transaction.on_commit(lambda: elo_changed.send(
+                sender=Product, product_ids=list(changed)
+            ))
+        if late_total:
+            self.stdout.write(f"{late_total} comparaciones aplicadas en vivo durante el cálculo re-aplicadas.")
+        self.stdout.write(self.style.SUCCESS("Puntajes Elo actualizados."))
+
+    # ------------------------------------------------------------------ #
+    def _load(self, category, chunk_size):
+        """
+        Devuelve (pids, a_idx, b_idx, a_wins, review_ids) de una categoría.
+        Las reseñas se leen en streaming directamente a un array, sin
+        instanciar modelos.
+        """
+        pids = np.fromiter(
+            Product.objects.filter(category=category)
+            .order_by("id").values_list("id", flat=True),
+            dtype=np.int64,
+        )
+        rows = (
+            Review.objects
+            .filter(status=StatusChoices.APROBADA, category=category)
+            .order_by("created_at", "id")
+            .values_list("product_a_id", "product_b_id", "preferred_product_id", "id")
+        )
+        flat = np.fromiter(
+            chain.from_iterable(rows.iterator(chunk_size=chunk_size)),
+            dtype=np.int64,
+        ).reshape(-1, 4)
+
+        a_idx = np.searchsorted(pids, flat[:, 0])
+        b_idx = np.searchsorted(pids, flat[:, 1])
+        a_wins = flat[:, 2] == flat[:, 0]
+        return pids, a_idx, b_idx, a_wins, flat[:, 3]
+
+    def _late_matches(self, after, replayed):
+        """
+        Comparaciones con EloEvent de id > `after` cuya reseña (aprobada) no
+        está en `replayed` (ids ordenados), en el orden en que se aplicaron.
+        Devuelve ([(a, b, ganador), ...], último id de evento visto).
+        """
+        events = list(
+            EloEvent.objects.filter(id__gt=after).order_by("id").values_list("id", "review_id")
+        )
+        if not events:
+            return [], after
+        order = list(dict.fromkeys(rid for _, rid in events if rid is not None))
+        fresh = [rid for rid, seen in zip(order, np.isin(order, replayed)) if not seen]
+        reviews = {
+            rid: (a, b, winner)
+            for rid, a, b, winner in Review.objects.filter(
+                id__in=fresh, status=StatusChoices.APROBADA,
+            ).values_list("id", "product_a_id", "product_b_id", "preferred_product_id")
+        }
+        return [reviews[rid] for rid in fresh if rid in reviews], events[-1][0]
+
+    def _print_diff(self, changed, limit):
+        top = sorted(changed.items(), key=lambda kv: -abs(kv[1][1] - kv[1][0]))[:limit]
+        names = dict(
+            Product.objects.filter(id__in=[pid for pid, _ in top]).values_list("id", "name")
+        )
+        for pid, (old, new) in top:
+            self.stdout.write(
+                f"  #{pid:<6} {names.get(pid, '?')[:40]:<40} {old:>6} → {new:<6} ({new - old:+d})"
+            )
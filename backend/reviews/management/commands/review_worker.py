@@ -0,0 +1,59 @@
+"""
+Worker de la cola de moderación + Elo (ver services/review_jobs.py).
+
+    python manage.py review_worker                 # corre indefinidamente
+    python manage.py review_worker --burst         # vacía la cola y termina
+    python manage.py review_worker --batch-size 200 --interval 0.5
+
+Se pueden correr varios a la vez: cada lote se toma con un lease y los
+trabajos de un worker caído se reintentan al vencer. Sus contadores de
+moderación y Elo se vuelcan para /api/metrics/ tras cada lote.
+"""
+import signal
+import time
+
+from django.core.management.base import BaseCommand
+
+from backend.api.utils import metrics
+from backend.reviews.services import review_jobs
+
+
+class Command(BaseCommand):
+    help = "Procesa la cola de moderación y Elo de las reseñas."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=None,
+                            help="trabajos por lote (por defecto REVIEW_PIPELINE['BATCH_SIZE'])")
+        parser.add_argument("--interval", type=float, default=1.0,
+                            help="segundos de espera cuando la cola está vacía")
+        parser.add_argument("--burst", action="store_true",
+                            help="termina en cuanto no quedan trabajos listos")
+
+    def handle(self, *args, **opts):
+        worker = review_jobs.worker_id()
+        stopping = []
+        for sig in (signal.SIGINT, signal.SIGTERM):
+            signal.signal(sig, lambda *_: stopping.append(True))
+
+        self.stdout.write(f"Worker {worker} iniciado.")
+        total_done = total_failed = 0
+        while not stopping:
+            t0 = time.perf_counter()
+            done, failed = review_jobs.run_once(opts["batch_size"], worker)
+            if done or failed:
+                total_done += done
+                total_failed += failed
+                self.stdout.write(
+                    f"lote: {done} ok, {failed} con error "
+                    f"({(time.perf_counter() - t0) * 1000:.0f} ms)"
+                )
+                metrics.maybe_flush()
+                continue
+            if opts["burst"]:
+                break
+            time.sleep(opts["interval"])
+
+        metrics.flush()
+        self.stdout.write(self.style.SUCCESS(
+            f"Worker {worker} detenido: {total_done} procesados, {total_failed} con error."
+        ))
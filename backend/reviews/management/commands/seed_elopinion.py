@@ -0,0 +1,411 @@
+"""
+Generador de datos sintéticos a escala (benchmarks y planificación).
+
+    python manage.py seed_elopinion                                   # 100k reseñas
+    python manage.py seed_elopinion --reviews 2000000 --users 50000 --products 500
+    python manage.py seed_elopinion --seed 7 --until 2025-06-30 --product-skew 1.3
+
+Genera productos por categoría, usuarios con `UserProfile`, reseñas,
+comentarios, reportes y los trabajos de moderación de las reseñas
+pendientes. Con la misma semilla, `--until` y una BD vacía, el resultado es
+idéntico entre corridas.
+
+Distribuciones
+────────────────────────────────────────────────────────────────────────────
+• Popularidad de productos dentro de su categoría: Zipf (`--product-skew`);
+  unos pocos productos concentran la mayoría de las comparaciones.
+• Actividad de usuarios (reseñas, comentarios y reportes): Zipf
+  (`--user-skew`). Cada usuario tiene una categoría favorita que recibe
+  `--focus` de sus reseñas.
+• Ganador: Bradley-Terry sobre una "calidad" oculta por producto (normal
+  con desvío `--quality-spread`), así el Elo resultante converge a un
+  ranking coherente.
+• Fechas: uniformes en los `--days` días que terminan en `--until`; los ids
+  siguen el orden cronológico y comentarios y reportes son posteriores a su
+  reseña.
+
+Respeta las reglas de `Review`: misma categoría, productos distintos y una
+comparación por usuario y pareja (en cualquier orden). Todo se genera en
+NumPy; las parejas repetidas se descartan con una clave empaquetada
+(usuario, categoría, pareja) y se vuelve a muestrear hasta completar. Si un
+usuario muy activo agota las parejas posibles salen menos reseñas que las
+pedidas (se informa al final).
+
+Usuarios y productos se crean con bulk_create. Reseñas, trabajos,
+comentarios y reportes se insertan con `executemany` sobre SQL armado desde
+`_meta`, con ids explícitos y un commit cada `--batch-size` filas: con
+millones de filas el costo de armar instancias de modelo domina. Como en
+`loaddata`, las FKs no se chequean fila por fila sino una vez al final
+(`check_constraints`) y después se llevan las secuencias de ids al máximo
+cargado (`sequence_reset_sql`; en PostgreSQL, sin eso el próximo INSERT
+del ORM chocaría con una PK existente). En SQLite,
+si la carga al menos duplica la tabla de reseñas, los índices secundarios
+de esas tablas se borran durante la carga y se recrean al final (recrear el
+índice único vuelve a validar una reseña por usuario y pareja).
+
+Al final recalcula el Elo con `recompute_elo` (no escribe el ledger
+`EloEvent`); `--skip-elo` lo omite.
+"""
+import time
+from contextlib import contextmanager, nullcontext
+from datetime import datetime, timezone as dt_timezone
+
+import numpy as np
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+from django.core.management.color import no_style
+from django.db import connection, transaction
+from django.db.models import Max
+
+from backend.api.services import feed_cache, leaderboard
+from backend.api.services.catalog import bump_catalog_version
+from backend.reviews.models import (
+    Comment, JobStatus, Product, Report, ReportStatus, Review, ReviewJob,
+    StatusChoices, UserProfile,
+)
+from backend.reviews.services.moderation import DEFAULT_TERMS
+
+WORDS = np.array((
+    "buena mala mejor peor historia actuación sabor precio calidad ritmo final "
+    "gráficos servicio ambiente jugabilidad guion música porción textura trama "
+    "personajes atención duración entrega rápida lenta excelente aceptable"
+).split())
+TEXT_POOL = 2048
+US = 1_000_000
+
+
+# ───────────────────────── muestreo ──────────────────────────────
+def _zipf_cdf(n, skew):
+    """Distribución acumulada de una Zipf(skew) sobre los rangos 1..n."""
+    cdf = np.cumsum(np.arange(1, n + 1, dtype=np.float64) ** -skew)
+    return cdf / cdf[-1]
+
+
+def _sample(rng, cdf, size):
+    """Índices 0..n-1 con la distribución `cdf` (cdf[-1] == 1)."""
+    return np.searchsorted(cdf, rng.random(size), side="right")
+
+
+def _texts(rng, count, min_words, max_words, extra=None):
+    """Textos de relleno; con `extra`, cada uno termina en una de esas palabras."""
+    texts = []
+    for n in rng.integers(min_words, max_words + 1, size=count):
+        words = WORDS[rng.integers(len(WORDS), size=n)].tolist()
+        if extra:
+            words.append(extra[rng.integers(len(extra))])
+        texts.append(" ".join(words))
+    return np.array(texts, dtype=object)
+
+
+# ───────────────────────── SQL ───────────────────────────────────
+def _insert_sql(model, names):
+    fields = [model._meta.get_field(n) for n in names]
+    qn = connection.ops.quote_name
+    return (
+        f"INSERT INTO {qn(model._meta.db_table)} "
+        f"({', '.join(qn(f.column) for f in fields)}) "
+        f"VALUES ({', '.join(['%s'] * len(fields))})"
+    )
+
+
+def _db_datetimes(micros):
+    """Microsegundos UTC (int64) → valores listos para el parámetro SQL."""
+    stamps = micros.astype("datetime64[us]")
+    if connection.vendor == "sqlite":
+        # mismo texto que adapt_datetimefield_value, sin pasar por datetime
+        return [s.replace("T", " ") for s in np.datetime_as_string(stamps).tolist()]
+    to_db = connection.ops.adapt_datetimefield_value
+    return [to_db(d.replace(tzinfo=dt_timezone.utc)) for d in stamps.tolist()]
+
+
+@contextmanager
+def _deferred_indexes(models):
+    """Borra los índices secundarios de `models` (SQLite) y los recrea al salir."""
+    qn = connection.ops.quote_name
+    tables = [m._meta.db_table for m in models]
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT name, sql FROM sqlite_master WHERE type = 'index' AND sql IS NOT NULL "
+            f"AND tbl_name IN ({', '.join(['%s'] * len(tables))})",
+            tables,
+        )
+        indexes = cursor.fetchall()
+        for name, _ in indexes:
+            cursor.execute(f"DROP INDEX {qn(name)}")
+    try:
+        yield
+    finally:
+        with connection.cursor() as cursor:
+            for _, sql in indexes:
+                cursor.execute(sql)
+
+
+class Command(BaseCommand):
+    help = "Genera productos, usuarios, reseñas, comentarios y reportes sintéticos."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--reviews", type=int, default=100_000)
+        parser.add_argument("--users", type=int, default=5_000)
+        parser.add_argument("--products", type=int, default=200, help="por categoría")
+        parser.add_argument("--categories", default=None,
+                            help="separadas por coma (por defecto todas)")
+        parser.add_argument("--comments", type=float, default=0.1,
+                            help="comentarios por reseña (promedio)")
+        parser.add_argument("--reports", type=float, default=0.005,
+                            help="reportes por reseña (promedio)")
+        parser.add_argument("--rejected", type=float, default=0.03,
+                            help="fracción de reseñas rechazadas")
+        parser.add_argument("--pending", type=float, default=0.01,
+                            help="fracción de reseñas pendientes (con su trabajo en cola)")
+        parser.add_argument("--product-skew", type=float, default=1.1)
+        parser.add_argument("--user-skew", type=float, default=1.0)
+        parser.add_argument("--focus", type=float, default=0.6,
+                            help="fracción de reseñas en la categoría favorita del usuario")
+        parser.add_argument("--quality-spread", type=float, default=1.0)
+        parser.add_argument("--days", type=int, default=365)
+        parser.add_argument("--until", default=None, help="AAAA-MM-DD (por defecto hoy)")
+        parser.add_argument("--seed", type=int, default=0)
+        parser.add_argument("--batch-size", type=int, default=50_000)
+        parser.add_argument("--skip-elo", action="store_true",
+                            help="no recalcula el Elo al terminar")
+
+    def handle(self, *args, **opts):
+        categories = (opts["categories"] or ",".join(c for c, _ in Product.CATEGORIES)).split(",")
+        unknown = set(categories) - set(dict(Product.CATEGORIES))
+        if unknown:
+            raise CommandError(f"Categorías desconocidas: {', '.join(sorted(unknown))}")
+        if opts["pending"] + opts["rejected"] > 1:
+            raise CommandError("--pending + --rejected no puede superar 1.")
+        if opts["products"] < 2 or opts["users"] < 1:
+            raise CommandError("Hacen falta al menos 2 productos por categoría y 1 usuario.")
+
+        self.opts = opts
+        self.rng = np.random.default_rng(opts["seed"])
+        until = datetime.strptime(opts["until"], "%Y-%m-%d") if opts["until"] else datetime.now()
+        until = until.replace(hour=23, minute=59, second=59, microsecond=0, tzinfo=dt_timezone.utc)
+        self.until_us = int(until.timestamp()) * US
+        self.span_us = opts["days"] * 86400 * US
+
+        if connection.vendor == "sqlite":
+            # sólo para esta conexión. Sin fsync (~7% menos): si se cae el
+            # sistema a mitad de la carga la BD puede quedar inservible, es un
+            # generador para BDs descartables. La caché grande evita releer
+            # del disco el índice único, que se llena en orden aleatorio.
+            with connection.cursor() as cursor:
+                cursor.execute("PRAGMA synchronous = OFF")
+                cursor.execute("PRAGMA cache_size = -262144")        # 256 MiB
+
+        t0 = time.perf_counter()
+        catalog = self._products(categories)
+        users = self._users()
+
+        existing = Review.objects.count()
+        defer = connection.vendor == "sqlite" and opts["reviews"] >= existing
+        tables = (Review, ReviewJob, Comment, Report)
+        # como loaddata: sin chequeo de FKs fila por fila, y una verificación al final
+        with connection.constraint_checks_disabled():
+            with _deferred_indexes(tables) if defer else nullcontext():
+                counts = self._content(categories, catalog, users)
+        connection.check_constraints(table_names=[m._meta.db_table for m in tables])
+        # ids explícitos: como loaddata, secuencias al máximo (vacío en SQLite)
+        reset = connection.ops.sequence_reset_sql(no_style(), tables)
+        if reset:
+            with connection.cursor() as cursor:
+                for statement in reset:
+                    cursor.execute(statement)
+
+        bump_catalog_version()
+        leaderboard.invalidate()
+        for category in categories:
+            feed_cache.bump(f"cat:{category}")
+
+        elapsed = time.perf_counter() - t0
+        rows = sum(counts.values())
+        self.stdout.write(self.style.SUCCESS(
+            f"{rows} filas en {elapsed:.1f}s ({rows / elapsed:,.0f} filas/s): "
+            + ", ".join(f"{n} {name}" for name, n in counts.items())
+        ))
+        if counts["reseñas"] < opts["reviews"]:
+            self.stdout.write(self.style.WARNING(
+                f"Se pidieron {opts['reviews']} reseñas: los usuarios más activos "
+                "agotaron sus parejas posibles (subir --products o --users)."
+            ))
+
+        if not opts["skip_elo"]:
+            call_command("recompute_elo", stdout=self.stdout, stderr=self.stderr)
+
+    # ───────────────────────── catálogo y usuarios ───────────────────
+    def _products(self, categories):
+        """
+        Devuelve (ids, calidad): arrays (categorías × productos) ordenados por
+        popularidad dentro de cada fila.
+        """
+        n = self.opts["products"]
+        labels = dict(Product.CATEGORIES)
+        created = Product.objects.bulk_create(
+            [Product(name=f"{labels[c]} sintético {i + 1}", category=c)
+             for c in categories for i in range(n)],
+            batch_size=5000,
+        )
+        ids = np.array([p.id for p in created], dtype=np.int64).reshape(len(categories), n)
+        ids = self.rng.permuted(ids, axis=1)          # id ≠ rango de popularidad
+        quality = self.rng.normal(0, self.opts["quality_spread"], size=ids.shape)
+        self.stdout.write(f"  {len(created)} productos")
+        return ids, quality
+
+    def _users(self):
+        """Ids de usuario, del más activo al menos activo."""
+        start = User.objects.filter(username__startswith="seed-").count()
+        users = User.objects.bulk_create(
+            [User(username=f"seed-{start + i}", password="!") for i in range(self.opts["users"])],
+            batch_size=5000,
+        )
+        UserProfile.objects.bulk_create([UserProfile(user=u) for u in users], batch_size=5000)
+        self.stdout.write(f"  {len(users)} usuarios con perfil")
+        return np.array([u.id for u in users], dtype=np.int64)
+
+    # ───────────────────────── reseñas ───────────────────────────────
+    def _pairs(self, n_categories, n_users):
+        """Muestrea (usuario, categoría, rango A, rango B) sin parejas repetidas."""
+        opts, rng = self.opts, self.rng
+        n = opts["products"]
+        user_cdf = _zipf_cdf(n_users, opts["user_skew"])
+        product_cdf = _zipf_cdf(n, opts["product_skew"])
+        favourite = rng.integers(n_categories, size=n_users)
+
+        parts, unique = [], np.empty(0, dtype=np.int64)
+        wanted, yield_ = opts["reviews"], 1.0
+        while len(unique) < wanted:
+            # se sobremuestrea según la fracción útil de la vuelta anterior
+            size = int((wanted - len(unique)) / yield_ * 1.2) + 1000
+            u = _sample(rng, user_cdf, size)
+            cat = np.where(rng.random(size) < opts["focus"], favourite[u],
+                           rng.integers(n_categories, size=size))
+            ra, rb = _sample(rng, product_cdf, size), _sample(rng, product_cdf, size)
+            ok = ra != rb
+            parts.append(np.stack([u[ok], cat[ok], ra[ok], rb[ok]]))
+            batch = np.concatenate(parts, axis=1)
+            u, cat, ra, rb = batch
+            key = ((u * n_categories + cat) * n + np.minimum(ra, rb)) * n + np.maximum(ra, rb)
+            _, first = np.unique(key, return_index=True)
+            yield_ = (len(first) - len(unique)) / size
+            unique = first
+            if yield_ < 0.01:
+                break                   # saturado: casi todo sale repetido
+        unique.sort()                   # conserva el orden de generación
+        return batch[:, unique[:wanted]]
+
+    def _content(self, categories, catalog, users):
+        opts, rng = self.opts, self.rng
+        ids, quality = catalog
+        u, cat, ra, rb = self._pairs(len(categories), len(users))
+        total = len(u)
+
+        created = self.until_us - (rng.random(total) * self.span_us).astype(np.int64)
+        order = np.argsort(created, kind="stable")    # ids en orden cronológico
+        u, cat, ra, rb, created = u[order], cat[order], ra[order], rb[order], created[order]
+
+        a, b = ids[cat, ra], ids[cat, rb]
+        a_wins = rng.random(total) < 1 / (1 + np.exp(quality[cat, rb] - quality[cat, ra]))
+        preferred = np.where(a_wins, a, b)
+        roll = rng.random(total)
+        # 0 = aprobada, 1 = pendiente, 2 = rechazada
+        status = np.where(roll < opts["rejected"], 2,
+                          np.where(roll < opts["rejected"] + opts["pending"], 1, 0))
+        allow = rng.random(total) < 0.9
+        clean = _texts(rng, TEXT_POOL, 0, 20)
+        offensive = _texts(rng, TEXT_POOL // 8, 3, 12, [t.rstrip("*") for t in DEFAULT_TERMS])
+        text = np.where(status == 2,
+                        offensive[rng.integers(len(offensive), size=total)],
+                        clean[rng.integers(len(clean), size=total)])
+
+        first_id = (Review.objects.aggregate(n=Max("id"))["n"] or 0) + 1
+        review_ids = np.arange(first_id, first_id + total, dtype=np.int64)
+        author = users[u]
+        columns = {
+            "id": review_ids,
+            "product_a": a,
+            "product_b": b,
+            "preferred_product": preferred,
+            "user": author,
+            "justification": text,
+            "allow_comments": allow,
+            "status": np.array([StatusChoices.APROBADA, StatusChoices.PENDIENTE,
+                                StatusChoices.RECHAZADA], dtype=object)[status],
+            "pair_low": np.minimum(a, b),
+            "pair_high": np.maximum(a, b),
+            "category": np.array(categories, dtype=object)[cat],
+            "created_at": created,
+            "updated_at": created,
+        }
+        counts = {"reseñas": self._load(Review, columns)}
+
+        pending = status == 1
+        when = created[pending]
+        counts["trabajos"] = self._load(ReviewJob, {
+            "review": review_ids[pending],
+            "status": np.full(len(when), JobStatus.PENDIENTE, dtype=object),
+            "attempts": np.zeros(len(when), dtype=np.int64),
+            "last_error": np.full(len(when), "", dtype=object),
+            "available_at": when,
+            "locked_by": np.full(len(when), "", dtype=object),
+            "created_at": when,
+            "updated_at": when,
+        })
+
+        # comentarios: sólo en aprobadas que los admiten
+        user_cdf = _zipf_cdf(len(users), opts["user_skew"])
+        open_rows = np.flatnonzero((status == 0) & allow)
+        n_comments = int(total * opts["comments"]) if len(open_rows) else 0
+        target = np.sort(open_rows[rng.integers(len(open_rows), size=n_comments)]) if n_comments else open_rows[:0]
+        counts["comentarios"] = self._load(Comment, {
+            "review": review_ids[target],
+            "user": users[_sample(rng, user_cdf, len(target))],
+            "text": _texts(rng, TEXT_POOL, 2, 12)[rng.integers(TEXT_POOL, size=len(target))],
+            "created_at": self._after(created[target]),
+        })
+
+        # reportes: cualquier reseña, nunca del propio autor
+        target = np.sort(rng.integers(total, size=int(total * opts["reports"])))
+        reporter = users[_sample(rng, user_cdf, len(target))]
+        own = reporter == author[target]
+        target, reporter = target[~own], reporter[~own]
+        counts["reportes"] = self._load(Report, {
+            "review": review_ids[target],
+            "reporter": reporter,
+            "reason": _texts(rng, TEXT_POOL // 8, 3, 8)[rng.integers(TEXT_POOL // 8, size=len(target))],
+            "status": np.where(rng.random(len(target)) < 0.7,
+                               ReportStatus.PENDIENTE, ReportStatus.RECHAZADA).astype(object),
+            "created_at": self._after(created[target]),
+        })
+        return counts
+
+    def _after(self, micros):
+        """Instantes al azar entre cada valor de `micros` y `--until`."""
+        return micros + (self.rng.random(len(micros)) * (self.until_us - micros)).astype(np.int64)
+
+    def _load(self, model, columns):
+        """Inserta las columnas (arrays alineados) en lotes, un commit por lote."""
+        datetimes = {
+            name for name in columns
+            if model._meta.get_field(name).get_internal_type() == "DateTimeField"
+        }
+        sql = _insert_sql(model, columns)
+        total = len(next(iter(columns.values())))
+        t0 = time.perf_counter()
+        for start in range(0, total, self.opts["batch_size"]):
+            stop = min(start + self.opts["batch_size"], total)
+            values = []
+            for name, array in columns.items():
+                if name in datetimes:
+                    values.append(_db_datetimes(array[start:stop]))
+                else:
+                    values.append(array[start:stop].tolist())
+            with transaction.atomic(), connection.cursor() as cursor:
+                cursor.executemany(sql, zip(*values))
+            self.stderr.write(
+                f"  {model._meta.verbose_name_plural}: {stop}/{total} "
+                f"({time.perf_counter() - t0:.1f}s)"
+            )
+        return total
@@ -0,0 +1,21 @@
+"""
+Foto periódica del Elo de todos los productos.
+
+    python manage.py snapshot_elo
+
+Pensado para correr desde cron (p.ej. a fin de cada día o mes); las fotos
+acotan el costo de `elo_history.ratings_at`.
+"""
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from backend.reviews.services.elo_history import take_snapshot
+
+
+class Command(BaseCommand):
+    help = "Guarda una foto (EloSnapshot) del Elo actual de cada producto."
+
+    def handle(self, *args, **opts):
+        with transaction.atomic():
+            total = take_snapshot()
+        self.stdout.write(self.style.SUCCESS(f"Foto guardada para {total} productos."))
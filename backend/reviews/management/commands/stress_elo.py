@@ -0,0 +1,90 @@
+"""
+Prueba de estrés del motor Elo.
+
+    python manage.py stress_elo --threads 8 --matches 500 --products 4
+
+Crea unos pocos productos "calientes", lanza N hilos que los comparan entre
+sí en paralelo y reporta comparaciones/segundo. Al final verifica que no
+hubo deriva: como cada comparación es de suma cero, el Elo total debe ser
+exactamente el inicial. Los productos temporales se borran al terminar.
+"""
+import random
+import threading
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+
+from backend.reviews.models import Product
+from backend.reviews.services.review_services import apply_match
+
+
+class Command(BaseCommand):
+    help = "Estrés multihilo del motor Elo sobre productos calientes."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--threads", type=int, default=8)
+        parser.add_argument("--matches", type=int, default=500,
+                            help="comparaciones por hilo")
+        parser.add_argument("--products", type=int, default=4,
+                            help="cantidad de productos calientes (>= 2)")
+        parser.add_argument("--seed", type=int, default=None)
+
+    def handle(self, *args, **opts):
+        n_products = opts["products"]
+        if n_products < 2:
+            raise CommandError("--products debe ser al menos 2")
+
+        products = Product.objects.bulk_create(
+            Product(name=f"__stress_elo_{i}", category="pelicula")
+            for i in range(n_products)
+        )
+        ids = [p.id for p in products]
+        initial_total = sum(p.elo_score for p in products)
+        errors = []
+
+        def worker(seed):
+            rng = random.Random(seed)
+            try:
+                for _ in range(opts["matches"]):
+                    a, b = rng.sample(ids, 2)
+                    apply_match(a, b, rng.choice((a, b)))
+            except Exception as exc:  # se reporta al final
+                errors.append(exc)
+            finally:
+                connection.close()
+
+        base_seed = opts["seed"] if opts["seed"] is not None else random.randrange(1 << 30)
+        threads = [
+            threading.Thread(target=worker, args=(base_seed + i,))
+            for i in range(opts["threads"])
+        ]
+
+        try:
+            t0 = time.perf_counter()
+            for t in threads:
+                t.start()
+            for t in threads:
+                t.join()
+            elapsed = time.perf_counter() - t0
+
+            final = dict(Product.objects.filter(id__in=ids).values_list("id", "elo_score"))
+            final_total = sum(final.values())
+        finally:
+            Product.objects.filter(id__in=ids).delete()
+
+        done = opts["threads"] * opts["matches"]
+        self.stdout.write(
+            f"{done} comparaciones en {elapsed:.2f}s "
+            f"→ {done / elapsed:.0f} comparaciones/s "
+            f"({opts['threads']} hilos, {n_products} productos)"
+        )
+        self.stdout.write(f"Elo final: {final}")
+
+        if errors:
+            raise CommandError(f"{len(errors)} hilos fallaron: {errors[0]!r}")
+        if final_total != initial_total:
+            raise CommandError(
+                f"Deriva detectada: total inicial {initial_total}, final {final_total}"
+            )
+        self.stdout.write(self.style.SUCCESS("Sin deriva: Elo total conservado."))
@@ -0,0 +1,62 @@
+"""
+Copia la primaria SQLite a las réplicas de lectura (ver api/db_router.py).
+
+    python manage.py sync_replicas                 # una copia y termina
+    python manage.py sync_replicas --interval 2    # cada 2 s (réplica con retraso)
+
+Para probar en local el ruteo con dos archivos SQLite: la copia usa la API
+de backup de SQLite, página por página y consistente aunque la primaria
+esté recibiendo escrituras. Con `--interval` simula una réplica que va
+atrasada a lo sumo ese tiempo (conviene que no supere
+`DB_REPLICAS["MAX_LAG_SECONDS"]`). Con PostgreSQL/MySQL las réplicas se
+mantienen con la replicación del propio motor, no con este comando.
+"""
+import signal
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DEFAULT_DB_ALIAS, connections
+
+from backend.api.db_router import replicas
+
+
+class Command(BaseCommand):
+    help = "Copia la BD primaria (SQLite) a cada réplica de DB_REPLICAS."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--interval", type=float, default=0,
+                            help="segundos entre copias (0 = una sola vez)")
+
+    def handle(self, *args, **opts):
+        aliases = replicas()
+        if not aliases:
+            raise CommandError("DB_REPLICAS['ALIASES'] está vacío: no hay réplicas.")
+        for alias in (DEFAULT_DB_ALIAS, *aliases):
+            if connections[alias].vendor != "sqlite":
+                raise CommandError(
+                    f"'{alias}' no es SQLite: usar la replicación del motor."
+                )
+
+        stopping = []
+        for sig in (signal.SIGINT, signal.SIGTERM):
+            signal.signal(sig, lambda *_: stopping.append(True))
+
+        while not stopping:
+            t0 = time.perf_counter()
+            for alias in aliases:
+                self._copy(alias)
+            self.stdout.write(
+                f"{len(aliases)} réplica(s) sincronizada(s) "
+                f"({(time.perf_counter() - t0) * 1000:.0f} ms)"
+            )
+            if not opts["interval"]:
+                break
+            time.sleep(opts["interval"])
+
+    def _copy(self, alias):
+        primary, replica = connections[DEFAULT_DB_ALIAS], connections[alias]
+        if primary.settings_dict["NAME"] == replica.settings_dict["NAME"]:
+            raise CommandError(f"'{alias}' apunta al mismo archivo que la primaria.")
+        primary.ensure_connection()
+        replica.ensure_connection()
+        primary.connection.backup(replica.connection)
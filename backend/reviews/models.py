@@ -6,8 +6,12 @@ Cambios añadidos:
 - Campo `allow_comments` en Review.
 - Modelo `Comment` (comentarios en reseñas).
 - Modelo `Report` (reportes de reseñas).
+- Ledger Elo append-only (`EloEvent`) y fotos periódicas (`EloSnapshot`).
+- Léxico de moderación editable (`ProhibitedTerm`, ver services/moderation.py).
+- Cola de moderación/Elo en la BD (`ReviewJob`, ver services/review_jobs.py).
 """
-from django.db import models
+from django.db import models, transaction
+from django.utils import timezone
 from django.contrib.auth.models import User
 from django.core.exceptions import ValidationError
 
@@ -31,6 +35,13 @@ class ReportStatus(models.TextChoices):
     RECHAZADA = "Rechazada", "Rechazada"      # el admin descarta el reporte
 
 
+class JobStatus(models.TextChoices):
+    PENDIENTE  = "Pendiente",  "Pendiente"
+    EN_CURSO   = "En curso",   "En curso"
+    COMPLETADO = "Completado", "Completado"
+    FALLIDO    = "Fallido",    "Fallido"        # agotó los reintentos
+
+
 # ----------------------- Perfil de usuario -------------------
 class UserProfile(models.Model):
     """
@@ -58,6 +69,12 @@ class Product(models.Model):
     category   = models.CharField(max_length=20, choices=CATEGORIES)
     elo_score  = models.IntegerField(default=1500)
 
+    def save(self, *args, **kwargs):
+        super().save(*args, **kwargs)
+        # mantiene la copia desnormalizada en Review.category
+        Review.objects.filter(product_a=self).exclude(category=self.category) \
+            .update(category=self.category)
+
     def __str__(self):
         return self.name
 
@@ -68,8 +85,6 @@ class Review(models.Model):
     El usuario compara product_a vs product_b y marca su preferido.
     """
 
-    PROHIBITED_WORDS = {"idiota", "estúpido", "inutil", "mierda", "basura"}
-
     # Productos involucrados
     product_a = models.ForeignKey(Product, related_name="reviews_as_a", on_delete=models.CASCADE)
     product_b = models.ForeignKey(Product, related_name="reviews_as_b", on_delete=models.CASCADE)
@@ -84,6 +99,17 @@ class Review(models.Model):
     status          = models.CharField(max_length=32, choices=StatusChoices.choices,
                                        default=StatusChoices.PENDIENTE)
 
+    # Pareja canónica (menor id, mayor id): (a, b) y (b, a) son la misma
+    # comparación. La completa save(); quien use bulk_create debe llenarla
+    # con `canonical_pair`. En una BD con reseñas se agrega en tres pasos
+    # (nulos, backfill, restricción): ver `manage.py backfill_pair_keys`.
+    pair_low   = models.BigIntegerField(editable=False)
+    pair_high  = models.BigIntegerField(editable=False)
+
+    # Copia de product_a.category (la de ambos productos) para filtrar los
+    # feeds sin JOIN con Product. La mantienen save() y Product.save().
+    category   = models.CharField(max_length=20, choices=Product.CATEGORIES, editable=False)
+
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
@@ -94,29 +120,59 @@ class Review(models.Model):
                 check=~models.Q(product_a=models.F("product_b")),
                 name="product_a_not_equal_b",
             ),
+            # una reseña por usuario y pareja, en cualquier orden
+            models.UniqueConstraint(
+                fields=["user", "pair_low", "pair_high"],
+                name="review_unique_user_pair",
+                violation_error_code="duplicate_pair",
+                violation_error_message="Ya publicaste esta comparación",
+            ),
+        ]
+        indexes = [
+            # feeds por categoría y recompute_elo, en orden cronológico
+            models.Index(fields=["category", "created_at"], name="review_category_time"),
+            # "mis reseñas" y categorías favoritas
+            models.Index(fields=["user", "created_at"], name="review_user_time"),
+            # reseñas moderadas en un rango (informes). `updated_at` va primero:
+            # con `status` adelante, SQLite (sin ANALYZE) lo elige también para
+            # los sondeos `status = ? AND id IN (...)` del feed aleatorio y
+            # recorre todas las aprobadas en vez de buscar por PK.
+            models.Index(fields=["updated_at", "status"], name="review_updated_status"),
         ]
 
+    @staticmethod
+    def canonical_pair(product_a_id, product_b_id):
+        """(pair_low, pair_high) de una comparación."""
+        return min(product_a_id, product_b_id), max(product_a_id, product_b_id)
+
     # ---------- validaciones ----------
     def clean(self):
         if self.product_a.category != self.product_b.category:
             raise ValidationError("Ambos productos deben pertenecer a la misma categoría")
 
     def save(self, *args, **kwargs):
+        self.pair_low, self.pair_high = self.canonical_pair(self.product_a_id, self.product_b_id)
+        self.category = self.product_a.category
         self.full_clean()
         super().save(*args, **kwargs)
 
     # ---------- moderación ----------
     def moderate_review(self):
         from .services import review_services
+        from .signals import review_moderated
         if self._contains_inappropriate_content():
             self.status = StatusChoices.RECHAZADA
         else:
             self.status = StatusChoices.APROBADA
             review_services.update_elo_score(self)
+        status = self.status
+        transaction.on_commit(lambda: review_moderated.send(
+            sender=Review, status=status, count=1,
+        ))
 
     def _contains_inappropriate_content(self):
-        texto = self.justification.lower()
-        return any(pal in texto for pal in self.PROHIBITED_WORDS)
+        from .services import moderation
+        return moderation.contains_prohibited(self.justification)
 
     def __str__(self):
         loser = self.product_b if self.preferred_product == self.product_a else self.product_a
@@ -135,8 +191,13 @@ class Comment(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
 
     def clean(self):
+        from .services import moderation
         if not self.review.allow_comments:
             raise ValidationError("El autor ha desactivado los comentarios para esta reseña.")
+        try:
+            moderation.validate_text(self.text)
+        except ValidationError as exc:
+            raise ValidationError({"text": exc.messages})
 
     def save(self, *args, **kwargs):
         self.full_clean()
@@ -159,5 +220,98 @@ class Report(models.Model):
                                 default=ReportStatus.PENDIENTE)
     created_at = models.DateTimeField(auto_now_add=True)
 
+    class Meta:
+        indexes = [
+            # panel de moderación: pendientes, más nuevos primero
+            models.Index(fields=["status", "created_at"], name="report_status_time"),
+        ]
+
     def __str__(self):
         return f"Reporte #{self.id} sobre Review {self.review_id} – {self.status}"
+
+
+# ----------------------- Moderación --------------------------
+class ProhibitedTerm(models.Model):
+    """
+    Término del léxico de moderación. "palabra*" incluye derivados.
+    Desactivar un término también lo quita si viene de los valores por
+    defecto o del archivo de léxico.
+    """
+    term       = models.CharField(max_length=100, unique=True)
+    active     = models.BooleanField(default=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    def __str__(self):
+        return self.term if self.active else f"{self.term} (inactivo)"
+
+
+# ----------------------- Historial Elo -----------------------
+class EloEvent(models.Model):
+    """
+    Ledger append-only: una fila por producto y comparación aplicada.
+    Permite responder "Elo de X en la fecha D" con una búsqueda por índice.
+    """
+    product = models.ForeignKey(Product, related_name="elo_events", on_delete=models.CASCADE)
+    # sin FK real: el ledger conserva el id aunque la reseña se elimine
+    review  = models.ForeignKey(Review, related_name="+", null=True, blank=True,
+                                on_delete=models.DO_NOTHING, db_constraint=False)
+    rating_before = models.IntegerField()
+    rating_after  = models.IntegerField()
+    created_at    = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["product", "created_at"], name="eloevent_product_time"),
+            models.Index(fields=["created_at"], name="eloevent_time"),
+        ]
+
+    def __str__(self):
+        return f"{self.product_id}: {self.rating_before} → {self.rating_after}"
+
+
+class EloSnapshot(models.Model):
+    """
+    Foto del Elo de cada producto en un instante (ver `manage.py snapshot_elo`).
+    Acota cuántos eventos hay que recorrer para reconstruir el catálogo
+    completo en una fecha pasada.
+    """
+    product  = models.ForeignKey(Product, related_name="elo_snapshots", on_delete=models.CASCADE)
+    rating   = models.IntegerField()
+    taken_at = models.DateTimeField()
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["product", "taken_at"], name="elosnapshot_unique"),
+        ]
+        indexes = [
+            models.Index(fields=["taken_at"], name="elosnapshot_time"),
+        ]
+
+    def __str__(self):
+        return f"{self.product_id}@{self.taken_at:%Y-%m-%d}: {self.rating}"
+
+
+# ----------------------- Cola de trabajos --------------------
+class ReviewJob(models.Model):
+    """
+    Moderación + Elo pendientes de una reseña (una fila por reseña: encolar
+    dos veces es un no-op). Lo consume `manage.py review_worker`.
+    """
+    review       = models.OneToOneField(Review, related_name="job", on_delete=models.CASCADE)
+    status       = models.CharField(max_length=16, choices=JobStatus.choices,
+                                    default=JobStatus.PENDIENTE)
+    attempts     = models.PositiveSmallIntegerField(default=0)
+    last_error   = models.TextField(blank=True)
+    available_at = models.DateTimeField(default=timezone.now)   # reintento diferido
+    locked_by    = models.CharField(max_length=64, blank=True)
+    locked_until = models.DateTimeField(null=True, blank=True)  # lease del worker
+    created_at   = models.DateTimeField(auto_now_add=True)
+    updated_at   = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["status", "available_at"], name="reviewjob_ready"),
+        ]
+
+    def __str__(self):
+        return f"Job review {self.review_id} – {self.status} ({self.attempts} intentos)"
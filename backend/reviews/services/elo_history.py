@@ -0,0 +1,111 @@
+"""
+Consultas "time-travel" sobre el ledger Elo.
+
+• rating_at(product_id, when)  – Elo de un producto en una fecha.
+• ratings_at(when, category)   – Elo de todo el catálogo en una fecha.
+• take_snapshot(when)          – guarda una foto del Elo actual.
+
+Todas se resuelven con búsquedas por rango sobre los índices de
+`EloEvent (product, created_at)` y `EloSnapshot (taken_at)`; nunca se
+recorre la tabla de reseñas.
+"""
+from django.db.models import Max
+from django.utils import timezone
+
+from ..models import EloEvent, EloSnapshot, Product
+
+
+def rating_at(product_id, when):
+    """Elo de `product_id` al instante `when` (datetime aware)."""
+    event = (
+        EloEvent.objects.filter(product_id=product_id, created_at__lte=when)
+        .order_by("-created_at", "-id")
+        .values("rating_after", "created_at")
+        .first()
+    )
+    snap = (
+        EloSnapshot.objects.filter(product_id=product_id, taken_at__lte=when)
+        .order_by("-taken_at")
+        .values("rating", "taken_at")
+        .first()
+    )
+
+    # la foto manda si es posterior al último evento (p.ej. tras un recálculo)
+    if snap and (not event or snap["taken_at"] >= event["created_at"]):
+        return snap["rating"]
+    if event:
+        return event["rating_after"]
+
+    # sin historia previa: el Elo que tenía antes de su primer cambio
+    later = (
+        EloEvent.objects.filter(product_id=product_id, created_at__gt=when)
+        .order_by("created_at", "id")
+        .values_list("rating_before", flat=True)
+        .first()
+    )
+    if later is not None:
+        return later
+    return Product.objects.values_list("elo_score", flat=True).get(id=product_id)
+
+
+def ratings_at(when, category=None):
+    """
+    Devuelve {product_id: elo} para todos los productos (o los de una
+    categoría) al instante `when`: parte de la última foto anterior y
+    aplica sólo los eventos posteriores a ella.
+    """
+    products = Product.objects.all()
+    if category:
+        products = products.filter(category=category)
+    current = dict(products.values_list("id", "elo_score"))
+
+    snap_time = (
+        EloSnapshot.objects.filter(taken_at__lte=when)
+        .aggregate(t=Max("taken_at"))["t"]
+    )
+
+    ratings = {}
+    events = EloEvent.objects.filter(created_at__lte=when, product_id__in=products)
+    if snap_time is not None:
+        ratings.update(
+            EloSnapshot.objects.filter(taken_at=snap_time, product_id__in=products)
+            .values_list("product_id", "rating")
+        )
+        events = events.filter(created_at__gt=snap_time)
+
+    for pid, rating in (
+        events.order_by("created_at", "id")
+        .values_list("product_id", "rating_after")
+        .iterator(chunk_size=2000)
+    ):
+        ratings[pid] = rating
+
+    missing = set(current) - set(ratings)
+    if missing:
+        later = (
+            EloEvent.objects.filter(created_at__gt=when, product_id__in=missing)
+            .order_by("product_id", "created_at", "id")
+            .values_list("product_id", "rating_before")
+        )
+        for pid, rating in later.iterator(chunk_size=2000):
+            ratings.setdefault(pid, rating)
+        for pid in missing - set(ratings):
+            ratings[pid] = current[pid]
+
+    return ratings
+
+
+def take_snapshot(when=None, batch_size=2000):
+    """Guarda el Elo actual de todos los productos con `taken_at = when`."""
+    when = when or timezone.now()
+    batch, total = [], 0
+    for pid, score in Product.objects.values_list("id", "elo_score").iterator(chunk_size=batch_size):
+        batch.append(EloSnapshot(product_id=pid, rating=score, taken_at=when))
+        if len(batch) >= batch_size:
+            EloSnapshot.objects.bulk_create(batch)
+            total += len(batch)
+            batch = []
+    if batch:
+        EloSnapshot.objects.bulk_create(batch)
+        total += len(batch)
+    return total
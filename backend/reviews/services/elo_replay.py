@@ -0,0 +1,65 @@
+"""
+Replay Elo en memoria (sin Django) para `manage.py recompute_elo`.
+
+El módulo no importa Django a propósito: se ejecuta dentro de procesos
+worker (una categoría por proceso) que no tienen apps ni conexiones.
+
+La recurrencia Elo es secuencial (cada comparación depende del resultado de
+la anterior), así que lo que se vectoriza es todo lo demás: los ids llegan
+como arrays NumPy, y como los puntajes son enteros el delta sólo depende de
+la diferencia `rb - ra`; se precalcula una tabla por diferencia y el bucle
+queda reducido a sumas e indexación de enteros.
+
+NumPy se importa dentro de `replay`: `expected_score` lo usa también el
+motor en línea (review_services) y no debe arrastrar NumPy a cada proceso
+web.
+"""
+# Más allá de ±4000 puntos de diferencia el delta ya es constante (0 o ±K).
+MAX_DIFF = 4000
+
+
+def expected_score(r1, r2):
+    """Probabilidad de que un producto con Elo r1 gane a uno con Elo r2."""
+    return 1 / (1 + 10 ** ((r2 - r1) / 400))
+
+
+def delta_tables(k):
+    """
+    Tablas (win, loss) indexadas por `rb - ra + MAX_DIFF` con el delta de A.
+    Se calculan con la misma fórmula y redondeo que el motor en línea, así
+    el replay coincide bit a bit con `update_elo_score`.
+    """
+    win, loss = [], []
+    for diff in range(-MAX_DIFF, MAX_DIFF + 1):
+        pa = expected_score(0, diff)
+        win.append(round(k * (1 - pa)))
+        loss.append(round(k * (0 - pa)))
+    return win, loss
+
+
+def replay(n_products, a_idx, b_idx, a_wins, k, initial):
+    """
+    Reproduce las comparaciones en orden y devuelve un array int64 con el
+    Elo final de cada uno de los `n_products` (por posición).
+
+    a_idx, b_idx – arrays de posiciones de producto A y B.
+    a_wins       – array booleano (True si ganó A).
+    """
+    win, loss = delta_tables(k)
+    ratings = [initial] * n_products
+
+    for ia, ib, w in zip(a_idx.tolist(), b_idx.tolist(), a_wins.tolist()):
+        ra = ratings[ia]
+        rb = ratings[ib]
+        diff = rb - ra
+        if diff > MAX_DIFF:
+            diff = MAX_DIFF
+        elif diff < -MAX_DIFF:
+            diff = -MAX_DIFF
+        delta = win[diff + MAX_DIFF] if w else loss[diff + MAX_DIFF]
+        ratings[ia] = ra + delta
+        ratings[ib] = rb - delta
+
+    import numpy as np
+
+    return np.asarray(ratings, dtype=np.int64)
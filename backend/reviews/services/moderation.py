@@ -0,0 +1,182 @@
+"""
+Motor de moderación de texto.
+
+El léxico se compila una sola vez en una única expresión regular con forma
+de trie (los prefijos comunes se factorizan: "basura|basural" → "basura(?:l)?"),
+de modo que cada texto se recorre una sola vez sin importar cuántos términos
+haya.
+
+Antes de comparar, texto y términos se normalizan: minúsculas (casefold) y
+sin tildes/diacríticos, así "inútil", "INUTIL" e "inutil" son lo mismo.
+
+Sintaxis de los términos:
+• "idiota"   – palabra completa ("idiota", no "idiotamente").
+• "idiota*"  – la palabra y sus derivados ("idiotas", "idiotez"...).
+
+Origen del léxico (se unen los tres):
+• DEFAULT_TERMS.
+• `settings.MODERATION["LEXICON_FILE"]` – un término por línea, "#" comenta.
+• La tabla `ProhibitedTerm` (los inactivos también *quitan* términos de
+  las otras dos fuentes).
+
+Recarga sin reiniciar: cada proceso revisa, a lo sumo cada CHECK_SECONDS,
+la versión del léxico en la caché "default" (la sube `reload()`, que llaman
+las señales de ProhibitedTerm) y la fecha de modificación del archivo.
+"""
+import os
+import re
+import threading
+import time
+import unicodedata
+import uuid
+
+from django.conf import settings
+from django.core.cache import caches
+from django.core.exceptions import ValidationError
+
+DEFAULT_TERMS = ("idiota*", "estupido*", "inutil*", "mierda*", "basura*")
+VERSION_KEY = "moderation:version"
+
+_lock = threading.Lock()
+_state = {"engine": None, "version": None, "mtime": None, "checked_at": 0.0}
+
+
+def _conf(name, default=None):
+    return getattr(settings, "MODERATION", {}).get(name, default)
+
+
+# ───────────────────────── normalización ──────────────────────────
+def normalize(text):
+    """Minúsculas y sin diacríticos ("Inútil" → "inutil")."""
+    decomposed = unicodedata.normalize("NFKD", text.casefold())
+    return "".join(ch for ch in decomposed if not unicodedata.combining(ch))
+
+
+# ───────────────────────── compilación ────────────────────────────
+def _trie_pattern(words):
+    """Regex equivalente a "w1|w2|..." con los prefijos comunes factorizados."""
+    trie = {}
+    for word in words:
+        node = trie
+        for ch in word:
+            node = node.setdefault(ch, {})
+        node[""] = {}           # fin de palabra
+
+    def build(node):
+        optional = "" in node
+        branches = [re.escape(ch) + build(child)
+                    for ch, child in sorted(node.items()) if ch]
+        if not branches:
+            return ""
+        body = branches[0] if len(branches) == 1 else "(?:" + "|".join(branches) + ")"
+        if optional:
+            body = "(?:" + body + ")?"
+        return body
+
+    return build(trie)
+
+
+class ModerationEngine:
+    """Léxico compilado; inmutable (recargar = construir otro)."""
+
+    def __init__(self, terms):
+        exact, prefixes = set(), set()
+        for term in terms:
+            term = normalize(term.strip())
+            if term.endswith("*"):
+                if term.rstrip("*"):
+                    prefixes.add(term.rstrip("*"))
+            elif term:
+                exact.add(term)
+        # "x*" ya cubre "x" y "xy"
+        exact = {w for w in exact if not any(w.startswith(p) for p in prefixes)}
+        self.terms = frozenset(exact | {p + "*" for p in prefixes})
+
+        parts = []
+        if exact:
+            parts.append(_trie_pattern(exact))
+        if prefixes:
+            parts.append(_trie_pattern(prefixes) + r"\w*")
+        if parts:
+            body = parts[0] if len(parts) == 1 else "(?:" + "|".join(parts) + ")"
+            self.regex = re.compile(r"(?<!\w)" + body + r"(?!\w)")
+        else:
+            self.regex = None
+
+    def find(self, text):
+        """Palabras prohibidas encontradas en `text` (normalizadas, sin repetir)."""
+        if self.regex is None or not text:
+            return []
+        return list(dict.fromkeys(self.regex.findall(normalize(text))))
+
+    def contains(self, text):
+        if self.regex is None or not text:
+            return False
+        return self.regex.search(normalize(text)) is not None
+
+
+# ───────────────────────── léxico ─────────────────────────────────
+def _file_terms(path):
+    with open(path, encoding="utf-8") as fh:
+        return [ln.split("#", 1)[0].strip() for ln in fh if ln.split("#", 1)[0].strip()]
+
+
+def load_terms():
+    """Términos vigentes: defaults + archivo + tabla ProhibitedTerm."""
+    from backend.reviews.models import ProhibitedTerm
+
+    terms = {normalize(t) for t in DEFAULT_TERMS}
+    path = _conf("LEXICON_FILE")
+    if path and os.path.exists(path):
+        terms.update(normalize(t) for t in _file_terms(path))
+    for term, active in ProhibitedTerm.objects.values_list("term", "active"):
+        (terms.add if active else terms.discard)(normalize(term))
+    return terms
+
+
+def _file_mtime():
+    path = _conf("LEXICON_FILE")
+    try:
+        return os.stat(path).st_mtime_ns if path else None
+    except OSError:
+        return None
+
+
+def reload():
+    """Avisa a todos los procesos que recompilen el léxico."""
+    # un valor nuevo en vez de incr: el de FileBasedCache no es atómico
+    caches["default"].set(VERSION_KEY, uuid.uuid4().hex, None)
+    with _lock:
+        _state["checked_at"] = 0.0
+
+
+def engine():
+    """El motor vigente, recompilado si cambió el léxico."""
+    now = time.monotonic()
+    if _state["engine"] is not None and now - _state["checked_at"] < _conf("CHECK_SECONDS", 5):
+        return _state["engine"]
+
+    with _lock:
+        version = caches["default"].get(VERSION_KEY)
+        mtime = _file_mtime()
+        if (_state["engine"] is None or version != _state["version"]
+                or mtime != _state["mtime"]):
+            _state["engine"] = ModerationEngine(load_terms())
+            _state.update(version=version, mtime=mtime)
+        _state["checked_at"] = now
+        return _state["engine"]
+
+
+def contains_prohibited(text):
+    return engine().contains(text)
+
+
+def validate_text(text):
+    """Lanza ValidationError si `text` contiene términos prohibidos."""
+    found = engine().find(text)
+    if found:
+        raise ValidationError(
+            "El texto contiene lenguaje inapropiado: %(words)s",
+            params={"words": ", ".join(found)},
+            code="prohibited",
+        )
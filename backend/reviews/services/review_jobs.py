@@ -0,0 +1,181 @@
+"""
+Cola de moderación + Elo sobre la propia BD (sin broker externo).
+
+    submit_review ──enqueue()──► ReviewJob (Pendiente)
+                                      │  claim(): lease de LEASE_SECONDS
+                                      ▼
+                        manage.py review_worker ──process_batch()
+
+• Idempotencia: un único ReviewJob por reseña (OneToOne), y `process_batch`
+  sólo modera reseñas que siguen en estado Pendiente. Como el cambio de
+  estado y las filas de Elo/EloEvent se escriben en la misma transacción,
+  reprocesar un trabajo nunca aplica el Elo dos veces.
+• Lotes: cada lote se escribe en una sola transacción (un commit por lote);
+  cada trabajo va en su propio savepoint, así uno que falla no arrastra a
+  los demás.
+• Reintentos: `attempts` cuenta cada vez que se toma el trabajo. Un error
+  lo devuelve a Pendiente con espera exponencial (`available_at`); tras
+  MAX_ATTEMPTS queda Fallido.
+• Caídas: si un worker muere o se cuelga con trabajos tomados, vuelven a
+  estar disponibles cuando vence su lease (`locked_until`), de a uno: si
+  uno de ellos es el que lo tumbó, no arrastra a otro lote entero y, como
+  cada toma cuenta, queda Fallido al llegar a MAX_ATTEMPTS.
+
+Los receptores de señales corren en el proceso del worker: con varios
+procesos las cachés (settings.CACHES) tienen que ser compartidas para que
+la API vea las invalidaciones.
+"""
+import logging
+import os
+import socket
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import F, Q
+from django.utils import timezone
+
+from ..models import JobStatus, Review, ReviewJob, StatusChoices
+
+logger = logging.getLogger(__name__)
+
+
+def _conf(name):
+    defaults = {"ASYNC": True, "BATCH_SIZE": 100, "MAX_ATTEMPTS": 5,
+                "LEASE_SECONDS": 60, "RETRY_BASE_SECONDS": 2}
+    return getattr(settings, "REVIEW_PIPELINE", {}).get(name, defaults[name])
+
+
+def is_async():
+    return _conf("ASYNC")
+
+
+def worker_id():
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+
+def enqueue(review):
+    """Encola la reseña (no-op si ya tiene trabajo). Devuelve el ReviewJob."""
+    job, _ = ReviewJob.objects.get_or_create(review=review)
+    return job
+
+
+def claim(batch_size=None, worker=None, now=None):
+    """
+    Toma hasta `batch_size` trabajos listos (pendientes o con lease vencido)
+    y los marca En curso a nombre de `worker`, sumando un intento. Devuelve
+    sus ids.
+    """
+    batch_size = batch_size or _conf("BATCH_SIZE")
+    worker = worker or worker_id()
+    now = now or timezone.now()
+    expired = Q(status=JobStatus.EN_CURSO, locked_until__lt=now)
+    pending = Q(status=JobStatus.PENDIENTE, available_at__lte=now)
+    with transaction.atomic():
+        # lease vencido: pudo ser el trabajo que tumbó al worker, va solo
+        ready, ids = expired, _ready_ids(expired, ("locked_until", "id"), 1)
+        if not ids:
+            ready, ids = pending, _ready_ids(pending, ("available_at", "id"), batch_size)
+        if not ids:
+            return []
+        exhausted = ReviewJob.objects.filter(
+            ready, id__in=ids, attempts__gte=_conf("MAX_ATTEMPTS"),
+        )
+        if exhausted.update(
+            status=JobStatus.FALLIDO, locked_by="", locked_until=None, updated_at=now,
+            last_error="Lease vencido: el worker murió o se colgó procesándolo",
+        ):
+            logger.warning("Trabajos %s fallidos tras %s leases vencidos", ids, _conf("MAX_ATTEMPTS"))
+        ReviewJob.objects.filter(ready, id__in=ids).update(
+            status=JobStatus.EN_CURSO,
+            attempts=F("attempts") + 1,
+            locked_by=worker,
+            locked_until=now + timedelta(seconds=_conf("LEASE_SECONDS")),
+            updated_at=now,
+        )
+    return ids
+
+
+def _ready_ids(ready, order, limit):
+    return list(
+        ReviewJob.objects.select_for_update(skip_locked=True)
+        .filter(ready).order_by(*order)
+        .values_list("id", flat=True)[:limit]
+    )
+
+
+def _moderate(review_id):
+    review = (
+        Review.objects.select_for_update()
+        .select_related("product_a", "product_b")
+        .get(id=review_id)
+    )
+    if review.status == StatusChoices.PENDIENTE:
+        review.moderate_review()
+        review.save(update_fields=["status"])
+
+
+def process_batch(job_ids, worker=None):
+    """
+    Modera y aplica el Elo de los trabajos `job_ids` (tomados por `worker`).
+    Devuelve (completados, con_error).
+    """
+    worker = worker or worker_id()
+    done, failed = [], {}
+    with transaction.atomic():
+        jobs = list(
+            ReviewJob.objects.filter(id__in=job_ids, status=JobStatus.EN_CURSO,
+                                     locked_by=worker)
+            .order_by("id").values_list("id", "review_id", "attempts")
+        )
+        for job_id, review_id, attempts in jobs:
+            try:
+                with transaction.atomic():
+                    _moderate(review_id)
+            except Exception as exc:
+                logger.exception("Error procesando la reseña %s", review_id)
+                failed[job_id] = (attempts, f"{type(exc).__name__}: {exc}")
+            else:
+                done.append(job_id)
+
+        now = timezone.now()
+        ReviewJob.objects.filter(id__in=done).update(
+            status=JobStatus.COMPLETADO,
+            locked_by="", locked_until=None, last_error="", updated_at=now,
+        )
+        for job_id, (attempts, error) in failed.items():
+            give_up = attempts >= _conf("MAX_ATTEMPTS")
+            delay = _conf("RETRY_BASE_SECONDS") * 2 ** (attempts - 1)
+            ReviewJob.objects.filter(id=job_id).update(
+                status=JobStatus.FALLIDO if give_up else JobStatus.PENDIENTE,
+                attempts=attempts, last_error=error[:2000],
+                available_at=now + timedelta(seconds=delay),
+                locked_by="", locked_until=None, updated_at=now,
+            )
+    return len(done), len(failed)
+
+
+def run_once(batch_size=None, worker=None):
+    """Toma y procesa un lote. Devuelve (completados, con_error)."""
+    worker = worker or worker_id()
+    ids = claim(batch_size, worker)
+    if not ids:
+        return 0, 0
+    return process_batch(ids, worker)
+
+
+def process_now(review):
+    """
+    Modo síncrono (REVIEW_PIPELINE["ASYNC"] = False): encola y procesa la
+    reseña en el mismo request, por el mismo camino que el worker.
+    """
+    job = enqueue(review)
+    worker = f"inline:{worker_id()}"
+    now = timezone.now()
+    ReviewJob.objects.filter(id=job.id, status=JobStatus.PENDIENTE).update(
+        status=JobStatus.EN_CURSO, attempts=F("attempts") + 1, locked_by=worker,
+        locked_until=now + timedelta(seconds=_conf("LEASE_SECONDS")), updated_at=now,
+    )
+    process_batch([job.id], worker)
+    review.refresh_from_db(fields=["status"])
+    return review.status
@@ -1,30 +1,155 @@
-from ..models import Product, Settings
+"""
+Motor Elo de EloPinion.
 
-def update_elo_score(review):
+`apply_match` aplica los dos lados de una comparación en una sola
+transacción: bloquea las filas de ambos productos (select_for_update, en
+orden de id para evitar deadlocks), relee el puntaje vigente en la BD y
+escribe el resultado. Así dos reseñas simultáneas sobre el mismo producto
+ya no se pisan. En la misma transacción se agregan dos filas al ledger
+`EloEvent` (una por producto), y tras el commit se envía `elo_changed`.
+
+En SQLite `select_for_update` no tiene efecto; ahí la serialización la dan
+los locks por producto de este módulo (dentro del proceso) y el modo de
+transacción IMMEDIATE configurado en settings (entre procesos).
+"""
+import threading
+from collections import namedtuple
+from contextlib import ExitStack
+
+from django.db import transaction
+from django.utils import timezone
+
+from ..models import EloEvent, Product, Settings
+from ..signals import elo_changed
+from .elo_replay import expected_score
+
+# Locks "striped" por producto: dos comparaciones que no comparten producto
+# no compiten entre sí; sólo se serializan las que tocan el mismo id.
+_LOCK_STRIPES = 256
+_product_locks = [threading.Lock() for _ in range(_LOCK_STRIPES)]
+
+EloResult = namedtuple("EloResult", "a_before a_after b_before b_after")
+
+
+def _locks_for(*product_ids):
+    # orden fijo → sin deadlocks entre hilos
+    stripes = sorted({pid % _LOCK_STRIPES for pid in product_ids})
+    return [_product_locks[s] for s in stripes]
+
+
+def elo_delta(score_a, score_b, a_wins, k=None):
     """
-    Calcula y actualiza el puntaje Elo de los dos productos
-    según la reseña recibida.
+    Cambio entero de Elo para A. B recibe exactamente el opuesto
+    (suma cero), de modo que el total de puntos nunca deriva.
+    """
+    k = Settings.K_FACTOR if k is None else k
+    sa = 1 if a_wins else 0
+    return round(k * (sa - expected_score(score_a, score_b)))
+
+
+def apply_match(product_a_id, product_b_id, winner_id, review_id=None):
+    """
+    Aplica una comparación A vs B de forma atómica y devuelve un
+    `EloResult` con los puntajes antes/después de cada producto.
     """
-    product_a = review.product_a
-    product_b = review.product_b
-    winner    = review.preferred_product
+    with ExitStack() as stack:
+        for lock in _locks_for(product_a_id, product_b_id):
+            stack.enter_context(lock)
 
-    # --- probabilidad de victoria -------------------------
-    def prob(r1, r2):
-        return 1 / (1 + 10 ** ((r2 - r1) / 400))
+        with transaction.atomic():
+            scores = dict(
+                Product.objects.select_for_update()
+                .filter(id__in=(product_a_id, product_b_id))
+                .order_by("id")
+                .values_list("id", "elo_score")
+            )
+            a_before = scores[product_a_id]
+            b_before = scores[product_b_id]
 
-    pa = prob(product_a.elo_score, product_b.elo_score)
-    pb = 1 - pa
+            delta = elo_delta(a_before, b_before, winner_id == product_a_id)
+            result = EloResult(a_before, a_before + delta, b_before, b_before - delta)
 
-    k = Settings.K_FACTOR       # ← ya no se llama get_k_factor
+            Product.objects.filter(id=product_a_id).update(elo_score=result.a_after)
+            Product.objects.filter(id=product_b_id).update(elo_score=result.b_after)
 
-    # resultado real (1 = gana, 0 = pierde)
-    sa = 1 if winner == product_a else 0
-    sb = 1 - sa
+            now = timezone.now()
+            EloEvent.objects.bulk_create([
+                EloEvent(product_id=product_a_id, review_id=review_id,
+                         rating_before=result.a_before, rating_after=result.a_after,
+                         created_at=now),
+                EloEvent(product_id=product_b_id, review_id=review_id,
+                         rating_before=result.b_before, rating_after=result.b_after,
+                         created_at=now),
+            ])
 
-    # nuevas puntuaciones
-    product_a.elo_score += round(k * (sa - pa))
-    product_b.elo_score += round(k * (sb - pb))
+            transaction.on_commit(lambda: elo_changed.send(
+                sender=Product, product_ids=[product_a_id, product_b_id], matches=1,
+            ))
+
+    return result
+
+
+def apply_matches(matches):
+    """
+    Versión por lotes de `apply_match` para importaciones: `matches` es una
+    lista de (product_a_id, product_b_id, winner_id, review_id) en orden
+    cronológico. Lee los puntajes una vez, reproduce las comparaciones en
+    memoria y escribe todo en una transacción (bulk_update + bulk_create).
+    Los EloEvent llevan la hora en que se aplican, no la de la reseña: el
+    ledger queda en el orden en que cambiaron los puntajes, que es lo que
+    `rating_at` y la evolución de HU-007 suponen.
+    Devuelve {product_id: elo_final}.
+    """
+    if not matches:
+        return {}
+    product_ids = {pid for a, b, _, _ in matches for pid in (a, b)}
+    with ExitStack() as stack:
+        for lock in _locks_for(*product_ids):
+            stack.enter_context(lock)
+
+        with transaction.atomic():
+            scores = dict(
+                Product.objects.select_for_update()
+                .filter(id__in=product_ids)
+                .order_by("id")
+                .values_list("id", "elo_score")
+            )
+            now = timezone.now()
+            events = []
+            for a, b, winner, review_id in matches:
+                delta = elo_delta(scores[a], scores[b], winner == a)
+                for pid, change in ((a, delta), (b, -delta)):
+                    events.append(EloEvent(
+                        product_id=pid, review_id=review_id,
+                        rating_before=scores[pid], rating_after=scores[pid] + change,
+                        created_at=now,
+                    ))
+                    scores[pid] += change
+
+            Product.objects.bulk_update(
+                [Product(id=pid, elo_score=score) for pid, score in scores.items()],
+                ["elo_score"], batch_size=500,
+            )
+            EloEvent.objects.bulk_create(events, batch_size=1000)
+
+            transaction.on_commit(lambda: elo_changed.send(
+                sender=Product, product_ids=sorted(product_ids), matches=len(matches),
+            ))
+
+    return scores
+
+
+def update_elo_score(review):
+    """
+    Calcula y actualiza el puntaje Elo de los dos productos
+    según la reseña recibida.
+    """
+    result = apply_match(
+        review.product_a_id, review.product_b_id, review.preferred_product_id,
+        review_id=review.id,
+    )
 
-    product_a.save(update_fields=["elo_score"])
-    product_b.save(update_fields=["elo_score"])
+    # mantenemos sincronizadas las instancias en memoria del llamador
+    review.product_a.elo_score = result.a_after
+    review.product_b.elo_score = result.b_after
+    return result
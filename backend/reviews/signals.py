@@ -0,0 +1,15 @@
+"""
+Señales propias de la app de reseñas.
+
+• elo_changed – se envía (tras el commit) cuando cambia el Elo de uno o
+  más productos, con `product_ids`. Las actualizaciones Elo usan
+  QuerySet.update / bulk_update, que no disparan post_save, así que quien
+  mantenga datos derivados del Elo (catálogo, rankings) debe escuchar ésta.
+  `matches` indica cuántas comparaciones se aplicaron (0 en recálculos).
+• review_moderated – se envía (tras el commit) al moderar reseñas, con
+  `status` (Aprobada/Rechazada) y `count`.
+"""
+from django.dispatch import Signal
+
+elo_changed = Signal()
+review_moderated = Signal()
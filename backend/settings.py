@@ -1,3 +1,4 @@
+import tempfile
 from pathlib import Path
 
 BASE_DIR = Path(__file__).resolve().parent.parent
@@ -16,11 +17,13 @@ INSTALLED_APPS = [
     'django.contrib.staticfiles',
     'backend.reviews',  # app de reseñas
     'backend.auth.apps.AccountsConfig', # login/registro
+    'backend.api.apps.ApiConfig',       # endpoints HU (señales de caché)
     'corsheaders',
     "rest_framework",
 ]
 
 MIDDLEWARE = [
+    'backend.api.middleware.RequestMetricsMiddleware',   # primero: mide todo el stack
     "corsheaders.middleware.CorsMiddleware",
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
@@ -65,9 +68,113 @@ DATABASES = {
     'default': {
         'ENGINE': 'django.db.backends.sqlite3',
         'NAME': BASE_DIR / 'db.sqlite3',
+        # IMMEDIATE: cada transacción toma el lock de escritura al empezar,
+        # así las actualizaciones Elo concurrentes esperan en vez de fallar.
+        'OPTIONS': {
+            'transaction_mode': 'IMMEDIATE',
+            'timeout': 20,
+        },
     }
 }
 
+# Réplicas de lectura (api/db_router.py): las vistas con @replica_reads
+# (feeds, catálogo, reportes pendientes) leen de uno de estos alias de
+# DATABASES; vacío = todo va a "default". Quien guarda o borra una reseña
+# lee de la primaria durante MAX_LAG_SECONDS (cota del retraso de las
+# réplicas; también acota el TTL de lo cacheado desde una réplica).
+#
+# En local, con dos archivos SQLite (`manage.py sync_replicas` los copia):
+#   DATABASES['replica'] = {
+#       **DATABASES['default'],
+#       'NAME': BASE_DIR / 'db-replica.sqlite3',
+#       'TEST': {'MIRROR': 'default'},
+#   }
+#   DB_REPLICAS['ALIASES'] = ['replica']
+DATABASE_ROUTERS = ['backend.api.db_router.PrimaryReplicaRouter']
+DB_REPLICAS = {
+    'ALIASES': [],
+    'MAX_LAG_SECONDS': 5,
+}
+
+# Caché de feeds: LocMemCache desaloja por LRU (MAX_ENTRIES) y TTL (TIMEOUT).
+# En producción basta con apuntar el alias "feeds" a Redis/Memcached.
+# "default" guarda versiones (catálogo, feeds, léxico de moderación), las
+# marcas de reseñas cambiadas, las marcas read-your-writes de db_router y los
+# cuerpos del catálogo; lo tienen que ver todos los procesos, incluido
+# `review_worker`: por eso es compartida (archivo; en producción, Redis con
+# 'django.core.cache.backends.redis.RedisCache').
+# Las versiones se cambian con `set` de un uuid nuevo, no con `incr` (que en
+# FileBasedCache no es atómico), así que un desalojo sólo cuesta aciertos.
+# Aun así MAX_ENTRIES va muy por encima del default de Django (300): con
+# menos, el culling tiraría marcas read-your-writes. Ojo: FileBasedCache
+# lista el directorio en cada `set`, otra razón para usar Redis en producción.
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+        'LOCATION': str(Path(tempfile.gettempdir()) / 'elopinion-cache'),
+        'OPTIONS': {
+            'MAX_ENTRIES': 10000,
+            'CULL_FREQUENCY': 10,   # al llenarse borra 1/10, no 1/3
+        },
+    },
+    'feeds': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'elopinion-feeds',
+        'TIMEOUT': 300,
+        'OPTIONS': {'MAX_ENTRIES': 20000},
+    },
+}
+
+FEED_CACHE = {
+    'ALIAS': 'feeds',
+    'PAGE_TTL': 60,      # segundos por página de feed
+    'REVIEW_TTL': 300,   # segundos por reseña serializada
+}
+
+# Serializador de cada feed (por nombre de URL): "fast" = proyección sobre
+# values_list (api/serializers/fast.py), cualquier otro valor = DRF.
+FEED_SERIALIZERS = {
+    'feed': 'fast',
+    'personalized_feed': 'fast',
+    'my_reviews': 'fast',
+}
+
+# Moderación de texto (reviews/services/moderation.py)
+MODERATION = {
+    'LEXICON_FILE': None,   # ruta a un archivo con un término por línea
+    'CHECK_SECONDS': 5,     # cada cuánto cada proceso busca cambios del léxico
+}
+
+# Cola de moderación + Elo (reviews/services/review_jobs.py). Con ASYNC las
+# reseñas las procesa `manage.py review_worker`; sin él, el propio request.
+REVIEW_PIPELINE = {
+    'ASYNC': True,
+    'BATCH_SIZE': 100,
+    'MAX_ATTEMPTS': 5,
+    'LEASE_SECONDS': 60,         # tras esto, un trabajo tomado se reintenta
+    'RETRY_BASE_SECONDS': 2,     # espera exponencial: 2, 4, 8, ...
+}
+
+# Informes HU-007 generados (api/services/report_cache.py): un archivo por
+# hash de parámetros + métricas; se desalojan los menos usados.
+REPORT_CACHE = {
+    'DIR': Path(tempfile.gettempdir()) / 'elopinion-reports',
+    'MAX_BYTES': 200 * 1024 * 1024,
+}
+
+# Gráficos de los PDF: 'reportlab' (vectoriales) o 'matplotlib' (PNG 150 dpi)
+REPORT_CHART_BACKEND = 'reportlab'
+
+# Métricas por request y de negocio en /api/metrics/ (api/utils/metrics.py).
+# Cada proceso vuelca su acumulado en DIR (local a la máquina); los de procesos
+# terminados se suman a DIR/aggregate.json.
+METRICS = {
+    'ENABLED': True,
+    'DIR': Path(tempfile.gettempdir()) / 'elopinion-metrics',
+    'FLUSH_SECONDS': 5,
+    'TOKEN': None,          # si se define, se exige "Authorization: Bearer <token>"
+}
+
 AUTH_PASSWORD_VALIDATORS = [
     {'NAME': 'django.contrib.auth.password_validation.UserAttributeSimilarityValidator'},
     {'NAME': 'django.contrib.auth.password_validation.MinimumLengthValidator'},
@@ -0,0 +1,35 @@
+from django.test import TestCase, override_settings
+
+from backend.api.services import catalog
+from backend.reviews.models import Product
+from backend.reviews.signals import elo_changed
+
+LOCMEM = {"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+                      "LOCATION": "catalog-tests"}}
+
+
+@override_settings(CACHES=LOCMEM)
+class CatalogVersionTests(TestCase):
+    """Los cambios de Elo no invalidan el catálogo en cada actualización."""
+
+    def setUp(self):
+        catalog._cache().clear()
+        self.product = Product.objects.create(name="P", category="pelicula")
+
+    def test_elo_changes_are_published_at_most_once_per_interval(self):
+        before = catalog.catalog_version()
+        for _ in range(5):
+            elo_changed.send(sender=None, product_ids=[self.product.id])
+        self.assertEqual(catalog.catalog_version(), before)
+
+        # vencida la foto del Elo, la versión incorpora el último cambio
+        catalog._cache().delete(catalog.ELO_PUBLISHED_KEY)
+        after = catalog.catalog_version()
+        self.assertNotEqual(after, before)
+        self.assertEqual(catalog.catalog_version(), after)
+
+    def test_product_change_bumps_at_once(self):
+        before = catalog.catalog_version()
+        self.product.name = "Q"
+        self.product.save()
+        self.assertNotEqual(catalog.catalog_version(), before)
@@ -0,0 +1,43 @@
+"""Visibilidad de `GET /api/reviews/<id>/comments/` según el estado de la reseña."""
+from django.contrib.auth.models import User
+from django.test import TestCase
+from django.urls import reverse
+
+from backend.reviews.models import Comment, Product, Review, StatusChoices
+
+
+class ListCommentsVisibilityTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cat = Product.CATEGORIES[0][0]
+        a, b = (Product.objects.create(name=f"Producto {i}", category=cat) for i in range(2))
+        cls.author = User.objects.create(username="autor")
+        cls.other = User.objects.create(username="otro")
+        cls.admin = User.objects.create(username="admin", is_superuser=True)
+        cls.review = Review.objects.create(
+            user=cls.author, product_a=a, product_b=b, preferred_product=b,
+            justification="Comparación de prueba con justificación suficiente.",
+            allow_comments=True,
+        )
+        Comment.objects.create(review=cls.review, user=cls.other, text="Buen punto")
+        cls.url = reverse("comment-list", args=[cls.review.pk])
+
+    def _set_status(self, value):
+        Review.objects.filter(pk=self.review.pk).update(status=value)
+
+    def test_approved_review_is_public(self):
+        self._set_status(StatusChoices.APROBADA)
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.json()["results"]), 1)
+
+    def test_hidden_review_only_for_author_or_admin(self):
+        for value in (StatusChoices.PENDIENTE, StatusChoices.RECHAZADA):
+            self._set_status(value)
+            for user, expected in ((None, 404), (self.other, 404),
+                                   (self.author, 200), (self.admin, 200)):
+                with self.subTest(status=value, user=getattr(user, "username", None)):
+                    self.client.logout()
+                    if user is not None:
+                        self.client.force_login(user)
+                    self.assertEqual(self.client.get(self.url).status_code, expected)
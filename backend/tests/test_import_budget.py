@@ -0,0 +1,29 @@
+"""
+Arranque en frío de la API: en un intérprete nuevo, django.setup() y el
+URLconf no importan matplotlib/reportlab/numpy y entran en el presupuesto.
+Misma medición que `manage.py check_import_budget`.
+"""
+from django.test import SimpleTestCase
+
+from backend.reviews.management.commands.check_import_budget import (
+    BUDGET_MS,
+    FORBIDDEN,
+    slowest_imports,
+    measure_startup,
+)
+
+
+class ImportBudgetTests(SimpleTestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.best, cls.log = measure_startup(FORBIDDEN, runs=3)
+
+    def _slowest_imports(self):
+        return "\n".join(f"{us / 1000:8.1f} ms  {name}" for us, name in slowest_imports(self.log, 10))
+
+    def test_no_heavy_modules_at_startup(self):
+        self.assertEqual(self.best["loaded"], [], self._slowest_imports())
+
+    def test_startup_within_budget(self):
+        self.assertLessEqual(self.best["ms"], BUDGET_MS, self._slowest_imports())
@@ -0,0 +1,28 @@
+"""
+Las consultas calientes (feeds, "mis reseñas", reportes, informes,
+exportación) usan índices: se pide el plan con EXPLAIN y se falla si
+recorre entera la tabla de reseñas/reportes o si ordena en un B-tree
+temporal. Mismas consultas y criterio que `manage.py check_query_plans`.
+"""
+from django.contrib.auth.models import User
+from django.test import TestCase
+
+from backend.reviews.management.commands.check_query_plans import (
+    query_plans,
+    seed_plan_data,
+)
+
+
+class QueryPlanTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        seed_plan_data(2000)
+
+    def test_hot_queries_use_indexes(self):
+        user = User.objects.order_by("id").first()
+        checked = 0
+        for name, sql, plan, problems in query_plans(user, "pelicula"):
+            checked += 1
+            with self.subTest(name):
+                self.assertEqual(problems, [], f"{sql}\n{plan}")
+        self.assertGreater(checked, 0)
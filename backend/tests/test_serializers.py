@@ -0,0 +1,76 @@
+"""
+Equivalencia entre el serializador de proyección del feed
+(`serialize_reviews_fast`) y `ReviewPublicSerializer` (DRF).
+
+El rendimiento se mide aparte con `manage.py bench_serializers`.
+"""
+import json
+from datetime import timedelta
+
+from django.contrib.auth.models import User
+from django.test import TestCase
+from django.utils import timezone
+
+from backend.api.serializers.comments_reports import ReviewPublicSerializer
+from backend.api.serializers.fast import serialize_reviews_fast
+from backend.api.services.feeds import EMBEDDED_COMMENTS, feed_reviews
+from backend.reviews.models import Comment, Product, Review, StatusChoices
+
+
+def _canonical(rows):
+    return json.dumps(sorted(rows, key=lambda r: r["id"]), sort_keys=True, default=str)
+
+
+class FastSerializerTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cat = Product.CATEGORIES[0][0]
+        products = [Product.objects.create(name=f"Producto {i}", category=cat) for i in range(4)]
+        users = [User.objects.create(username=f"usuario{i}") for i in range(3)]
+
+        def review(user, a, b, **extra):
+            return Review.objects.create(
+                user=user, product_a=a, product_b=b, preferred_product=b,
+                justification="Comparación de prueba con justificación suficiente.",
+                status=StatusChoices.APROBADA, **extra,
+            )
+
+        cls.empty = review(users[0], products[0], products[1])
+        cls.few = review(users[1], products[0], products[2], allow_comments=True)
+        cls.many = review(users[2], products[1], products[3], allow_comments=True)
+
+        base = timezone.now() - timedelta(days=1)
+        comments = [Comment(review=cls.few, user=users[0], text="uno solo")]
+        for i in range(EMBEDDED_COMMENTS + 4):
+            comments.append(Comment(review=cls.many, user=users[i % 3], text=f"comentario {i}"))
+        Comment.objects.bulk_create(comments)
+        # fechas explícitas con un empate justo en el corte de los embebidos:
+        # entra el de id mayor (desempate por id, igual en ambos)
+        many = list(Comment.objects.filter(review=cls.many).order_by("id"))
+        cutoff = len(many) - EMBEDDED_COMMENTS
+        for i, comment in enumerate(many):
+            minutes = cutoff if i == cutoff - 1 else i
+            comment.created_at = base + timedelta(minutes=minutes)
+            comment.save(update_fields=["created_at"])
+
+    def _both(self, ids):
+        drf = list(ReviewPublicSerializer(feed_reviews(ids), many=True).data)
+        return drf, serialize_reviews_fast(ids, EMBEDDED_COMMENTS)
+
+    def test_same_json_as_drf(self):
+        ids = [self.empty.id, self.few.id, self.many.id]
+        drf, fast = self._both(ids)
+        self.assertEqual(len(fast), len(ids))
+        self.assertEqual(_canonical(fast), _canonical(drf))
+
+    def test_review_without_comments(self):
+        drf, fast = self._both([self.empty.id])
+        self.assertEqual(fast[0]["comments"], [])
+        self.assertEqual(fast[0]["comment_count"], 0)
+        self.assertEqual(_canonical(fast), _canonical(drf))
+
+    def test_comment_count_counts_beyond_embedded(self):
+        drf, fast = self._both([self.many.id])
+        self.assertEqual(fast[0]["comment_count"], EMBEDDED_COMMENTS + 4)
+        self.assertEqual(len(fast[0]["comments"]), EMBEDDED_COMMENTS)
+        self.assertEqual(fast[0], json.loads(json.dumps(drf[0], default=str)))
@@ -96,7 +96,10 @@ export default function App() {
         return;
       }
       const { status: st } = await resp.json();
-      setStatus(st === "ok" ? "✅ Enviada" : "❌ Error");
+      // 202 = aceptada, la moderación corre en segundo plano
+      setStatus(
+        st !== "ok" ? "❌ Error" : resp.status === 202 ? "✅ Enviada (en moderación)" : "✅ Enviada"
+      );
       if (st === "ok") resetForm();
     } catch {
       setStatus("❌ Error al enviar");
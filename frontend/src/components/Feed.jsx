@@ -1,11 +1,12 @@
-import { useEffect, useState } from "react";
+import { useCallback, useEffect, useRef, useState } from "react";
 import { useNavigate } from "react-router-dom";
 import "./Feed.css";
 
 /**
  * Props
  * ─────────────────────────────────────────────────────────────
- * api         – URL que devuelve las reseñas (por defecto /api/feed/)
+ * api         – URL que devuelve las reseñas (por defecto /api/feed/);
+ *               responde { results, next_cursor } y se pagina con ?cursor=
  * canDelete   – true  ⇒ muestra botón “Eliminar” y lo llama vía DELETE
  * allowReport – false ⇒ oculta el botón “Reportar”
  */
@@ -16,21 +17,49 @@ export default function Feed({
 }) {
   const [items,  setItems]  = useState([]);
   const [drafts, setDrafts] = useState({});
+  const [cursor, setCursor] = useState(null);
+  const [olderCursors, setOlderCursors] = useState({});
+  const [loading, setLoading] = useState(false);
+  const sentinel = useRef(null);
   const navigate = useNavigate();
 
+  /* ─── carga de una página ───────────────────── */
+  const loadPage = useCallback(
+    (cur, replace) => {
+      setLoading(true);
+      const url = cur ? `${api}?cursor=${encodeURIComponent(cur)}` : api;
+      return fetch(url, { credentials: "include" })
+        .then((r) => {
+          if (r.status === 401) {
+            navigate("/auth");
+            return { results: [], next_cursor: null };
+          }
+          return r.json();
+        })
+        .then(({ results, next_cursor }) => {
+          setItems((arr) => (replace ? results : [...arr, ...results]));
+          setCursor(next_cursor);
+        })
+        .catch(console.error)
+        .finally(() => setLoading(false));
+    },
+    [api, navigate]
+  );
+
   /* ─── carga inicial ─────────────────────────── */
   useEffect(() => {
-    fetch(api, { credentials: "include" })
-      .then((r) => {
-        if (r.status === 401) {
-          navigate("/auth");
-          return [];
-        }
-        return r.json();
-      })
-      .then(setItems)
-      .catch(console.error);
-  }, [api, navigate]);
+    loadPage(null, true);
+  }, [loadPage]);
+
+  /* ─── scroll infinito ───────────────────────── */
+  useEffect(() => {
+    if (!cursor || loading || !sentinel.current) return;
+    const obs = new IntersectionObserver((entries) => {
+      if (entries[0].isIntersecting) loadPage(cursor, false);
+    });
+    obs.observe(sentinel.current);
+    return () => obs.disconnect();
+  }, [cursor, loading, loadPage]);
 
   /* ─── helpers ───────────────────────────────── */
   const loserOf = (r) =>
@@ -63,13 +92,39 @@ export default function Feed({
     setItems((arr) =>
       arr.map((r) =>
         r.id === reviewId
-          ? { ...r, comments: [...(r.comments || []), newComment] }
+          ? {
+              ...r,
+              comments: [...(r.comments || []), newComment],
+              comment_count: (r.comment_count || 0) + 1,
+            }
           : r
       )
     );
     handleDraft(reviewId, "");
   }
 
+  /* ─── comentarios anteriores ────────────────── */
+  async function loadOlderComments(review) {
+    // el endpoint va del más nuevo al más viejo; se descartan los ya visibles
+    const cur = olderCursors[review.id];
+    const url = cur
+      ? `/api/reviews/${review.id}/comments/?cursor=${encodeURIComponent(cur)}`
+      : `/api/reviews/${review.id}/comments/`;
+    const resp = await fetch(url, { credentials: "include" });
+    if (!resp.ok) return;
+    const { results, next_cursor } = await resp.json();
+
+    setItems((arr) =>
+      arr.map((r) => {
+        if (r.id !== review.id) return r;
+        const known = new Set((r.comments || []).map((c) => c.id));
+        const older = results.filter((c) => !known.has(c.id)).reverse();
+        return { ...r, comments: [...older, ...(r.comments || [])] };
+      })
+    );
+    setOlderCursors((m) => ({ ...m, [review.id]: next_cursor }));
+  }
+
   /* ─── reportar ──────────────────────────────── */
   async function reportReview(reviewId) {
     if (!window.confirm("¿Reportar esta reseña?")) return;
@@ -103,73 +158,88 @@ export default function Feed({
     return <p className="feed-loading">Cargando reseñas…</p>;
 
   return (
-    <ul className="feed-list">
-      {items.map((r) => (
-        <li key={r.id} className="feed-item">
-          <div className="feed-header">
-            <b>{r.user}</b> prefirió <b>{r.preferred_product}</b> sobre{" "}
-            {loserOf(r)}
-          </div>
-
-          {r.justification && (
-            <p className="feed-justification">“{r.justification}”</p>
-          )}
-
-          {!r.allow_comments && (
-            <span className="feed-disabled">Comentarios desactivados</span>
-          )}
-
-          {/* comentarios existentes */}
-          {r.comments?.length > 0 && (
-            <ul className="feed-comments">
-              {r.comments.map((c) => (
-                <li key={c.id}>
-                  <b>{c.user}</b>: {c.text}
-                </li>
-              ))}
-            </ul>
-          )}
-
-          {/* formulario para comentar */}
-          {r.allow_comments && (
-            <div className="feed-form">
-              <textarea
-                rows={2}
-                placeholder="Escribe un comentario…"
-                value={drafts[r.id] || ""}
-                onChange={(e) => handleDraft(r.id, e.target.value)}
-              />
-              <button
-                className="feed-comment-btn"
-                onClick={() => sendComment(r.id)}
-              >
-                Publicar comentario
-              </button>
+    <>
+      <ul className="feed-list">
+        {items.map((r) => (
+          <li key={r.id} className="feed-item">
+            <div className="feed-header">
+              <b>{r.user}</b> prefirió <b>{r.preferred_product}</b> sobre{" "}
+              {loserOf(r)}
             </div>
-          )}
-
-          {/* ─── acciones ─── */}
-          <div className="feed-actions">
-            {allowReport && (
-              <button
-                className="feed-report-btn"
-                onClick={() => reportReview(r.id)}
-              >
-                Reportar
-              </button>
+
+            {r.justification && (
+              <p className="feed-justification">“{r.justification}”</p>
+            )}
+
+            {!r.allow_comments && (
+              <span className="feed-disabled">Comentarios desactivados</span>
             )}
 
-            {canDelete && (
-              <button
-                className="feed-delete-btn"
-                onClick={() => deleteReview(r.id)}
-              >
-                Eliminar
-              </button>
+            {/* comentarios anteriores (no embebidos en el feed) */}
+            {r.comment_count > (r.comments?.length || 0) &&
+              olderCursors[r.id] !== null && (
+                <button
+                  className="feed-comment-btn"
+                  onClick={() => loadOlderComments(r)}
+                >
+                  Ver comentarios anteriores (
+                  {r.comment_count - (r.comments?.length || 0)})
+                </button>
+              )}
+
+            {/* comentarios existentes */}
+            {r.comments?.length > 0 && (
+              <ul className="feed-comments">
+                {r.comments.map((c) => (
+                  <li key={c.id}>
+                    <b>{c.user}</b>: {c.text}
+                  </li>
+                ))}
+              </ul>
             )}
-          </div>
-        </li>
-      ))}
-    </ul>
+
+            {/* formulario para comentar */}
+            {r.allow_comments && (
+              <div className="feed-form">
+                <textarea
+                  rows={2}
+                  placeholder="Escribe un comentario…"
+                  value={drafts[r.id] || ""}
+                  onChange={(e) => handleDraft(r.id, e.target.value)}
+                />
+                <button
+                  className="feed-comment-btn"
+                  onClick={() => sendComment(r.id)}
+                >
+                  Publicar comentario
+                </button>
+              </div>
+            )}
+
+            {/* ─── acciones ─── */}
+            <div className="feed-actions">
+              {allowReport && (
+                <button
+                  className="feed-report-btn"
+                  onClick={() => reportReview(r.id)}
+                >
+                  Reportar
+                </button>
+              )}
+
+              {canDelete && (
+                <button
+                  className="feed-delete-btn"
+                  onClick={() => deleteReview(r.id)}
+                >
+                  Eliminar
+                </button>
+              )}
+            </div>
+          </li>
+        ))}
+      </ul>
+      {cursor && <div ref={sentinel} className="feed-loading">Cargando más…</div>}
+    </>
   );
 }